@@ -1,21 +1,43 @@
-from flask import Flask, request, jsonify, render_template, session, redirect, url_for, make_response
+from flask import Flask, request, jsonify, render_template, session, redirect, url_for, make_response, Response
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime, timedelta
+from sqlalchemy import and_, bindparam, case, delete, func, insert, inspect, or_, select, text, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
+from datetime import datetime, timedelta, timezone
 from flask_cors import CORS
 from dotenv import load_dotenv
 from urllib.parse import urlparse
 import pymysql
+import click
 import math
 import base64
 import os
 import re
 import csv
 import json
+import time
+import hashlib
+import socket
+import html
+import uuid
+import threading
+import tempfile
+import itertools
+import multiprocessing
+import copy
+import zipfile
+from xml.etree import ElementTree
+from contextlib import closing
+from collections import OrderedDict, deque, namedtuple
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
 from dateutil.parser import parse as parse_date
+import numpy as np
 import PyPDF2
+from pdf_pages import extract_pdf_page_range
 import openai
 from openai import OpenAI
-from docx import Document
 from io import BytesIO, StringIO
 from weasyprint import HTML
 from weasyprint.text.fonts import FontConfiguration
@@ -28,7 +50,11 @@ load_dotenv()
 app = Flask(__name__)
 CORS(app)  # Enable Cross-Origin Resource Sharing
 app.secret_key = os.environ.get('SECRET_KEY')  # Set secret key for session management
-client = OpenAI(api_key=os.environ.get('OPENAI_API_KEY'))  # OpenAI API
+client = OpenAI(
+    api_key=os.environ.get('OPENAI_API_KEY'),
+    timeout=float(os.environ.get('OPENAI_TIMEOUT_SECONDS', 30)),  # Per-request timeout instead of the SDK's 10 minutes
+    max_retries=int(os.environ.get('OPENAI_MAX_RETRIES', 1))
+)  # OpenAI API
 
 
 # Configure Flask app settings
@@ -53,19 +79,23 @@ if uri:
         f"/{db_config['database']}"
     )
 
-# Use this for Railway SSL
-app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-    'pool_pre_ping': True,
-    'pool_recycle': 300,
-    'pool_size': 10,
-    'max_overflow': 20,
-    'connect_args': {
-        'ssl': {
-            'verify_cert': False,
-            'verify_identity': False
+    # Use this for Railway SSL
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_pre_ping': True,
+        'pool_recycle': 300,
+        'pool_size': 10,
+        'max_overflow': 20,
+        'connect_args': {
+            'ssl': {
+                'verify_cert': False,
+                'verify_identity': False
+            }
         }
     }
-}
+else:
+    # Local development: a SQLite file in the instance folder
+    os.makedirs(app.instance_path, exist_ok=True)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(app.instance_path, 'aibid.db')
 
 
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
@@ -115,6 +145,14 @@ MATERIAL_CONSTANTS = {
     'sealcoat': {'density': 100, 'thickness': 0.02}   # Sealcoat
 }
 
+# Equipment rental rates ($/unit/week, Virginia 2025)
+EQUIPMENT_WEEKLY_RATES = {
+    'paver': 2500,
+    'roller': 1000,
+    'excavator': 2000,
+    'truck': 900
+}
+
 # Virginia-specific profit margins (2025)
 PROFIT_MARGINS = {
     'road': {'min': 0.08, 'max': 0.15},
@@ -123,8 +161,221 @@ PROFIT_MARGINS = {
     'renovation': {'min': 0.15, 'max': 0.22}
 }
 
+# Materials accepted by the estimator, in the order used for batch rate tables
+ESTIMATE_MATERIALS = ('asphalt', 'recycled asphalt', 'bituminous surface', 'concrete', 'sealcoat')
+
+# Material cost lines of each estimate material: (quantity key, unit cost key), primary line first.
+# Bituminous estimates have always priced their tonnage from asphalt_tons (absent, so 0); kept so
+# existing bituminous projects re-price to the same totals.
+MATERIAL_COST_LINES = {
+    'asphalt': (('asphalt_tons', 'asphalt'), ('aggregate_tons', 'aggregate base')),
+    'recycled asphalt': (('asphalt_tons', 'recycled asphalt'), ('aggregate_tons', 'aggregate base')),
+    'bituminous surface': (('asphalt_tons', 'bituminous surface'), ('aggregate_tons', 'aggregate base')),
+    'concrete': (('concrete_yds', 'concrete'), ('rebar_lbs', 'rebar')),
+    'sealcoat': (('sealcoat_sqft', 'sealcoat'),)
+}
+
+# Line-item pricing of extracted quantity rows. Units are normalized to a canonical unit
+# (with a scale factor), then converted to the unit each material is priced in.
+LINE_ITEM_UNITS = {
+    'ton': ('ton', 1), 'tons': ('ton', 1), 'tn': ('ton', 1),
+    'lb': ('lb', 1), 'lbs': ('lb', 1), 'pound': ('lb', 1), 'pounds': ('lb', 1),
+    'ft³': ('ft3', 1), 'ft3': ('ft3', 1), 'cf': ('ft3', 1), 'cu ft': ('ft3', 1), 'cubic feet': ('ft3', 1),
+    'yd³': ('yd3', 1), 'yd3': ('yd3', 1), 'cy': ('yd3', 1), 'cu yd': ('yd3', 1), 'cubic yards': ('yd3', 1),
+    'ft²': ('sqft', 1), 'sqft': ('sqft', 1), 'sq ft': ('sqft', 1), 'sf': ('sqft', 1), 'square feet': ('sqft', 1),
+    'yd²': ('sqft', 9), 'sq yd': ('sqft', 9), 'sy': ('sqft', 9), 'square yards': ('sqft', 9),
+    'ft': ('lf', 1), 'lf': ('lf', 1), 'linear feet': ('lf', 1),
+    'each': ('each', 1), 'ea': ('each', 1)
+}
+# Dimension of each convertible unit and its size in the dimension's base unit (lb, ft³ or ft²)
+UNIT_DIMENSIONS = {'ton': ('mass', 2000), 'lb': ('mass', 1), 'yd3': ('volume', 27), 'ft3': ('volume', 1), 'sqft': ('area', 1)}
+LINE_ITEM_MATERIAL_ALIASES = {
+    'hma': 'asphalt', 'hot mix asphalt': 'asphalt', 'rap': 'recycled asphalt', 'bituminous': 'bituminous surface',
+    'aggregate': 'aggregate base', 'stone base': 'aggregate base', 'reinforcing steel': 'rebar',
+    'seal coat': 'sealcoat', 'sealcoating': 'sealcoat'
+}
+# Take-off quantity columns stored on a project
+MATERIAL_QUANTITY_KEYS = ('asphalt_tons', 'concrete_yds', 'bituminous_tons', 'sealcoat_sqft', 'rebar_lbs', 'aggregate_tons')
+# Priced line-item materials: the unit their unit cost is quoted in and the take-off quantity for it
+LINE_ITEM_MATERIALS = {
+    'asphalt': ('ton', 'asphalt_tons'),
+    'recycled asphalt': ('ton', 'asphalt_tons'),
+    'bituminous surface': ('ton', 'bituminous_tons'),
+    'aggregate base': ('ton', 'aggregate_tons'),
+    'concrete': ('yd3', 'concrete_yds'),
+    'rebar': ('lb', 'rebar_lbs'),
+    'sealcoat': ('sqft', 'sealcoat_sqft')
+}
+
+# Rate cards: versioned copies of the rates above, stored in the rate_card table. The
+# constants are the built-in card used for projects priced before rate cards existed.
+RATE_CARD_REFRESH_SECONDS = float(os.environ.get('RATE_CARD_REFRESH_SECONDS', 30))  # Active-card poll interval per worker
+REPRICE_CHUNK_SIZE = int(os.environ.get('REPRICE_CHUNK_SIZE', 1000))  # Projects per re-pricing UPDATE batch
+REPRICE_CHUNK_RETRIES = int(os.environ.get('REPRICE_CHUNK_RETRIES', 3))  # Re-reads of a chunk whose rows changed before it is skipped
+RateTables = namedtuple('RateTables', [
+    'version', 'material_unit_costs', 'labor_rate', 'material_markup', 'equipment_rate_multiplier',
+    'overhead_rate', 'thickness', 'material_constants', 'profit_margins', 'equipment_weekly_rates', 'batch',
+    'line_items'
+])
+
+
+# Rate card data equivalent to the module constants
+def default_rate_card_data():
+    return copy.deepcopy({
+        'material_unit_costs': MATERIAL_UNIT_COSTS,
+        'labor_rate': LABOR_RATE,
+        'material_markup': MATERIAL_MARKUP,
+        'equipment_rate_multiplier': EQUIPMENT_RATE_MULTIPLIER,
+        'overhead_rate': OVERHEAD_RATE,
+        'thickness': THICKNESS,
+        'material_constants': MATERIAL_CONSTANTS,
+        'profit_margins': PROFIT_MARGINS,
+        'equipment_weekly_rates': EQUIPMENT_WEEKLY_RATES
+    })
+
+
+# Default thickness (ft) of an estimate material under a rate card
+def material_thickness(material_type, rates):
+    if material_type == 'bituminous surface':
+        return rates.material_constants['bituminous surface']['thickness']
+    return rates.thickness.get(material_type, rates.thickness['asphalt'])
+
+
+# Factor converting a quantity in `unit` to `priced_unit`, or None when the units cannot be converted
+def unit_conversion_factor(unit, priced_unit, density, thickness):
+    """Area converts to volume through the material's thickness (ft) and volume to mass
+    through its density (lb/ft³); a missing thickness or density blocks that step."""
+    if unit == priced_unit:
+        return 1.0
+    if unit not in UNIT_DIMENSIONS or priced_unit not in UNIT_DIMENSIONS:
+        return None
+    (dimension, size), (priced_dimension, priced_size) = UNIT_DIMENSIONS[unit], UNIT_DIMENSIONS[priced_unit]
+    dimensions = ('area', 'volume', 'mass')
+    steps = (thickness, density)
+    start, end = dimensions.index(dimension), dimensions.index(priced_dimension)
+    factor = size / priced_size
+    for position in range(min(start, end), max(start, end)):
+        if not steps[position]:
+            return None
+        factor = factor * steps[position] if start < end else factor / steps[position]
+    return factor
+
+
+# Line-item registry of a rate card: (material, canonical unit) -> (conversion factor, unit cost)
+def build_line_item_registry(rates):
+    registry = {}
+    for material, (priced_unit, _) in LINE_ITEM_MATERIALS.items():
+        density = rates.material_constants.get(material, {}).get('density')
+        thickness = material_thickness(material, rates) if material in ESTIMATE_MATERIALS else None
+        for unit in UNIT_DIMENSIONS:
+            factor = unit_conversion_factor(unit, priced_unit, density, thickness)
+            if factor is not None:
+                registry[(material, unit)] = (factor, rates.material_unit_costs[material])
+    return registry
+
+
+# Precompute the in-memory lookup tables for one rate card version
+def build_rate_tables(version, data):
+    data = copy.deepcopy(data)
+    unit_costs = data['material_unit_costs']
+    constants = data['material_constants']
+    cost_lines = [MATERIAL_COST_LINES[material] for material in ESTIMATE_MATERIALS]
+    batch = {
+        'density': np.array([constants['asphalt']['density'], constants['recycled asphalt']['density'],
+                             constants['bituminous surface']['density'], 0, 0]),
+        'thickness': np.array([data['thickness']['asphalt'], data['thickness']['recycled asphalt'],
+                               constants['bituminous surface']['thickness'], 0, 0]),
+        'primary_unit_cost': np.array([unit_costs[lines[0][1]] for lines in cost_lines]),
+        'secondary_unit_cost': np.array([unit_costs[lines[1][1]] if len(lines) > 1 else 0 for lines in cost_lines])
+    }
+    tables = RateTables(version=version, batch=batch, line_items=None, **data)
+    return tables._replace(line_items=build_line_item_registry(tables))
+
+
+DEFAULT_RATE_TABLES = build_rate_tables(None, default_rate_card_data())
+rate_tables = DEFAULT_RATE_TABLES  # Active tables; replaced by a single assignment on hot-swap
+rate_tables_by_version = {}  # Loaded rate card versions
+rate_tables_lock = threading.Lock()
+rate_card_checked_at = 0.0
+
+# Background RFP ingestion settings
+RFP_JOB_WORKERS = int(os.environ.get('RFP_JOB_WORKERS', 4))  # Concurrent ingestion jobs per app process
+RFP_JOB_QUEUE_LIMIT = int(os.environ.get('RFP_JOB_QUEUE_LIMIT', 100))  # Max queued + running jobs per app process
+RFP_JOB_RETENTION_HOURS = int(os.environ.get('RFP_JOB_RETENTION_HOURS', 72))  # Finished jobs are purged after this
+RFP_JOB_STALE_MINUTES = int(os.environ.get('RFP_JOB_STALE_MINUTES', 60))  # Unfinished jobs of unknown owners idle this long are failed at startup
+
+# Process pool sizing: every app process (gunicorn runs WEB_CONCURRENCY of them) owns its own PDF and
+# simulation pools next to its RFP_JOB_WORKERS threads, so each pool defaults to that process's share
+# of the CPUs, at most 2. A pool of 1 means the work stays in the request process.
+APP_PROCESSES = max(1, int(os.environ.get('WEB_CONCURRENCY', 1)))  # App processes per host
+POOL_WORKERS_DEFAULT = max(1, min(2, (os.cpu_count() or 1) // APP_PROCESSES))
+
+# PDF text extraction settings
+PDF_WORKERS = int(os.environ.get('PDF_WORKERS', POOL_WORKERS_DEFAULT))  # Processes used for page-parallel extraction
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', 24))  # Smaller PDFs are parsed in-process
+PDF_PAGES_PER_TASK = int(os.environ.get('PDF_PAGES_PER_TASK', 8))  # Page range handed to each worker task
+
+# GPT extraction settings
+OPENAI_MODEL = os.environ.get('OPENAI_MODEL', 'gpt-4')  # Large tier, used on escalation
+OPENAI_FAST_MODEL = os.environ.get('OPENAI_FAST_MODEL', 'gpt-4o-mini')  # Fast tier with strict JSON output; empty disables tiering
+OPENAI_ESCALATION_THRESHOLD = float(os.environ.get('OPENAI_ESCALATION_THRESHOLD', 0.8))  # Escalate below this completeness
+OPENAI_CHUNKED_EXTRACTION = os.environ.get('OPENAI_CHUNKED_EXTRACTION', 'true').lower() == 'true'
+OPENAI_CHUNK_TOKENS = int(os.environ.get('OPENAI_CHUNK_TOKENS', 875))  # ~3500 characters, the single-call limit
+OPENAI_MAX_CHUNKS = int(os.environ.get('OPENAI_MAX_CHUNKS', 16))  # Longer documents keep their first chunks only
+OPENAI_MAX_CONCURRENCY = int(os.environ.get('OPENAI_MAX_CONCURRENCY', 8))  # Concurrent GPT requests per app process
+CHARS_PER_TOKEN = 4  # Rough token estimate for English text
+OPENAI_DEADLINE_SECONDS = float(os.environ.get('OPENAI_DEADLINE_SECONDS', 20))  # Uploads use the regex result after this
+OPENAI_BREAKER_FAILURES = int(os.environ.get('OPENAI_BREAKER_FAILURES', 5))  # Consecutive failures that open the breaker
+OPENAI_BREAKER_COOLDOWN_SECONDS = float(os.environ.get('OPENAI_BREAKER_COOLDOWN_SECONDS', 60))  # GPT is skipped while open
+OPENAI_PREFILTER = os.environ.get('OPENAI_PREFILTER', 'true').lower() == 'true'  # Rank lines before prompting
+OPENAI_PREFILTER_TOKENS = int(os.environ.get('OPENAI_PREFILTER_TOKENS', 1750))  # Pre-filter budget for single-call extraction
+# With chunked extraction on, the pre-filter keeps up to what the chunks can carry
+# (OPENAI_MAX_CHUNKS * OPENAI_CHUNK_TOKENS) so it drops low-scoring lines without capping the document
+PREFILTER_BUDGET_TOKENS = (max(OPENAI_PREFILTER_TOKENS, OPENAI_MAX_CHUNKS * OPENAI_CHUNK_TOKENS)
+                           if OPENAI_CHUNKED_EXTRACTION else OPENAI_PREFILTER_TOKENS)
+
+# Regex extraction guard: per-document time budget for candidate pattern matches (0 disables)
+RFP_REGEX_BUDGET_SECONDS = float(os.environ.get('RFP_REGEX_BUDGET_SECONDS', 0.5))
+
+# Extraction cache settings (extracted text and fields keyed by content hash)
+RFP_CACHE_ENABLED = os.environ.get('RFP_CACHE_ENABLED', 'true').lower() == 'true'
+RFP_CACHE_DIR = os.environ.get('RFP_CACHE_DIR', os.path.join(app.instance_path, 'rfp_cache'))
+RFP_CACHE_MAX_BYTES = int(os.environ.get('RFP_CACHE_MAX_BYTES', 256 * 1024 * 1024))  # Evict least recently used beyond this
+RFP_CACHE_TTL_SECONDS = int(os.environ.get('RFP_CACHE_TTL_SECONDS', 30 * 24 * 3600))  # Entries expire after 30 days
+EXTRACTION_PROMPT_VERSION = '4'  # Bump whenever the GPT extraction prompt or its post-processing changes
+
+# Admin project list settings
+PROJECTS_PAGE_SIZE = int(os.environ.get('PROJECTS_PAGE_SIZE', 50))  # Page size when `limit` is not given
+PROJECTS_MAX_PAGE_SIZE = int(os.environ.get('PROJECTS_MAX_PAGE_SIZE', 500))  # Largest accepted `limit`
+PROJECT_LIST_FIELDS = ('id', 'name', 'type', 'location', 'submitted', 'status', 'cost')  # Default `fields` projection
+PROJECT_SORT_FIELDS = ('submitted', 'id', 'name', 'type', 'material', 'area', 'cost_amount')  # Non-null columns usable as keyset sort keys
+BULK_CHUNK_SIZE = int(os.environ.get('BULK_CHUNK_SIZE', 1000))  # Projects per bulk UPDATE/DELETE statement and commit
+BULK_MAX_IDS = int(os.environ.get('BULK_MAX_IDS', 50000))  # Largest explicit id list per bulk request
+BULK_ACTIONS = {'accept': 'accepted', 'reject': 'rejected', 'delete': None}  # Bulk action -> new status
+PROJECT_RESPONSE_CACHE_SIZE = int(os.environ.get('PROJECT_RESPONSE_CACHE_SIZE', 256))  # Serialized project API responses kept per process
+project_response_cache = OrderedDict()  # (endpoint, key) -> (etag, JSON body); least recently used first
+project_response_cache_lock = threading.Lock()
+project_response_stats = {'hits': 0, 'misses': 0, 'not_modified': 0}
+PROJECT_SEARCH_INDEX = 'project_search'  # FTS5 table (SQLite) or FULLTEXT index (MySQL) over the columns below
+PROJECT_SEARCH_COLUMNS = ('name', 'location', 'scope', 'requirements')  # Project text columns covered by search
+PROJECT_SEARCH_WEIGHTS = (10.0, 4.0, 1.0, 1.0)  # bm25 weight of each column (SQLite ranking)
+PROJECT_SEARCH_PAGE_SIZE = int(os.environ.get('PROJECT_SEARCH_PAGE_SIZE', 20))  # Results when `limit` is not given
+PROJECT_SEARCH_MAX_PAGE_SIZE = int(os.environ.get('PROJECT_SEARCH_MAX_PAGE_SIZE', 100))  # Largest accepted `limit`
+PROJECT_SEARCH_MAX_TERMS = 16  # Words and phrases used from one query
+PROJECT_SEARCH_SNIPPET_CHARS = 160  # Length of the scope/requirements excerpts around the first match
+PROJECT_EVENT_BUFFER_SIZE = int(os.environ.get('PROJECT_EVENT_BUFFER_SIZE', 1000))  # Recent events each worker keeps for Last-Event-ID replay
+PROJECT_EVENT_POLL_SECONDS = float(os.environ.get('PROJECT_EVENT_POLL_SECONDS', 1.0))  # How often each worker reads new project_events rows
+PROJECT_EVENT_GAP_SECONDS = float(os.environ.get('PROJECT_EVENT_GAP_SECONDS', 5))  # How long to wait for a skipped event id to commit
+PROJECT_EVENT_HEARTBEAT_SECONDS = int(os.environ.get('PROJECT_EVENT_HEARTBEAT_SECONDS', 15))  # Keep-alive interval on idle streams
+PROJECT_EVENT_RETENTION_HOURS = int(os.environ.get('PROJECT_EVENT_RETENTION_HOURS', 24))  # Older project_events rows are purged
+project_events = deque(maxlen=PROJECT_EVENT_BUFFER_SIZE)  # (event id, formatted SSE message), oldest first
+project_events_condition = threading.Condition()
+project_events_state = {'last_id': 0, 'floor': 0, 'listener': None}  # floor: ids at or below it may be missing from the buffer
 
-# Project Model: Defines the database schema for storing project details
+
+# Project Model: Defines the database schema for storing project details. The heavy 'detail'
+# columns (scope, requirements, cost_breakdown) are deferred; single-project views load them
+# with PROJECT_DETAIL_OPTIONS and lists select only their columns (see list_projects).
 class Project(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(500), nullable=False)  # Project name
@@ -132,16 +383,18 @@ class Project(db.Model):
     location = db.Column(db.String(255), nullable=False)  # Project location
     submitted = db.Column(db.Date, nullable=False)  # Submission date
     status = db.Column(db.Enum('pending', 'accepted', 'rejected'), default='pending')  # Project status
-    cost = db.Column(db.String(50), nullable=False)  # Estimated cost
+    cost = db.Column(db.String(50), nullable=False)  # Estimated cost (formatted, e.g. "$123456")
+    cost_amount = db.Column(db.Float, nullable=False, default=0)  # Estimated cost in dollars, for sorting and aggregates
     completion_date = db.Column(db.Date)  # Completion date
     land_mile = db.Column(db.Float)  # Length in lane miles
     width = db.Column(db.Float)  # Width in feet
     area = db.Column(db.Float, nullable=False)  # Area in sq ft
     material = db.Column(db.String(50), nullable=False)  # Material type (e.g., concrete)
     tonnage = db.Column(db.Float)  # Material tonnage
-    scope = db.Column(db.Text, nullable=False)  # Project scope
-    requirements = db.Column(db.Text)  # Special requirements
+    scope = db.deferred(db.Column(db.Text, nullable=False), group='detail')  # Project scope
+    requirements = db.deferred(db.Column(db.Text), group='detail')  # Special requirements
     estimated_cost = db.Column(db.String(50))  # Estimated cost (formatted)
+    estimated_cost_amount = db.Column(db.Float)  # Estimated cost in dollars
     profit_margin = db.Column(db.Float)  # Profit margin percentage
     success_probability = db.Column(db.String(20))  # Success probability
     asphalt_tons = db.Column(db.Float)  # Asphalt quantity in tons
@@ -154,11 +407,398 @@ class Project(db.Model):
     prep_hours = db.Column(db.Integer)  # Site preparation labor hours
     paving_hours = db.Column(db.Integer)  # Paving labor hours
     finishing_hours = db.Column(db.Integer)  # Finishing labor hours
-    cost_breakdown = db.Column(db.JSON)
+    cost_breakdown = db.deferred(db.Column(db.JSON), group='detail')  # Cost lines, line items and risk results
+    rate_card_version = db.Column(db.Integer)  # Rate card the estimate was priced with (NULL: built-in rates)
+    version = db.Column(db.Integer, nullable=False, default=1)  # Bumped on every change; drives the detail ETag
+    updated_at = db.Column(db.DateTime, default=datetime.now)  # Last change (NULL for rows older than the column)
+
+    # Indexes for the dashboard access patterns (existing databases get them from the migrations)
+    __table_args__ = (
+        db.Index('ix_project_status_submitted_id', 'status', 'submitted', 'id'),  # Status tabs, newest first
+        db.Index('ix_project_submitted_id', 'submitted', 'id'),  # All projects, newest first / date ranges
+        db.Index('ix_project_completion_date', 'completion_date'),  # Completion date ranges
+        db.Index('ix_project_type_material', 'type', 'material'),  # Type/material breakdowns
+    )
+
+
+PROJECT_DETAIL_OPTIONS = (db.undefer_group('detail'),)  # Load the deferred columns with the row
+
+
+# RFP Job Model: Tracks background ingestion of uploaded RFP files
+class RfpJob(db.Model):
+    id = db.Column(db.String(32), primary_key=True)  # Job id (uuid4 hex)
+    filename = db.Column(db.String(255), nullable=False)  # Uploaded file name
+    status = db.Column(db.Enum('queued', 'running', 'completed', 'failed'), default='queued')  # Job status
+    stage = db.Column(db.String(50))  # Current pipeline stage while running
+    status_code = db.Column(db.Integer)  # HTTP status of the finished estimate
+    project_id = db.Column(db.Integer)  # Project created by the job
+    result = db.Column(db.JSON)  # Estimate response or error details
+    created = db.Column(db.DateTime, nullable=False)  # Submission time
+    updated = db.Column(db.DateTime, nullable=False)  # Last status change
+    owner = db.Column(db.String(100))  # App process running the job (see process_identity)
+
+
+# Re-pricing Job Model: Background re-pricing of pending projects under a rate card
+class RepriceJob(db.Model):
+    id = db.Column(db.String(32), primary_key=True)  # Job id (uuid4 hex)
+    rate_card_version = db.Column(db.Integer, nullable=False)  # Rate card the projects are priced under
+    status = db.Column(db.Enum('queued', 'running', 'completed', 'failed'), default='queued')  # Job status
+    repriced = db.Column(db.Integer, nullable=False, default=0)  # Projects re-priced so far
+    chunks = db.Column(db.Integer, nullable=False, default=0)  # Chunks committed so far
+    result = db.Column(db.JSON)  # Summary once finished, or error details
+    created = db.Column(db.DateTime, nullable=False)  # Submission time
+    updated = db.Column(db.DateTime, nullable=False)  # Last status change
+    owner = db.Column(db.String(100))  # App process running the job (see process_identity)
+
+
+# Rate Card Model: Versioned pricing tables (see default_rate_card_data for the layout)
+class RateCard(db.Model):
+    version = db.Column(db.Integer, primary_key=True)  # Rate card version
+    data = db.Column(db.JSON, nullable=False)  # Unit costs, labor rate, thickness, margins, etc.
+    active = db.Column(db.Boolean, nullable=False, default=False)  # The card new estimates are priced with
+    note = db.Column(db.String(255))  # What changed
+    created = db.Column(db.DateTime, nullable=False)  # Creation time
+
+
+# Project Stats Model: Running totals per (status, type, material), kept in step with project writes
+class ProjectStats(db.Model):
+    __tablename__ = 'project_stats'
+    status = db.Column(db.String(20), primary_key=True)  # Project status
+    type = db.Column(db.String(100), primary_key=True)  # Project type
+    material = db.Column(db.String(50), primary_key=True)  # Material type
+    project_count = db.Column(db.Integer, nullable=False, default=0)  # Projects in the bucket
+    cost_total = db.Column(db.Float, nullable=False, default=0)  # Sum of cost_amount
+    area_total = db.Column(db.Float, nullable=False, default=0)  # Sum of area (sq ft)
+
+
+# Table Version Model: Change counter per table, bumped in the same transaction as each write
+class TableVersion(db.Model):
+    __tablename__ = 'table_versions'
+    name = db.Column(db.String(50), primary_key=True)  # Table name
+    version = db.Column(db.Integer, nullable=False, default=0)  # Number of committed write transactions
+    updated_at = db.Column(db.DateTime, nullable=False)  # Time of the last write
+
+
+# Project Event Model: Project deltas for the dashboard event stream, written in the same transaction
+# as the change they describe. Every worker reads new rows from here, so it doubles as the broker.
+class ProjectEvent(db.Model):
+    __tablename__ = 'project_events'
+    id = db.Column(db.Integer, primary_key=True)  # Event id, sent to clients as the SSE id
+    kind = db.Column(db.String(20), nullable=False)  # created, accepted, rejected or deleted
+    project_id = db.Column(db.Integer, nullable=False)  # Project the event is about
+    data = db.Column(db.JSON, nullable=False)  # Compact delta sent to clients
+    created = db.Column(db.DateTime, nullable=False, index=True)  # Time of the change
+
+
+# Schema Migration Model: Migrations already applied to this database
+class SchemaMigration(db.Model):
+    __tablename__ = 'schema_migrations'
+    id = db.Column(db.String(100), primary_key=True)  # Migration id, e.g. 0002_project_indexes
+    applied = db.Column(db.DateTime, nullable=False)  # When it was applied
+
+
+# Add a column that db.create_all() cannot add to an existing table
+def ensure_column(table, column, ddl):
+    if column in {c['name'] for c in inspect(db.engine).get_columns(table)}:
+        return
+    try:
+        with db.engine.begin() as connection:
+            connection.execute(text(f'ALTER TABLE {table} ADD COLUMN {column} {ddl}'))
+    except (OperationalError, ProgrammingError):
+        # Another worker may have added it first
+        if column not in {c['name'] for c in inspect(db.engine).get_columns(table)}:
+            raise
+
+
+# Rate tables for a stored rate card version (None is the built-in card)
+def rate_tables_for_version(version):
+    if version is None:
+        return DEFAULT_RATE_TABLES
+    tables = rate_tables_by_version.get(version)
+    if tables is None:
+        card = db.session.get(RateCard, version)
+        if card is None:
+            raise LookupError(f"Rate card {version} not found")
+        tables = build_rate_tables(card.version, card.data)
+        with rate_tables_lock:
+            rate_tables_by_version[version] = tables
+    return tables
+
+
+# Swap in the active rate card; seeds version 1 from the built-in rates on first start
+def load_active_rate_card():
+    global rate_tables, rate_card_checked_at
+    rate_card_checked_at = time.monotonic()
+    version = db.session.execute(select(RateCard.version).where(RateCard.active.is_(True))).scalar()
+    if version is None:
+        if db.session.execute(select(RateCard.version).limit(1)).first() is not None:
+            return rate_tables
+        try:
+            db.session.add(RateCard(version=1, data=default_rate_card_data(), active=True,
+                                    note='Built-in rates', created=datetime.now()))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()  # Seeded concurrently by another worker
+        version = 1
+    if version != rate_tables.version:
+        # A single reference assignment: requests see either the old or the new tables
+        rate_tables = rate_tables_for_version(version)
+    return rate_tables
+
+
+# Project stats changes from adding (sign 1) or removing (sign -1) project rows, merged per bucket.
+# Rows need status, type, material, cost_amount and area; `status` overrides the rows' status.
+def project_stats_changes(rows, sign, status=None, changes=None):
+    changes = {} if changes is None else changes
+    for row in rows:
+        key = (status or row.status, row.type, row.material)
+        count, cost, area = changes.get(key, (0, 0.0, 0.0))
+        changes[key] = (count + sign, cost + sign * (row.cost_amount or 0), area + sign * (row.area or 0))
+    return changes
+
+
+# Apply project stats changes in the current transaction with one insert-or-increment statement
+def apply_project_stats_changes(changes):
+    params = [{'status': status, 'type': type_, 'material': material,
+               'project_count': count, 'cost_total': cost, 'area_total': area}
+              for (status, type_, material), (count, cost, area) in changes.items() if count or cost or area]
+    if not params:
+        return
+    if db.engine.dialect.name == 'mysql':
+        stmt = mysql_insert(ProjectStats)
+        stmt = stmt.on_duplicate_key_update(
+            project_count=ProjectStats.project_count + stmt.inserted.project_count,
+            cost_total=ProjectStats.cost_total + stmt.inserted.cost_total,
+            area_total=ProjectStats.area_total + stmt.inserted.area_total
+        )
+    else:
+        stmt = sqlite_insert(ProjectStats)
+        stmt = stmt.on_conflict_do_update(index_elements=['status', 'type', 'material'], set_={
+            'project_count': ProjectStats.project_count + stmt.excluded.project_count,
+            'cost_total': ProjectStats.cost_total + stmt.excluded.cost_total,
+            'area_total': ProjectStats.area_total + stmt.excluded.area_total
+        })
+    db.session.execute(stmt, params)
+
+
+# Recompute project_stats from the project table (in the current transaction)
+def rebuild_project_stats():
+    db.session.execute(delete(ProjectStats))
+    db.session.execute(insert(ProjectStats).from_select(
+        ['status', 'type', 'material', 'project_count', 'cost_total', 'area_total'],
+        select(Project.status, Project.type, Project.material, func.count(Project.id),
+               func.coalesce(func.sum(Project.cost_amount), 0), func.coalesce(func.sum(Project.area), 0))
+        .where(Project.status.isnot(None))
+        .group_by(Project.status, Project.type, Project.material)
+    ))
+
+
+# Schema migrations: db.create_all() creates missing tables with the current schema, then each
+# migration not yet recorded in schema_migrations brings existing tables up to date, in order.
+# Migrations are idempotent, so workers starting together may run the same one safely.
+MIGRATION_BACKFILL_CHUNK_SIZE = int(os.environ.get('MIGRATION_BACKFILL_CHUNK_SIZE', 1000))  # Rows per backfill UPDATE
+MIGRATIONS = []
+
+
+# Register a schema migration; ids sort in the order migrations must run
+def migration(migration_id):
+    def register(function):
+        MIGRATIONS.append((migration_id, function))
+        return function
+    return register
+
+
+# Create a declared index unless it already exists
+def ensure_index(index):
+    try:
+        index.create(db.engine, checkfirst=True)
+    except (OperationalError, ProgrammingError):
+        # Another worker may have created it first
+        if index.name not in {i['name'] for i in inspect(db.engine).get_indexes(index.table.name)}:
+            raise
+
+
+# Dollar amount of a formatted cost string ("$123,456" -> 123456.0); unparseable values are 0
+def parse_cost_amount(value):
+    try:
+        return float(re.sub(r'[^\d.\-]', '', value or '') or 0)
+    except ValueError:
+        return 0.0
+
+
+@migration('0001_project_rate_card_version')
+def add_project_rate_card_version():
+    ensure_column(Project.__table__.name, 'rate_card_version', 'INTEGER')
+
+
+@migration('0002_project_indexes')
+def add_project_indexes():
+    for index in Project.__table__.indexes:
+        ensure_index(index)
+
+
+@migration('0003_project_cost_amounts')
+def add_project_cost_amounts():
+    ensure_column(Project.__table__.name, 'cost_amount', 'FLOAT NOT NULL DEFAULT 0')
+    ensure_column(Project.__table__.name, 'estimated_cost_amount', 'FLOAT')
+    # Backfill from the formatted strings in id order, one executemany UPDATE per chunk
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            select(Project.id, Project.cost, Project.estimated_cost)
+            .where(Project.id > last_id).order_by(Project.id).limit(MIGRATION_BACKFILL_CHUNK_SIZE)
+        ).all()
+        if not rows:
+            break
+        db.session.execute(update(Project), [{
+            'id': row.id,
+            'cost_amount': parse_cost_amount(row.cost),
+            'estimated_cost_amount': parse_cost_amount(row.estimated_cost) if row.estimated_cost else None
+        } for row in rows])
+        db.session.commit()
+        last_id = rows[-1].id
+
+
+@migration('0004_project_stats')
+def backfill_project_stats():
+    rebuild_project_stats()
+    db.session.commit()
+
+
+@migration('0005_project_versions')
+def add_project_versions():
+    ensure_column(Project.__table__.name, 'version', 'INTEGER NOT NULL DEFAULT 1')
+    ensure_column(Project.__table__.name, 'updated_at', 'DATETIME')
+    if db.session.get(TableVersion, Project.__table__.name) is None:
+        try:
+            db.session.add(TableVersion(name=Project.__table__.name, version=0, updated_at=datetime.now()))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()  # Seeded concurrently by another worker
+
+
+@migration('0006_project_search')
+def add_project_search_index():
+    table = Project.__table__.name
+    columns = ', '.join(PROJECT_SEARCH_COLUMNS)
+    if db.engine.dialect.name == 'mysql':
+        if PROJECT_SEARCH_INDEX in {index['name'] for index in inspect(db.engine).get_indexes(table)}:
+            return
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(text(f'ALTER TABLE {table} ADD FULLTEXT INDEX {PROJECT_SEARCH_INDEX} ({columns})'))
+        except (OperationalError, ProgrammingError):
+            # Another worker may have added it first
+            if PROJECT_SEARCH_INDEX not in {index['name'] for index in inspect(db.engine).get_indexes(table)}:
+                raise
+    elif db.engine.dialect.name == 'sqlite':
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(text(project_search_fts5_ddl()))
+                connection.execute(text(f"INSERT INTO {PROJECT_SEARCH_INDEX}({PROJECT_SEARCH_INDEX}) VALUES ('rebuild')"))
+        except OperationalError as e:
+            app.logger.warning("SQLite FTS5 unavailable, project search disabled: %s", e)
 
 
-with app.app_context():
-    db.create_all()
+@migration('0007_rfp_job_owner')
+def add_rfp_job_owner():
+    ensure_column(RfpJob.__table__.name, 'owner', 'VARCHAR(100)')
+
+
+# FTS5 table indexing the project search columns, reading their text from the project table
+def project_search_fts5_ddl():
+    return (f"CREATE VIRTUAL TABLE IF NOT EXISTS {PROJECT_SEARCH_INDEX} USING fts5("
+            f"{', '.join(PROJECT_SEARCH_COLUMNS)}, content='{Project.__table__.name}', content_rowid='id')")
+
+
+# Apply pending migrations, returning the ids applied
+def run_migrations():
+    applied = set(db.session.execute(select(SchemaMigration.id)).scalars())
+    ran = []
+    for migration_id, function in sorted(MIGRATIONS):
+        if migration_id in applied:
+            continue
+        function()
+        try:
+            db.session.add(SchemaMigration(id=migration_id, applied=datetime.now()))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()  # Recorded concurrently by another worker
+        ran.append(migration_id)
+        app.logger.info("Applied migration %s", migration_id)
+    return ran
+
+
+# Host, pid and kernel start time of a process, so a reused pid is not taken for the same process
+def process_identity(pid):
+    try:
+        with open(f'/proc/{pid}/stat') as stat:
+            started = stat.read().rsplit(')', 1)[1].split()[19]
+    except (OSError, IndexError):
+        started = ''  # Process gone, or no /proc on this platform
+    return f"{socket.gethostname()}:{pid}:{started}"
+
+
+# Whether the process that owns a job still runs: None when that cannot be told from this host
+def rfp_job_owner_alive(owner):
+    host, _, rest = (owner or '').partition(':')
+    pid, _, started = rest.partition(':')
+    if host != socket.gethostname() or not pid.isdigit():
+        return None
+    if started:
+        return process_identity(int(pid)) == owner
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+# Fail queued and running jobs whose process is gone: jobs live in an in-process pool, so a
+# restart loses them. Jobs of other hosts (or without an owner) are failed once they go stale.
+def fail_orphaned_jobs(model, error, **fields):
+    now = datetime.now()
+    failed = 0
+    for job in model.query.filter(model.status.in_(['queued', 'running'])).all():
+        alive = rfp_job_owner_alive(job.owner)
+        if alive is False or (alive is None and job.updated < now - timedelta(minutes=RFP_JOB_STALE_MINUTES)):
+            job.status = 'failed'
+            for key, value in fields.items():
+                setattr(job, key, value)
+            job.result = {'error': error, 'details': 'Interrupted by an app restart'}
+            job.updated = now
+            failed += 1
+    db.session.commit()
+    if failed:
+        app.logger.warning("Failed %d %s rows interrupted by a restart", failed, model.__tablename__)
+
+
+def fail_orphaned_rfp_jobs():
+    fail_orphaned_jobs(RfpJob, 'RFP processing failed', stage=None, status_code=500)
+    fail_orphaned_jobs(RepriceJob, 'Re-pricing failed')
+
+
+# Process pool workers import this module only for its task functions
+if multiprocessing.parent_process() is None:
+    with app.app_context():
+        db.create_all()
+        run_migrations()
+        load_active_rate_card()
+        fail_orphaned_rfp_jobs()
+
+
+# Pick up rate cards activated by other workers
+@app.before_request
+def refresh_rate_tables():
+    if time.monotonic() - rate_card_checked_at < RATE_CARD_REFRESH_SECONDS:
+        return
+    try:
+        load_active_rate_card()
+    except Exception as e:
+        db.session.rollback()
+        app.logger.warning("Rate card refresh failed: %s", e)
 
 
 # Serve the main index page
@@ -170,7 +810,10 @@ def index():
 # Add headers to prevent caching for admin sessions
 @app.after_request
 def add_header(response):
-    if 'admin_logged_in' in session:
+    if 'admin_logged_in' in session and response.headers.get('ETag'):
+        # Versioned project API responses: the browser may keep them but must revalidate each use
+        response.headers['Cache-Control'] = 'private, no-cache'
+    elif 'admin_logged_in' in session:
         response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
         response.headers['Pragma'] = 'no-cache'
         response.headers['Expires'] = '0'
@@ -206,15 +849,12 @@ def admin_dashboard():
         return redirect(url_for('admin_login_page'))
     
     status = request.args.get('status', 'pending')  # Filter by project status
-    query = Project.query
-    
-    if status != 'all':
-        query = query.filter_by(status=status)
-    
-    projects = query.all()
+    page = list_projects({'status': status, 'total': '0'})  # First page only; the table loads more on demand
     return render_template('admin_dashboard.html', 
                            status=status,
-                           projects=projects)
+                           projects=page['projects'],
+                           next_cursor=page['next_cursor'],
+                           page_size=PROJECTS_PAGE_SIZE)
 
 
 # Serve project detail page
@@ -223,7 +863,7 @@ def admin_project_detail(project_id):
     if not session.get('admin_logged_in'):
         return redirect(url_for('admin_login_page'))
     
-    project = db.session.get(Project, project_id)
+    project = db.session.get(Project, project_id, options=PROJECT_DETAIL_OPTIONS)
     if not project:
         return redirect(url_for('admin_dashboard'))
     
@@ -237,38 +877,480 @@ def admin_logout():
     return redirect(url_for('admin_login_page'))
 
 
-# Get all projects details
+# Opaque keyset cursor: the sort, order and the last row's sort value and id
+def encode_project_cursor(sort, order, value, project_id):
+    if sort == 'submitted':
+        value = value.strftime('%Y-%m-%d')
+    payload = json.dumps([sort, order, value, project_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+# Decode a keyset cursor into (sort value, id) for the requested sort and order
+def decode_project_cursor(cursor, sort, order):
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_sort, cursor_order, value, project_id = json.loads(payload)
+        if sort == 'submitted':
+            value = datetime.strptime(value, '%Y-%m-%d').date()
+        project_id = int(project_id)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    if (cursor_sort, cursor_order) != (sort, order):
+        raise ValueError('Cursor does not match sort and order')
+    return value, project_id
+
+
+# Parse a YYYY-MM-DD filter value
+def parse_date_filter(args, name):
+    value = args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f'{name} must be YYYY-MM-DD')
+
+
+# Statement and page settings of a project list request
+ProjectListQuery = namedtuple('ProjectListQuery', ['statement', 'filters', 'fields', 'sort', 'order', 'limit'])
+
+
+# Build the SELECT for a project list request
+def build_project_list_query(args, paginate=True):
+    """Filters: status (default pending, 'all' for every status), type, material, location
+    (substring) and submitted_from/submitted_to. Only the `fields` columns are selected (id is
+    always included). Pages are ordered by (sort, id) and continue from the previous page's
+    `next_cursor`. Raises ValueError for bad parameters.
+    """
+    columns = Project.__table__.columns
+    fields = [f.strip() for f in (args.get('fields') or ','.join(PROJECT_LIST_FIELDS)).split(',') if f.strip()]
+    unknown = [f for f in fields if f not in columns]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    fields = ['id'] + [f for f in dict.fromkeys(fields) if f != 'id']
+    sort = args.get('sort', 'submitted')
+    order = args.get('order', 'desc')
+    if sort not in PROJECT_SORT_FIELDS:
+        raise ValueError(f"sort must be one of: {', '.join(PROJECT_SORT_FIELDS)}")
+    if order not in ('asc', 'desc'):
+        raise ValueError('order must be asc or desc')
+
+    filters = []
+    status = args.get('status', 'pending')
+    if status != 'all':
+        filters.append(Project.status == status)
+    if args.get('type'):
+        filters.append(Project.type == args['type'].capitalize())
+    if args.get('material'):
+        filters.append(Project.material == args['material'].capitalize())
+    if args.get('location'):
+        filters.append(Project.location.contains(args['location'], autoescape=True))
+    submitted_from = parse_date_filter(args, 'submitted_from')
+    submitted_to = parse_date_filter(args, 'submitted_to')
+    if submitted_from:
+        filters.append(Project.submitted >= submitted_from)
+    if submitted_to:
+        filters.append(Project.submitted <= submitted_to)
+
+    sort_column = columns[sort]
+    selected = fields + ([sort] if sort not in fields else [])
+    descending = order == 'desc'
+    stmt = (select(*(columns[f] for f in selected)).where(*filters)
+            .order_by(*((sort_column.desc(), Project.id.desc()) if descending else (sort_column, Project.id))))
+
+    limit = None
+    if paginate:
+        try:
+            limit = int(args.get('limit', PROJECTS_PAGE_SIZE))
+        except ValueError:
+            raise ValueError('limit must be an integer')
+        if not 1 <= limit <= PROJECTS_MAX_PAGE_SIZE:
+            raise ValueError(f'limit must be between 1 and {PROJECTS_MAX_PAGE_SIZE}')
+        if args.get('cursor'):
+            value, last_id = decode_project_cursor(args['cursor'], sort, order)
+            if sort == 'id':
+                stmt = stmt.where(Project.id < last_id if descending else Project.id > last_id)
+            elif descending:
+                stmt = stmt.where(or_(sort_column < value, and_(sort_column == value, Project.id < last_id)))
+            else:
+                stmt = stmt.where(or_(sort_column > value, and_(sort_column == value, Project.id > last_id)))
+        stmt = stmt.limit(limit + 1)  # One extra row tells whether there is a next page
+
+    return ProjectListQuery(stmt, filters, fields, sort, order, limit)
+
+
+# One project list entry: the requested fields, with dates as YYYY-MM-DD
+def project_list_item(row, fields):
+    item = {}
+    for field in fields:
+        value = getattr(row, field)
+        item[field] = value.strftime('%Y-%m-%d') if hasattr(value, 'strftime') else value
+    return item
+
+
+# Filtered, sorted and keyset-paginated project list (`total=0` skips the count query)
+def list_projects(args, paginate=True):
+    stmt, filters, fields, sort, order, limit = build_project_list_query(args, paginate)
+    rows = db.session.execute(stmt).all()
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_project_cursor(sort, order, getattr(rows[-1], sort), rows[-1].id)
+
+    projects = [project_list_item(row, fields) for row in rows]
+
+    total = None
+    if paginate and args.get('total', '1').lower() not in ('0', 'false'):
+        total = db.session.scalar(select(func.count(Project.id)).where(*filters))
+    return {'projects': projects, 'next_cursor': next_cursor, 'total': total, 'limit': limit}
+
+
+# Record a write to the project table in the current transaction. The change counter it bumps
+# versions every list response, so cached responses and client ETags go stale in every worker.
+def record_project_change():
+    table = Project.__table__.name
+    db.session.execute(update(TableVersion).where(TableVersion.name == table)
+                       .values(version=TableVersion.version + 1, updated_at=datetime.now()))
+    with project_response_cache_lock:
+        project_response_cache.clear()
+
+
+# Queue dashboard events for changed projects in the current transaction
+def record_project_events(kind, rows):
+    """`rows` are projects or rows with the default list fields. A deleted event carries only
+    the id; the others carry the list entry (status set by accepted and rejected events) so
+    dashboards can add or update the row in place.
+    """
+    now = datetime.now()
+    events = []
+    for row in rows:
+        data = {'id': row.id} if kind == 'deleted' else project_list_item(row, PROJECT_LIST_FIELDS)
+        if kind in ('accepted', 'rejected'):
+            data['status'] = kind
+        events.append({'kind': kind, 'project_id': row.id, 'data': data, 'created': now})
+    db.session.execute(insert(ProjectEvent), events)
+
+
+# Search backend of this database: 'fulltext' (MySQL), 'fts5' (SQLite) or None when unavailable
+@lru_cache(maxsize=1)
+def project_search_backend():
+    if db.engine.dialect.name == 'mysql':
+        return 'fulltext'
+    # Inspect through the session's connection: the first call may come inside a write transaction
+    if db.engine.dialect.name == 'sqlite' and inspect(db.session.connection()).has_table(PROJECT_SEARCH_INDEX):
+        return 'fts5'
+    return None
+
+
+# Add new projects to the search index in the current transaction (after a flush, so they have ids)
+def index_project_search(ids):
+    """MySQL maintains FULLTEXT indexes itself; the SQLite FTS5 table is updated here."""
+    if project_search_backend() == 'fts5':
+        columns = ', '.join(PROJECT_SEARCH_COLUMNS)
+        db.session.execute(text(
+            f"INSERT INTO {PROJECT_SEARCH_INDEX}(rowid, {columns}) "
+            f"SELECT id, {columns} FROM {Project.__table__.name} WHERE id IN :ids"
+        ).bindparams(bindparam('ids', expanding=True)), {'ids': list(ids)})
+
+
+# Remove projects from the search index in the current transaction, before the rows are deleted
+def unindex_project_search(ids):
+    """FTS5 removes an externally stored row given the text it indexed, read here from the row."""
+    if project_search_backend() == 'fts5':
+        columns = ', '.join(PROJECT_SEARCH_COLUMNS)
+        db.session.execute(text(
+            f"INSERT INTO {PROJECT_SEARCH_INDEX}({PROJECT_SEARCH_INDEX}, rowid, {columns}) "
+            f"SELECT 'delete', id, {columns} FROM {Project.__table__.name} WHERE id IN :ids"
+        ).bindparams(bindparam('ids', expanding=True)), {'ids': list(ids)})
+
+
+# Current (version, updated_at) of the project table's change counter: one primary key lookup
+def project_change_counter():
+    row = db.session.execute(
+        select(TableVersion.version, TableVersion.updated_at).where(TableVersion.name == Project.__table__.name)
+    ).first()
+    return (row.version, row.updated_at) if row else (0, None)
+
+
+# JSON response with a strong ETag and Last-Modified, served from the response cache when possible
+def conditional_json(cache_key, etag, updated_at, build):
+    """A request whose If-None-Match (or, without one, If-Modified-Since) matches gets a 304
+    and nothing is built or serialized. Otherwise the cached body for `etag` is reused, or
+    `build()` produces the data and its serialized body is cached.
+    """
+    last_modified = updated_at.astimezone(timezone.utc).replace(microsecond=0) if updated_at else None
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains(etag)
+    else:
+        not_modified = bool(last_modified and request.if_modified_since and last_modified <= request.if_modified_since)
+
+    if not_modified:
+        response = app.response_class(status=304)
+        with project_response_cache_lock:
+            project_response_stats['not_modified'] += 1
+    else:
+        with project_response_cache_lock:
+            cached = project_response_cache.get(cache_key)
+            if cached and cached[0] == etag:
+                project_response_cache.move_to_end(cache_key)
+                project_response_stats['hits'] += 1
+        if cached and cached[0] == etag:
+            response = app.response_class(cached[1], mimetype=app.json.mimetype)
+        else:
+            response = app.json.response(build())
+            with project_response_cache_lock:
+                project_response_stats['misses'] += 1
+                project_response_cache[cache_key] = (etag, response.get_data())
+                project_response_cache.move_to_end(cache_key)
+                while len(project_response_cache) > PROJECT_RESPONSE_CACHE_SIZE:
+                    project_response_cache.popitem(last=False)
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    return response
+
+
+# List projects: a plain list of every match, or one page when `limit` or `cursor` is given
 @app.route('/api/admin/projects', methods=['GET'])
 def get_projects():
     if not session.get('admin_logged_in'):
         return jsonify({'error': 'Unauthorized'}), 401
-    
-    status = request.args.get('status', 'pending')
-    
-    if status == 'all':
-        projects = Project.query.all()
+
+    paginate = 'limit' in request.args or 'cursor' in request.args
+
+    def build():
+        page = list_projects(request.args, paginate=paginate)
+        return page if paginate else page['projects']
+
+    version, updated_at = project_change_counter()
+    query = request.query_string.decode()
+    etag = f"projects-{version}-{hashlib.sha1(query.encode()).hexdigest()[:16]}"
+    try:
+        return conditional_json(('projects', query), etag, updated_at, build)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+
+# Words and quoted phrases of a search query: (lower-cased words, prefix match) pairs
+def parse_search_query(query):
+    """Bare words match as prefixes ("mill" finds "milling"); "quoted phrases" match exactly.
+    Only word characters are kept, so no query can be a syntax error for the search engine.
+    """
+    terms = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\w+)', query.lower()):
+        words = tuple(re.findall(r'\w+', phrase or word))
+        if words and (words, not phrase) not in terms:
+            terms.append((words, not phrase))
+    return terms[:PROJECT_SEARCH_MAX_TERMS]
+
+
+# Statement selecting the ids and scores of projects matching every term, best first
+def build_project_search_query(terms, backend, status='all', limit=PROJECT_SEARCH_PAGE_SIZE, offset=0):
+    """Returns (statement, params). SQLite ranks with bm25 weighted by PROJECT_SEARCH_WEIGHTS; MySQL
+    with its boolean mode relevance. MySQL skips bare words shorter than innodb_ft_min_token_size
+    (3 by default), which it does not index.
+    """
+    table = Project.__table__.name
+    params = {'limit': limit, 'offset': offset}
+    if backend == 'fts5':
+        params['query'] = ' AND '.join(f'"{" ".join(words)}"' + ('*' if prefix else '') for words, prefix in terms)
+        weights = ', '.join(str(weight) for weight in PROJECT_SEARCH_WEIGHTS)
+        # Ranking costs a few microseconds per matching row; join project only to filter by status
+        join = f" JOIN {table} p ON p.id = {PROJECT_SEARCH_INDEX}.rowid" if status != 'all' else ''
+        sql = (f"SELECT {PROJECT_SEARCH_INDEX}.rowid AS id, -bm25({PROJECT_SEARCH_INDEX}, {weights}) AS score "
+               f"FROM {PROJECT_SEARCH_INDEX}{join} WHERE {PROJECT_SEARCH_INDEX} MATCH :query")
     else:
-        projects = Project.query.filter_by(status=status).all()
-    
-    # Return project data as JSON
-    return jsonify([{
-        'id': p.id,
-        'name': p.name,
-        'type': p.type,
-        'location': p.location,
-        'submitted': p.submitted.strftime('%Y-%m-%d'),
-        'status': p.status,
-        'cost': p.cost,
-    } for p in projects])
+        params['query'] = ' '.join(f'+"{" ".join(words)}"' if not prefix else f'+{words[0]}*'
+                                   for words, prefix in terms if not prefix or len(words[0]) >= 3)
+        match = f"MATCH ({', '.join(PROJECT_SEARCH_COLUMNS)}) AGAINST (:query IN BOOLEAN MODE)"
+        sql = f"SELECT p.id AS id, {match} AS score FROM {table} p WHERE {match}"
+    if status != 'all':
+        sql += ' AND p.status = :status'
+        params['status'] = status
+    return text(sql + ' ORDER BY score DESC LIMIT :limit OFFSET :offset'), params
+
+
+# Regex matching any search term in text, as the search index tokenizes it
+def search_terms_pattern(terms):
+    parts = []
+    for words, prefix in terms:
+        part = r'\W+'.join(re.escape(word) for word in words)
+        parts.append(r'\b' + part + (r'\w*' if prefix else r'\b'))
+    return re.compile('|'.join(parts), re.IGNORECASE)
+
+
+# HTML-escaped text with search matches wrapped in <mark>, cut to an excerpt around the first match
+def highlight_search_terms(value, pattern, excerpt_chars=None):
+    value = value or ''
+    start, end = 0, len(value)
+    if excerpt_chars and len(value) > excerpt_chars:
+        first = pattern.search(value)
+        start = max(0, (first.start() if first else 0) - excerpt_chars // 3)
+        end = min(len(value), start + excerpt_chars)
+    excerpt = value[start:end]
+    parts, position = [], 0
+    for found in pattern.finditer(excerpt):
+        parts.append(html.escape(excerpt[position:found.start()]))
+        parts.append(f'<mark>{html.escape(found.group())}</mark>')
+        position = found.end()
+    parts.append(html.escape(excerpt[position:]))
+    return ('…' if start else '') + ''.join(parts) + ('…' if end < len(value) else '')
+
+
+# Full-text search over project name, location, scope and requirements
+@app.route('/api/admin/projects/search', methods=['GET'])
+def search_projects():
+    """Query parameters: q (words and "quoted phrases", all required), status (default all),
+    limit and offset. Each result is a project list entry with its score and highlighted
+    name, location, and scope/requirements excerpts.
+    """
+    if not session.get('admin_logged_in'):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    backend = project_search_backend()
+    if backend is None:
+        return jsonify({'error': 'Search index unavailable'}), 503
+    terms = parse_search_query(request.args.get('q', ''))
+    if not terms:
+        return jsonify({'error': 'q must contain at least one word'}), 400
+    status = request.args.get('status', 'all')
+    if status not in ('all', 'pending', 'accepted', 'rejected'):
+        return jsonify({'error': 'status must be one of: all, pending, accepted, rejected'}), 400
+    try:
+        limit = int(request.args.get('limit', PROJECT_SEARCH_PAGE_SIZE))
+        offset = int(request.args.get('offset', 0))
+    except ValueError:
+        return jsonify({'error': 'limit and offset must be integers'}), 400
+    if not 1 <= limit <= PROJECT_SEARCH_MAX_PAGE_SIZE or offset < 0:
+        return jsonify({'error': f'limit must be between 1 and {PROJECT_SEARCH_MAX_PAGE_SIZE} and offset at least 0'}), 400
+
+    stmt, params = build_project_search_query(terms, backend, status, limit + 1, offset)
+    if not params['query']:
+        return jsonify({'query': request.args['q'], 'results': [], 'has_more': False})
+    matches = db.session.execute(stmt, params).all()
+    has_more = len(matches) > limit
+    matches = matches[:limit]
+
+    # Only the page of results is loaded and highlighted
+    rows = {row.id: row for row in db.session.execute(
+        select(*(getattr(Project, field) for field in dict.fromkeys(PROJECT_LIST_FIELDS + PROJECT_SEARCH_COLUMNS)))
+        .where(Project.id.in_([match.id for match in matches]))
+    )}
+    pattern = search_terms_pattern(terms)
+    results = []
+    for match in matches:
+        row = rows.get(match.id)
+        if row is None:
+            continue  # Deleted since the search query ran
+        result = project_list_item(row, PROJECT_LIST_FIELDS)
+        result['score'] = float(match.score)
+        result['highlights'] = {
+            'name': highlight_search_terms(row.name, pattern),
+            'location': highlight_search_terms(row.location, pattern),
+            'scope': highlight_search_terms(row.scope, pattern, PROJECT_SEARCH_SNIPPET_CHARS),
+            'requirements': highlight_search_terms(row.requirements, pattern, PROJECT_SEARCH_SNIPPET_CHARS)
+        }
+        results.append(result)
+    return jsonify({'query': request.args['q'], 'results': results, 'has_more': has_more})
+
+
+# Dashboard queries checked by `flask explain-queries`: (name, statement, index it must use, ordered by the index)
+def dashboard_query_plans():
+    cursor = encode_project_cursor('submitted', 'desc', datetime(2025, 1, 1).date(), 1000)
+    today = datetime.now().date()
+    return [
+        ('pending tab', build_project_list_query({'status': 'pending'}).statement,
+         'ix_project_status_submitted_id', True),
+        ('pending tab, next page', build_project_list_query({'status': 'pending', 'cursor': cursor}).statement,
+         'ix_project_status_submitted_id', True),
+        ('all projects', build_project_list_query({'status': 'all'}).statement, 'ix_project_submitted_id', True),
+        ('submitted range', build_project_list_query(
+            {'status': 'all', 'submitted_from': (today - timedelta(days=30)).isoformat(), 'total': '1'}).statement,
+         'ix_project_submitted_id', True),
+        ('completion date range', select(Project.id, Project.completion_date)
+         .where(Project.completion_date.between(today, today + timedelta(days=90))),
+         'ix_project_completion_date', False),
+        ('type/material breakdown', select(Project.type, Project.material, func.count(Project.id))
+         .group_by(Project.type, Project.material), 'ix_project_type_material', False),
+    ]
+
+
+# Indexes used by a statement's query plan, and whether the plan sorts rows itself
+def explain_query(stmt, session=None):
+    session = session or db.session
+    dialect = session.get_bind().dialect
+    sql = str(stmt.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+    if dialect.name == 'sqlite':
+        details = [row[-1] for row in session.execute(text('EXPLAIN QUERY PLAN ' + sql))]
+        used = {name for detail in details for name in re.findall(r'USING (?:COVERING )?INDEX (\w+)', detail)}
+        return used, any('TEMP B-TREE' in detail for detail in details)
+    rows = session.execute(text('EXPLAIN ' + sql)).mappings().all()
+    return {row['key'] for row in rows if row['key']}, any('filesort' in (row['Extra'] or '') for row in rows)
+
+
+# Check every dashboard query plan; returns (passed, report line) per query
+def check_dashboard_query_plans(session=None):
+    results = []
+    for name, stmt, index, ordered in dashboard_query_plans():
+        used, sorts = explain_query(stmt, session)
+        passed = index in used and not (ordered and sorts)
+        results.append((passed, f"{'ok  ' if passed else 'FAIL'} {name}: {', '.join(sorted(used)) or 'no index'}"
+                                f"{' + sort' if sorts else ''} (expected {index})"))
+    return results
+
+
+# Recompute project_stats from the project table: flask --app app rebuild-project-stats
+@app.cli.command('rebuild-project-stats')
+def rebuild_project_stats_command():
+    rebuild_project_stats()
+    db.session.commit()
+    click.echo(f"Rebuilt {db.session.scalar(select(func.count()).select_from(ProjectStats))} project stats rows")
+
+
+# Rebuild the SQLite search index from the project table: flask --app app rebuild-search-index
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    if project_search_backend() != 'fts5':
+        click.echo('No SQLite search index to rebuild (MySQL maintains its FULLTEXT index itself)')
+        return
+    db.session.execute(text(f"INSERT INTO {PROJECT_SEARCH_INDEX}({PROJECT_SEARCH_INDEX}) VALUES ('rebuild')"))
+    db.session.commit()
+    click.echo(f"Rebuilt {PROJECT_SEARCH_INDEX}")
+
+
+# Fail when a dashboard query does not use its index: flask --app app explain-queries
+@app.cli.command('explain-queries')
+def explain_queries_command():
+    """Run against a database with production-sized data; optimizers may scan tiny tables.
+    benchmarks/bench_query_plans.py runs the same checks on a seeded throwaway database.
+    """
+    failures = 0
+    for passed, line in check_dashboard_query_plans():
+        click.echo(line)
+        failures += not passed
+    if failures:
+        raise SystemExit(1)
+
+
+# Set a project's status and move it between project_stats buckets in the same transaction
+def set_project_status(project, status):
+    if project.status != status:
+        changes = project_stats_changes([project], -1)
+        apply_project_stats_changes(project_stats_changes([project], 1, status=status, changes=changes))
+        project.status = status
+        project.version += 1
+        project.updated_at = datetime.now()
+        record_project_change()
+        record_project_events(status, [project])
+    db.session.commit()
 
 
 # Accept project
 @app.route('/api/admin/projects/<int:project_id>/accept', methods=['POST'])
 def accept_project(project_id):
-    project = db.session.get(Project, project_id)
+    project = db.session.get(Project, project_id, with_for_update=True)
     if project:
-        project.status = 'accepted'
-        db.session.commit()
+        set_project_status(project, 'accepted')
         return jsonify({'message': 'Project accepted'})
     return jsonify({'error': 'Project not found'}), 404
 
@@ -276,10 +1358,9 @@ def accept_project(project_id):
 # Reject project
 @app.route('/api/admin/projects/<int:project_id>/reject', methods=['POST'])
 def reject_project(project_id):
-    project = db.session.get(Project, project_id)
+    project = db.session.get(Project, project_id, with_for_update=True)
     if project:
-        project.status = 'rejected'
-        db.session.commit()
+        set_project_status(project, 'rejected')
         return jsonify({'message': 'Project rejected'})
     return jsonify({'error': 'Project not found'}), 404
 
@@ -287,21 +1368,177 @@ def reject_project(project_id):
 # Delete project
 @app.route('/api/admin/projects/<int:project_id>', methods=['DELETE'])
 def delete_project(project_id):
-    project = db.session.get(Project, project_id)
+    project = db.session.get(Project, project_id, with_for_update=True)
     if project:
+        apply_project_stats_changes(project_stats_changes([project], -1))
+        record_project_change()
+        record_project_events('deleted', [project])
+        unindex_project_search([project.id])
         db.session.delete(project)
         db.session.commit()
         return jsonify({'message': 'Project deleted'})
     return jsonify({'error': 'Project not found'}), 404
 
 
+# Apply a bulk action to one chunk of project ids in a single transaction, returning {id: outcome}
+def apply_bulk_action(action, ids):
+    """Outcomes: 'accepted', 'rejected' or 'deleted' when the project changed, 'unchanged' when it
+    already had the status, 'not_found' otherwise. The rows are locked, changed with one UPDATE
+    or DELETE ... WHERE id IN (...), and project_stats is adjusted before the commit.
+    """
+    rows = db.session.execute(
+        select(Project.id, Project.status, Project.type, Project.material, Project.cost_amount, Project.area,
+               Project.name, Project.location, Project.submitted, Project.cost)
+        .where(Project.id.in_(ids)).with_for_update()
+    ).all()
+    found = {row.id for row in rows}
+    outcomes = {project_id: 'not_found' for project_id in ids if project_id not in found}
+    status = BULK_ACTIONS[action]
+    targets = [row for row in rows if action == 'delete' or row.status != status]
+    outcomes.update({row.id: 'unchanged' for row in rows if action != 'delete' and row.status == status})
+    if targets:
+        target_ids = [row.id for row in targets]
+        changes = project_stats_changes(targets, -1)
+        if action == 'delete':
+            unindex_project_search(target_ids)
+            stmt = delete(Project).where(Project.id.in_(target_ids))
+        else:
+            project_stats_changes(targets, 1, status=status, changes=changes)
+            stmt = (update(Project).where(Project.id.in_(target_ids))
+                    .values(status=status, version=Project.version + 1, updated_at=datetime.now()))
+        db.session.execute(stmt.execution_options(synchronize_session=False))
+        apply_project_stats_changes(changes)
+        record_project_change()
+        record_project_events(status or 'deleted', targets)
+        outcomes.update({project_id: status or 'deleted' for project_id in target_ids})
+    db.session.commit()
+    return outcomes
+
+
+# Ids of the projects matching list filters, in id-ordered chunks
+def filtered_project_id_chunks(filters):
+    last_id = 0
+    while True:
+        ids = db.session.execute(
+            select(Project.id).where(*filters, Project.id > last_id).order_by(Project.id).limit(BULK_CHUNK_SIZE)
+        ).scalars().all()
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+# Accept, reject or delete many projects
+@app.route('/api/admin/projects/bulk', methods=['POST'])
+def bulk_update_projects():
+    """Body: {"action": "accept" | "reject" | "delete"} with either "ids" (a list of project ids)
+    or "filter" (the /api/admin/projects filter parameters; status defaults to pending). Work
+    runs in chunks of BULK_CHUNK_SIZE projects, each committed on its own.
+    """
+    if not session.get('admin_logged_in'):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    payload = request.get_json(silent=True) or {}
+    action = payload.get('action')
+    if action not in BULK_ACTIONS:
+        return jsonify({'error': f"action must be one of: {', '.join(BULK_ACTIONS)}"}), 400
+    if ('ids' in payload) == ('filter' in payload):
+        return jsonify({'error': 'Provide either ids or filter'}), 400
+
+    if 'ids' in payload:
+        ids = payload['ids']
+        if not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+            return jsonify({'error': 'ids must be a list of integers'}), 400
+        if len(ids) > BULK_MAX_IDS:
+            return jsonify({'error': f'At most {BULK_MAX_IDS} ids per request'}), 400
+        ids = list(dict.fromkeys(ids))
+        chunks = (ids[start:start + BULK_CHUNK_SIZE] for start in range(0, len(ids), BULK_CHUNK_SIZE))
+    else:
+        if not isinstance(payload['filter'], dict):
+            return jsonify({'error': 'filter must be an object'}), 400
+        try:
+            filters = build_project_list_query({key: str(value) for key, value in payload['filter'].items()},
+                                               paginate=False).filters
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        chunks = filtered_project_id_chunks(filters)
+
+    results = {}
+    try:
+        for chunk in chunks:
+            results.update(apply_bulk_action(action, chunk))
+    except Exception as e:
+        # Earlier chunks stay committed; report what was done
+        db.session.rollback()
+        return jsonify({'error': 'Database operation failed', 'details': str(e), 'results': results}), 500
+    counts = {}
+    for outcome in results.values():
+        counts[outcome] = counts.get(outcome, 0) + 1
+    return jsonify({'action': action, 'matched': len(results), 'counts': counts, 'results': results})
+
+
+# Dashboard summary: status counts, pipeline value, cost per sq ft and win rates
+@app.route('/api/admin/stats', methods=['GET'])
+def get_project_stats():
+    """Aggregates run over project_stats (one row per status/type/material), so the cost
+    does not grow with the number of projects. Win rate is accepted / (accepted + rejected)."""
+    if not session.get('admin_logged_in'):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    status_rows = db.session.execute(
+        select(ProjectStats.status, func.sum(ProjectStats.project_count), func.sum(ProjectStats.cost_total),
+               func.sum(ProjectStats.area_total))
+        .group_by(ProjectStats.status)
+    ).all()
+    status_counts = {status: 0 for status in ('pending', 'accepted', 'rejected')}
+    values = {}
+    area_total = cost_total = 0
+    for status, count, cost, area in status_rows:
+        status_counts[status] = int(count or 0)
+        values[status] = cost or 0
+        cost_total += cost or 0
+        area_total += area or 0
+
+    def win_rates(column):
+        accepted = func.sum(case((ProjectStats.status == 'accepted', ProjectStats.project_count), else_=0))
+        rejected = func.sum(case((ProjectStats.status == 'rejected', ProjectStats.project_count), else_=0))
+        rows = db.session.execute(
+            select(column, accepted, rejected).group_by(column).having(func.sum(ProjectStats.project_count) > 0)
+        ).all()
+        return {
+            name: {
+                'accepted': int(won or 0),
+                'rejected': int(lost or 0),
+                'win_rate': round(won / (won + lost), 4) if won or lost else None
+            }
+            for name, won, lost in rows
+        }
+
+    return jsonify({
+        'status_counts': status_counts,
+        'project_count': sum(status_counts.values()),
+        'pipeline_value': round(values.get('pending', 0), 2),
+        'accepted_value': round(values.get('accepted', 0), 2),
+        'avg_cost_per_sqft': round(cost_total / area_total, 2) if area_total else None,
+        'win_rate_by_type': win_rates(ProjectStats.type),
+        'win_rate_by_material': win_rates(ProjectStats.material)
+    })
+
+
 # Get project details
 @app.route('/api/admin/projects/<int:project_id>', methods=['GET'])
 def get_project(project_id):
-    project = db.session.get(Project, project_id)
-    if project:
+    # The row's version decides whether the client's copy is current before anything is loaded
+    current = db.session.execute(
+        select(Project.version, Project.updated_at).where(Project.id == project_id)
+    ).first()
+    if not current:
+        return jsonify({'error': 'Project not found'}), 404
+
+    def build():
+        project = db.session.get(Project, project_id, options=PROJECT_DETAIL_OPTIONS)
         # Return detailed project data as JSON
-        return jsonify({
+        return {
             'id': project.id,
             'name': project.name,
             'type': project.type,
@@ -330,87 +1567,519 @@ def get_project(project_id):
                 'pavingHours': project.paving_hours,
                 'finishingHours': project.finishing_hours
             }
-        })
-    return jsonify({'error': 'Project not found'}), 404
+        }
 
+    return conditional_json(('project', project_id), f"project-{project_id}-{current.version}", current.updated_at, build)
 
-# Extract text from PDF files
-def extract_text_from_pdf(file):
-    pdf_reader = PyPDF2.PdfReader(file)
-    text = ""
-    for page in pdf_reader.pages:
-        page_text = page.extract_text()
-        if page_text:
-            text += page_text + "\n"
-    return text
 
-# Extract text from DOCX files
-def extract_text_from_docx(file):
-    doc = Document(BytesIO(file.read()))
-    text = ""
-    for para in doc.paragraphs:
-        if para.text.strip():
-            text += para.text + "\n"
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                cell_text = cell.text.strip()
-                if cell_text:
-                    text += cell_text + "\n"
-    if not text.strip():
-        raise ValueError("No text found in DOCX.")
+# Formatted SSE message for a project_events row
+def format_project_event(event):
+    return f"id: {event.id}\nevent: {event.kind}\ndata: {json.dumps(event.data, separators=(',', ':'))}\n\n"
+
+
+# Read committed project events into this worker's ring buffer and wake the streams waiting on it
+def poll_project_events(gap):
+    """Event ids are allocated at insert but become visible at commit, so a lower id can show up
+    after a higher one. A skipped id holds the buffer back until it commits or, after
+    PROJECT_EVENT_GAP_SECONDS, is taken to be a rolled back transaction. Returns the updated gap
+    state: (missing id, first seen) or None.
+    """
+    last_id = project_events_state['last_id']
+    events = db.session.execute(
+        select(ProjectEvent).where(ProjectEvent.id > last_id).order_by(ProjectEvent.id).limit(PROJECT_EVENT_BUFFER_SIZE)
+    ).scalars().all()
+    messages = []
+    for event in events:
+        if event.id != last_id + 1:
+            if gap is None or gap[0] != last_id + 1:
+                gap = (last_id + 1, time.monotonic())
+            if time.monotonic() - gap[1] < PROJECT_EVENT_GAP_SECONDS:
+                break
+        gap = None
+        messages.append((event.id, format_project_event(event)))
+        last_id = event.id
+    if messages:
+        with project_events_condition:
+            for message in messages:
+                if len(project_events) == project_events.maxlen:
+                    project_events_state['floor'] = project_events[0][0]
+                project_events.append(message)
+            project_events_state['last_id'] = last_id
+            project_events_condition.notify_all()
+    return gap
+
+
+# Background thread: poll project_events and purge rows past the retention window
+def run_project_event_listener():
+    gap = None
+    purged = 0
+    while True:
+        with app.app_context():
+            try:
+                gap = poll_project_events(gap)
+                if time.monotonic() - purged > 3600:
+                    db.session.execute(delete(ProjectEvent).where(
+                        ProjectEvent.created < datetime.now() - timedelta(hours=PROJECT_EVENT_RETENTION_HOURS)))
+                    db.session.commit()
+                    purged = time.monotonic()
+            except Exception as e:
+                db.session.rollback()
+                app.logger.warning("Project event poll failed: %s", e)
+            finally:
+                db.session.remove()
+        time.sleep(PROJECT_EVENT_POLL_SECONDS)
+
+
+# Fill the ring buffer with the most recent events and start this worker's listener thread once
+def start_project_event_listener():
+    with project_events_condition:
+        if project_events_state['listener']:
+            return
+        events = db.session.execute(
+            select(ProjectEvent).order_by(ProjectEvent.id.desc()).limit(PROJECT_EVENT_BUFFER_SIZE)
+        ).scalars().all()[::-1]
+        project_events.extend((event.id, format_project_event(event)) for event in events)
+        if events:
+            project_events_state['floor'] = events[0].id - 1
+            project_events_state['last_id'] = events[-1].id
+        listener = threading.Thread(target=run_project_event_listener, name='project-events', daemon=True)
+        listener.start()
+        project_events_state['listener'] = listener
+
+
+# Buffered messages after `last_id`, oldest first, or None when some may have left the buffer
+def project_events_after(last_id):
+    if last_id < project_events_state['floor']:
+        return None
+    messages = []
+    for event_id, message in reversed(project_events):
+        if event_id <= last_id:
+            break
+        messages.append((event_id, message))
+    return messages[::-1]
+
+
+# Stream project events to one client, starting after `last_id`
+def project_event_stream(last_id):
+    yield f"retry: {PROJECT_EVENT_POLL_SECONDS * 2000:.0f}\n\n"
+    while True:
+        with project_events_condition:
+            messages = project_events_after(last_id)
+            if messages == []:
+                project_events_condition.wait(PROJECT_EVENT_HEARTBEAT_SECONDS)
+                messages = project_events_after(last_id)
+            current_id = project_events_state['last_id']
+        if messages is None:
+            # Too far behind to replay: the client reloads its list and continues from here
+            last_id = current_id
+            yield f"id: {last_id}\nevent: reset\ndata: {{}}\n\n"
+        elif messages:
+            last_id = messages[-1][0]
+            yield ''.join(message for _, message in messages)
+        else:
+            yield ': keep-alive\n\n'
+
+
+# Live project changes for the admin dashboard as server-sent events
+@app.route('/api/admin/events', methods=['GET'])
+def stream_project_events():
+    """Events: created, accepted, rejected and deleted, each carrying a compact delta, plus reset
+    when a reconnecting client's Last-Event-ID is older than the replay buffer. Each stream holds
+    a worker thread, so run gunicorn with threaded (gthread) or async workers.
+    """
+    if not session.get('admin_logged_in'):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    start_project_event_listener()
+    last_id = request.headers.get('Last-Event-ID', request.args.get('last_event_id', ''))
+    last_id = int(last_id) if last_id.isdigit() else project_events_state['last_id']
+    return Response(project_event_stream(last_id), mimetype='text/event-stream',
+                    headers={'X-Accel-Buffering': 'no'})  # Stop nginx from buffering the stream
+
+
+# Get runtime metrics (extraction cache counters)
+@app.route('/api/admin/metrics', methods=['GET'])
+def get_metrics():
+    if not session.get('admin_logged_in'):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    with rfp_cache_lock:
+        cache_stats = {key: dict(value) if isinstance(value, dict) else value
+                       for key, value in rfp_cache_stats.items()}
+        cache_stats['size_bytes'] = rfp_cache_size
+
+    with prompt_stats_lock:
+        prefilter_stats = dict(prompt_stats)
+
+    with tier_stats_lock:
+        model_stats = {key: tier_stats[key] for key in ['documents', 'escalations', 'partial']}
+        for tier, model in [('fast', OPENAI_FAST_MODEL), ('large', OPENAI_MODEL)]:
+            stats = tier_stats[tier]
+            model_stats[tier] = {
+                'model': model,
+                'calls': stats['calls'],
+                'failures': stats['failures'],
+                'latency_avg': round(stats['latency_total'] / stats['calls'], 3) if stats['calls'] else None,
+                'latency_max': round(stats['latency_max'], 3)
+            }
+    model_stats['escalation_rate'] = (
+        round(model_stats['escalations'] / model_stats['documents'], 3) if model_stats['documents'] else None
+    )
+
+    with openai_breaker_lock:
+        breaker_stats = {key: value for key, value in openai_breaker.items() if key != 'trial_in_flight'}
+
+    with project_response_cache_lock:
+        project_response_cache_stats = dict(project_response_stats, size=len(project_response_cache))
+    with project_events_condition:
+        project_events_stats = {
+            'buffered': len(project_events),
+            'last_id': project_events_state['last_id'],
+            'listener': project_events_state['listener'] is not None
+        }
+
+    estimate_info = compute_estimate_cached.cache_info()
+    estimate_stats = {
+        'hits': estimate_info.hits,
+        'misses': estimate_info.misses,
+        'size': estimate_info.currsize,
+        'max_size': estimate_info.maxsize,
+        'hit_rate': (round(estimate_info.hits / (estimate_info.hits + estimate_info.misses), 3)
+                     if estimate_info.hits + estimate_info.misses else None)
+    }
+
+    return jsonify({
+        'rfp_cache': cache_stats,
+        'prompt_prefilter': prefilter_stats,
+        'model_tiers': model_stats,
+        'openai_breaker': breaker_stats,
+        'estimate_cache': estimate_stats,
+        'project_response_cache': project_response_cache_stats,
+        'project_events': project_events_stats
+    })
+
+
+# Process pool for page-parallel PDF extraction (created on first use)
+pdf_process_pool = None
+pdf_process_pool_lock = threading.Lock()
+
+
+def get_pdf_process_pool():
+    global pdf_process_pool
+    with pdf_process_pool_lock:
+        if pdf_process_pool is None:
+            # Spawn rather than fork: forking a process that runs threads can copy locks held by
+            # them. Workers import only pdf_pages, not the app.
+            pdf_process_pool = ProcessPoolExecutor(
+                max_workers=PDF_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return pdf_process_pool
+
+
+# Stream PDF page text in page order
+def iter_pdf_text(file):
+    """Yield the text of each PDF page in order.
+
+    Large documents are split into page ranges that are extracted in parallel by the
+    process pool. Closing the generator early cancels the ranges not yet started.
+    """
+    pdf_data = file.read()
+    pdf_reader = PyPDF2.PdfReader(BytesIO(pdf_data))
+    page_count = len(pdf_reader.pages)
+
+    if PDF_WORKERS < 2 or page_count < PDF_PARALLEL_MIN_PAGES:
+        for page in pdf_reader.pages:
+            yield page.extract_text() or ""
+        return
+
+    # Workers read the PDF from a temp file rather than receiving the bytes per task
+    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
+        tmp.write(pdf_data)
+    pool = get_pdf_process_pool()
+    ranges = [(start, min(start + PDF_PAGES_PER_TASK, page_count))
+              for start in range(0, page_count, PDF_PAGES_PER_TASK)]
+    pending = []
+    try:
+        # Keep a bounded window of ranges in flight so early stops waste little work
+        next_range = 0
+        while next_range < len(ranges) or pending:
+            while next_range < len(ranges) and len(pending) < PDF_WORKERS * 2:
+                start, end = ranges[next_range]
+                pending.append(pool.submit(extract_pdf_page_range, tmp.name, start, end))
+                next_range += 1
+            for page_text in pending.pop(0).result():
+                yield page_text
+    finally:
+        for future in pending:
+            future.cancel()
+        try:
+            os.remove(tmp.name)
+        except OSError:
+            pass
+
+
+# Extract text from PDF files
+def extract_text_from_pdf(file, max_chars=None):
+    """Extract PDF text, stopping once at least `max_chars` characters have been collected."""
+    parts = []
+    collected = 0
+    with closing(iter_pdf_text(file)) as pages:
+        for page_text in pages:
+            if page_text:
+                parts.append(page_text + "\n")
+                collected += len(page_text) + 1
+                if max_chars and collected >= max_chars:
+                    break
+    return "".join(parts)
+
+# WordprocessingML tags used by the streaming DOCX reader
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_BODY, W_P, W_R, W_T, W_TBL, W_TR, W_TC = (W_NS + tag for tag in ('body', 'p', 'r', 't', 'tbl', 'tr', 'tc'))
+W_RUN_CHARS = {W_NS + 'tab': '\t', W_NS + 'ptab': '\t', W_NS + 'br': '\n', W_NS + 'cr': '\n',
+               W_NS + 'noBreakHyphen': '-'}
+W_MERGE_CONTINUATIONS = {W_NS + 'vMerge', W_NS + 'hMerge'}
+W_VAL = W_NS + 'val'
+W_TYPE = W_NS + 'type'
+
+
+# Stream DOCX paragraph and table-cell text in document order
+def iter_docx_text(file):
+    """Yield each non-empty body paragraph and table cell of a DOCX in document order.
+
+    word/document.xml is parsed incrementally and every finished top-level block is
+    dropped from the tree, so memory stays bounded by the largest single table row.
+    Cells that only continue a merge are skipped, so merged text is emitted once.
+    """
+    try:
+        archive = zipfile.ZipFile(file)
+        document = archive.open('word/document.xml')
+    except (zipfile.BadZipFile, KeyError):
+        raise ValueError("Invalid DOCX file.")
+    with archive, document:
+        body = None
+        paragraphs = []  # Text buffers of the open paragraphs (text boxes nest them)
+        tables = []      # Open tables (nested tables live inside cells)
+        cells = []       # [paragraph texts, is merge continuation] for the open cells
+        run_depth = 0
+        depth = 0
+        for event, elem in ElementTree.iterparse(document, events=('start', 'end')):
+            tag = elem.tag
+            if event == 'start':
+                depth += 1
+                if tag == W_P:
+                    paragraphs.append([])
+                elif tag == W_R:
+                    run_depth += 1
+                elif tag == W_TC:
+                    cells.append([[], False])
+                elif tag == W_TBL:
+                    tables.append(elem)
+                elif tag in W_MERGE_CONTINUATIONS and cells and elem.get(W_VAL, 'continue') == 'continue':
+                    cells[-1][1] = True
+                elif tag == W_BODY:
+                    body = elem
+                continue
+
+            if tag == W_T and run_depth and paragraphs:
+                paragraphs[-1].append(elem.text or "")
+            elif tag in W_RUN_CHARS and run_depth and paragraphs:
+                if elem.get(W_TYPE) not in ('page', 'column'):
+                    paragraphs[-1].append(W_RUN_CHARS[tag])
+            elif tag == W_R:
+                run_depth -= 1
+                elem.clear()
+            elif tag == W_P:
+                para_text = "".join(paragraphs.pop())
+                if cells:
+                    cells[-1][0].append(para_text)
+                elif para_text.strip():
+                    yield para_text
+            elif tag == W_TC:
+                cell_texts, continuation = cells.pop()
+                cell_text = "\n".join(cell_texts).strip()
+                if cell_text and not continuation:
+                    yield cell_text
+            elif tag == W_TR and tables:
+                # Finished rows are dropped so long tables are held one row at a time
+                tables[-1].remove(elem)
+            elif tag == W_TBL:
+                tables.pop()
+
+            # Finished top-level blocks are no longer needed (document > body > block)
+            depth -= 1
+            if depth == 2 and body is not None:
+                body.remove(elem)
+
+
+# Extract text from DOCX files
+def extract_text_from_docx(file, max_chars=None):
+    """Extract DOCX text, stopping once at least `max_chars` characters have been collected."""
+    parts = []
+    collected = 0
+    with closing(iter_docx_text(file)) as blocks:
+        for block_text in blocks:
+            parts.append(block_text + "\n")
+            collected += len(block_text) + 1
+            if max_chars and collected >= max_chars:
+                break
+    text = "".join(parts)
+    if not text.strip():
+        raise ValueError("No text found in DOCX.")
     return text
 
+# Regex RFP field patterns, compiled once at import. Each entry lists the literal tokens a
+# match can begin with ('#' is the start of a digit run) so the scanner can find candidates.
+# Number groups are written without overlapping quantifiers (\d+(?:,\d*)? rather than
+# \d+,?\d*): both match the same text, but the latter backtracks polynomially on long digit runs.
+RFP_FIELD_PATTERNS = [
+    # Project Name
+    ('project_name', ('project', 'job'), r'(?:project\s*(?:name|title|description)|job\s*(?:name|title))[:\s]*([^\n;]+)'),
+    ('project_name', ('rfp',), r'rfp\s*[#№]\s*[\w-]+\s*[-–—:]\s*([^\n;]+)'),
+    # Project Location
+    ('project_location', ('project', 'location', 'place', 'site'), r'(?:project\s*location|location|place|site)[:\s]*([^\n;]+)'),
+    ('project_location', ('in',), r'in\s*([^\n,]+)(?:\s*(?:county|city|state|subdivision))'),
+    # Completion Date
+    ('completion_date', ('completion', 'target', 'work', 'deadline'), r'(?:completion\s*date|target\s*date|work\s*(?:must\s*be\s*)?completed\s*by|deadline)[:\s]*([a-z]+\s*\d{1,2},\s*\d{4}|\d{4}-\d{2}-\d{2})'),
+    ('completion_date', ('fully',), r'fully\s*completed\s*by\s*([a-z]+\s*\d{1,2},\s*\d{4}|\d{4}-\d{2}-\d{2})'),
+    # Project Duration
+    ('project_duration', ('duration', 'project', 'timeline'), r'(?:duration|project\s*duration|timeline)\s*(?:\(?\s*weeks?\s*\))?[:\s]*(\d+)'),
+    # Lane Mile
+    ('land_mile', ('#',), r'(\d+(?:\.\d+)?)\s*(?:lane\s*[-–—]?\s*mi(?:les?)?|mi(?:les?)?)'),
+    # Width
+    ('width', ('#',), r'(\d+(?:\.\d+)?)\s*(?:ft|feet|foot)(?:\s*width)?'),
+    # Area
+    ('project_area', ('area', 'square'), r'(?:area\s*\(?\s*sq\s*ft\s*\)?|square\s*footage)[:\s]*([\d,]+(?:\.\d+)?)'),
+    ('project_area', ('#',), r'(\d+(?:,\d*)?)\s*(?:ft²|square\s*feet|sq\s*ft)'),
+    # Material Type
+    ('material_type', ('asphalt', 'hma', 'wma', 'concrete', 'aggregate', 'recycled', 'bituminous', 'subbase',
+                       'geotextile', 'sealcoat', 'thermoplastic', 'curb', 'sidewalk', 'pavers', 'drainage', 'stormwater'),
+     r'\b(asphalt|hma|wma|concrete|aggregate\s*base|recycled\s*asphalt|bituminous\s*surface|subbase|geotextile|sealcoat|thermoplastic\s*striping|curb|sidewalk|pavers|drainage\s*pipe|stormwater\s*structure)\b'),
+    # Tonnage
+    ('tonnage', ('tonnage', 'quantity'), r'(?:tonnage|quantity\s*tons?)[:\s]*([\d,]+(?:\.\d+)?)\s*(?:tons?)'),
+    # Quantities with units (every occurrence is captured)
+    ('quantities', ('#',), r'(\d+(?:,\d*)?(?:\.\d+)?)\s*(ft²|ft³|yd³|tons?|lbs?|ft|square\s*feet|cubic\s*yards|linear\s*feet|sq\s*ft|each)\s*(?:of\s*)?(asphalt|hma|concrete|aggregate\s*base|rebar|curb|sidewalk|pavers|drainage\s*pipe|stormwater\s*structure)'),
+]
+
+# Section headings whose text runs to the end of the document
+RFP_SECTION_PATTERNS = [
+    ('project_scope', ('scope', 'project', 'work'), r'(?:scope\s*of\s*work|project\s*description|work\s*details)[:\s]*'),
+    ('project_requirements', ('special', 'additional'), r'(?:special\s*(?:conditions|notes|requirements)|additional\s*notes)[:\s]*'),
+]
+
+RFP_COMPILED_FIELDS = [(key, tokens, re.compile(pattern, re.IGNORECASE)) for key, tokens, pattern in RFP_FIELD_PATTERNS]
+RFP_COMPILED_SECTIONS = [(key, tokens, re.compile(pattern, re.IGNORECASE)) for key, tokens, pattern in RFP_SECTION_PATTERNS]
+
+# Fields the estimate is priced from, scanned ahead of the rest under the regex budget
+RFP_PRICING_FIELDS = ('project_area', 'land_mile', 'width', 'tonnage', 'quantities')
+RFP_PRIORITY_FIELDS = sorted(RFP_COMPILED_FIELDS, key=lambda field: field[0] not in RFP_PRICING_FIELDS)
+
+# Build a prefix-factored alternation so the scanner tests few branches per position
+def rfp_token_alternation(tokens):
+    groups = {}
+    for token in tokens:
+        groups.setdefault(token[0], []).append(token[1:])
+    parts = []
+    for first, rests in sorted(groups.items()):
+        tails = [rest for rest in rests if rest]
+        if not tails:
+            parts.append(re.escape(first))
+        elif len(tails) == 1 and len(rests) == 1:
+            parts.append(re.escape(first + tails[0]))
+        else:
+            parts.append(re.escape(first) + '(?:' + rfp_token_alternation(tails) + ')' + ('?' if len(tails) < len(rests) else ''))
+    return '|'.join(parts)
+
+
+# One pass over the text finds every token occurrence. Everything sits in a lookahead so
+# overlapping occurrences are all reported; no word token is a prefix of another.
+RFP_SCANNER_TOKENS = sorted({
+    token for _, tokens, _ in RFP_FIELD_PATTERNS + RFP_SECTION_PATTERNS for token in tokens if token != '#'
+})
+RFP_TOKEN_SCANNER = re.compile(r'(?=(%s)|\d(?<!\d\d))' % rfp_token_alternation(RFP_SCANNER_TOKENS))
+# The text is already lowercased, so case folding only matters for 'ı' and 'ſ', which
+# IGNORECASE also matches against 'i' and 's'. Documents containing them use this scanner.
+RFP_TOKEN_SCANNER_FOLDED = re.compile(RFP_TOKEN_SCANNER.pattern, re.IGNORECASE)
+WHITESPACE_RE = re.compile(r'\s+')
+EDGE_PUNCTUATION_RE = re.compile(r'^[:;,.]+|[:;,.]+$')
+
+
+# Scan the text once and record the offsets of every pattern token
+def scan_rfp_tokens(normalized_text):
+    folded = 'ı' in normalized_text or 'ſ' in normalized_text
+    scanner = RFP_TOKEN_SCANNER_FOLDED if folded else RFP_TOKEN_SCANNER
+    offsets = {}
+    for match in scanner.finditer(normalized_text):
+        token = match.group(1)
+        if token is None:
+            token = '#'
+        elif folded:
+            token = token.replace('ı', 'i').replace('ſ', 's')
+        offsets.setdefault(token, []).append(match.start())
+    return offsets
+
+
+def rfp_candidates(offsets, tokens):
+    """Candidate start offsets for a pattern, in text order."""
+    if len(tokens) == 1:
+        return offsets.get(tokens[0], [])
+    return sorted(offset for token in tokens for offset in offsets.get(token, []))
+
+
+# Leftmost match of a pattern, trying only offsets where one of its tokens starts.
+# Returns (match, complete); complete is False when the deadline cut the scan short.
+def first_rfp_match(normalized_text, offsets, tokens, pattern, deadline=None):
+    for offset in rfp_candidates(offsets, tokens):
+        if deadline and time.perf_counter() > deadline:
+            return None, False
+        match = pattern.match(normalized_text, offset)
+        if match:
+            return match, True
+    return None, True
+
+
 # Extract RFP data using regex patterns
 def extract_rfp_data(text):
     """Extract project details from RFP text using regex patterns."""
     data = {}
     
     # Normalize text for consistent matching
-    normalized_text = re.sub(r'\s+', ' ', text).lower()
+    normalized_text = WHITESPACE_RE.sub(' ', text).lower()
     original_text = text  # Preserve original for section extraction
+    offsets = scan_rfp_tokens(normalized_text)
+
+    # A single match attempt is linear in the text it scans, but adversarial text can
+    # produce many attempts that each rescan a long span. Once the budget is spent the
+    # remaining attempts are skipped and listed in skipped_fields. The fields pricing needs
+    # are short digit-anchored matches, so they are scanned first and a slow location or
+    # date pattern cannot use up the budget before them.
+    deadline = time.perf_counter() + RFP_REGEX_BUDGET_SECONDS if RFP_REGEX_BUDGET_SECONDS > 0 else None
+    skipped = []
     
-    # Define regex patterns for key fields
-    patterns = [
-        # Project Name
-        (r'(?:project\s*(?:name|title|description)|job\s*(?:name|title))[:\s]*([^\n;]+)', 'project_name'),
-        (r'rfp\s*[#№]\s*[\w-]+\s*[-–—:]\s*([^\n;]+)', 'project_name'),
-        # Project Location
-        (r'(?:project\s*location|location|place|site)[:\s]*([^\n;]+)', 'project_location'),
-        (r'in\s*([^\n,]+)(?:\s*(?:county|city|state|subdivision))', 'project_location'),
-        # Completion Date
-        (r'(?:completion\s*date|target\s*date|work\s*(?:must\s*be\s*)?completed\s*by|deadline)[:\s]*([a-z]+\s*\d{1,2},\s*\d{4}|\d{4}-\d{2}-\d{2})', 'completion_date'),
-        (r'fully\s*completed\s*by\s*([a-z]+\s*\d{1,2},\s*\d{4}|\d{4}-\d{2}-\d{2})', 'completion_date'),
-        # Project Duration
-        (r'(?:duration|project\s*duration|timeline)\s*(?:\(?\s*weeks?\s*\))?[:\s]*(\d+)', 'project_duration'),
-        # Lane Mile
-        (r'(\d+(?:\.\d+)?)\s*(?:lane\s*[-–—]?\s*mi(?:les?)?|mi(?:les?)?)', 'land_mile'),
-        # Width
-        (r'(\d+(?:\.\d+)?)\s*(?:ft|feet|foot)(?:\s*width)?', 'width'),
-        # Area
-        (r'(?:area\s*\(?\s*sq\s*ft\s*\)?|square\s*footage)[:\s]*([\d,]+(?:\.\d+)?)', 'project_area'),
-        (r'(\d+,?\d*)\s*(?:ft²|square\s*feet|sq\s*ft)', 'project_area'),
-        # Material Type (capture multiple occurrences)
-        (r'\b(asphalt|hma|wma|concrete|aggregate\s*base|recycled\s*asphalt|bituminous\s*surface|subbase|geotextile|sealcoat|thermoplastic\s*striping|curb|sidewalk|pavers|drainage\s*pipe|stormwater\s*structure)\b', 'material_type'),
-        # Tonnage
-        (r'(?:tonnage|quantity\s*tons?)[:\s]*([\d,]+(?:\.\d+)?)\s*(?:tons?)', 'tonnage'),
-        # Quantities with units
-        (r'(\d+,?\d*(?:\.\d+)?)\s*(ft²|ft³|yd³|tons?|lbs?|ft|square\s*feet|cubic\s*yards|linear\s*feet|sq\s*ft|each)\s*(?:of\s*)?(asphalt|hma|concrete|aggregate\s*base|rebar|curb|sidewalk|pavers|drainage\s*pipe|stormwater\s*structure)', 'quantities'),
-    ]
-    
-    # Extract fields using patterns
+    # Extract fields from the candidate offsets
     quantities = []
-    for pattern, key in patterns:
+    for key, tokens, pattern in RFP_PRIORITY_FIELDS:
         if key == 'quantities':
-            matches = re.finditer(pattern, normalized_text, re.IGNORECASE)
-            for match in matches:
-                qty = match.group(1).replace(',', '')
-                unit = match.group(2).lower()
-                material = match.group(3).lower()
-                quantities.append({'quantity': qty, 'unit': unit, 'material': material})
+            # Same non-overlapping, left-to-right matches as re.finditer
+            next_pos = 0
+            for offset in rfp_candidates(offsets, tokens):
+                if offset < next_pos:
+                    continue
+                if deadline and time.perf_counter() > deadline:
+                    skipped.append(key)
+                    break
+                match = pattern.match(normalized_text, offset)
+                if match:
+                    next_pos = match.end()
+                    qty = match.group(1).replace(',', '')
+                    unit = match.group(2).lower()
+                    material = match.group(3).lower()
+                    quantities.append({'quantity': qty, 'unit': unit, 'material': material})
         else:
             if key not in data:
-                match = re.search(pattern, normalized_text, re.IGNORECASE)
+                match, complete = first_rfp_match(normalized_text, offsets, tokens, pattern, deadline)
+                if not complete:
+                    skipped.append(key)
                 if match:
                     data[key] = match.group(1).strip()
                     if key in ['land_mile', 'width', 'tonnage', 'project_area']:
@@ -446,43 +2115,42 @@ def extract_rfp_data(text):
         except (ValueError, TypeError):
             pass
     
-    # Extract sections like scope and requirements
-    section_patterns = [
-        ('project_scope', r'(?:scope\s*of\s*work|project\s*description|work\s*details)[:\s]*'),
-        ('project_requirements', r'(?:special\s*(?:conditions|notes|requirements)|additional\s*notes)[:\s]*')
-    ]
-    
-    for key, pattern in section_patterns:
+    # Extract sections like scope and requirements. Newlines are collapsed in the normalized
+    # text, so a section always runs from its heading to the end of the document.
+    original_lower = None
+    for key, tokens, pattern in RFP_COMPILED_SECTIONS:
         if key not in data:
-            match = re.search(pattern, normalized_text, re.IGNORECASE)
+            match, complete = first_rfp_match(normalized_text, offsets, tokens, pattern, deadline)
+            if not complete:
+                skipped.append(key)
             if match:
                 start_pos = match.end()
-                # Find section end (next section or end of text)
-                end_pos = len(normalized_text)
-                for end_pattern in [r'\n\s*\n', r'\n[A-Z][A-Z\s]+[:\s]']:
-                    end_match = re.search(end_pattern, normalized_text[start_pos:], re.IGNORECASE)
-                    if end_match:
-                        end_pos = min(end_pos, start_pos + end_match.start())
                 # Use original text to preserve formatting
-                section_text = original_text[original_text.lower().find(normalized_text[start_pos:end_pos]):].strip()
+                if original_lower is None:
+                    original_lower = original_text.lower()
+                section_text = original_text[original_lower.find(normalized_text[start_pos:]):].strip()
                 if section_text:
                     data[key] = section_text[:1000]  # Limit length to avoid DB issues
     
+    skipped = list(dict.fromkeys(skipped))
+    if skipped:
+        data['skipped_fields'] = skipped
+        app.logger.warning('RFP regex budget of %.2fs exhausted on a %d character document; '
+                           'skipped fields: %s', RFP_REGEX_BUDGET_SECONDS, len(normalized_text),
+                           ', '.join(skipped))
+    
     # Clean extracted data
     for key in data:
         if isinstance(data[key], str):
-            data[key] = re.sub(r'^[:;,.]+|[:;,.]+$', '', data[key].strip())
+            data[key] = EDGE_PUNCTUATION_RE.sub('', data[key].strip())
             if key in ['project_name', 'project_location', 'material_type']:
                 data[key] = data[key][0].upper() + data[key][1:] if data[key] else ''
     
     return data
 
-# Extract RFP data using OpenAI GPT
-def extract_fields_with_openai(text):
-    """Use OpenAI GPT to extract structured data from RFP text."""
-    
-    # Define prompt with examples and explicit instructions
-    prompt = """
+# Few-shot extraction prompt. Everything before the document text is fixed, so the
+# provider can reuse its cached prefix across requests; only the text varies.
+EXTRACTION_PROMPT_TEMPLATE = """
 You are an expert at extracting structured data from construction RFPs. Extract and map all relevant fields from the provided RFP text to the following schema, even if the field names in the RFP differ or are in a different format. Use synonymous terms to map to the schema (e.g., "Job Title" or "Project Description" for "project_name", "Place" or "Site" for "project_location"). If a field is missing, infer it based on context or return an empty string. For quantities, handle multiple materials (e.g., asphalt, concrete) and convert units if necessary (e.g., ft³ to yd³ or tons).
 
 Respond with a JSON object containing these keys:
@@ -528,39 +2196,569 @@ Output:
   ]
 }
 
-Text:
+%sText:
 \"\"\"%s\"\"\"
 
 Return the JSON object. Ensure dates are in 'YYYY-MM-DD' format. For project_type, infer from keywords (e.g., 'driveway' or 'sidewalk' implies 'sidewalk', 'lane' implies 'road'). If quantities are in ft³, convert to yd³ (divide by 27) or tons (use 150 lbs/ft³ for asphalt/concrete, 2000 lbs/ton). Limit scope and requirements to 1000 characters each.
-""" % text[:3500]
+"""
+
+# Keyword families for ranking RFP lines before they go into the prompt. The field
+# families reuse the regex extractor's tokens; 'in' and digit runs are too common to count.
+PREFILTER_FIELD_TOKENS = {
+    token: {key for key, tokens, _ in RFP_FIELD_PATTERNS + RFP_SECTION_PATTERNS if token in tokens}
+    for token in RFP_SCANNER_TOKENS if token != 'in'
+}
+PREFILTER_UNIT_RE = re.compile(r'\d[\d,.]*\s*(?:tons?|lbs?|yd³|ft²|ft³|sq\.?\s*ft|square\s*feet|cubic\s*yards|lane\s*miles?|miles?|feet|ft|weeks?)\b', re.IGNORECASE)
+PREFILTER_DATE_RE = re.compile(r'\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s*\d{1,2},?\s*\d{4}|\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{2,4}', re.IGNORECASE)
+PREFILTER_BOILERPLATE_RE = re.compile(
+    r'\b(?:bond(?:s|ing)?|surety|insurance|insured|indemnif\w*|liability|hold\s*harmless|prevailing\s*wage|'
+    r'payroll|table\s*of\s*contents|affidavit|non-?collusion|disadvantaged\s*business|equal\s*opportunity)\b|\.{5,}',
+    re.IGNORECASE
+)
+
+PREFILTER_MIN_SCORE = 2  # Lines scoring below this never go into the prompt
+
+# Prompt pre-filter counters
+prompt_stats = {'documents': 0, 'original_tokens': 0, 'selected_tokens': 0, 'saved_tokens': 0}
+prompt_stats_lock = threading.Lock()
+
+
+# Score one RFP line for how likely it is to hold schema fields
+def score_rfp_line(line):
+    lowered = line.lower()
+    fields = set()
+    for match in RFP_TOKEN_SCANNER.finditer(lowered):
+        fields.update(PREFILTER_FIELD_TOKENS.get(match.group(1), ()))
+    # Field words count double on label-like lines ("Location: ...") or lines with numbers
+    labelled = ':' in line or any(ch.isdigit() for ch in line)
+    score = (2 if labelled else 1) * len(fields)
+    score += 2 * len(PREFILTER_UNIT_RE.findall(line))
+    score += 2 if PREFILTER_DATE_RE.search(line) else 0
+    score -= 3 * len(PREFILTER_BOILERPLATE_RE.findall(line))
+    return score
+
+
+# Select the most relevant lines of an RFP within a token budget
+def select_relevant_text(text, max_tokens):
+    """Return (selected_text, stats) keeping the best-scoring lines, in document order.
+
+    Lines that end with ':' are headings, so their score also counts toward the line after
+    them. The first lines (title block) get a small bonus and repeated lines score nothing.
+    """
+    lines = [line.strip() for line in text.splitlines()]
+    lines = [line for line in lines if line]
+    scores = [score_rfp_line(line) for line in lines]
+    seen = set()
+    for i in range(len(lines)):
+        if i < 5:
+            scores[i] += 2
+        if i > 0 and lines[i - 1].endswith(':'):
+            scores[i] += max(scores[i - 1], 0)
+        if lines[i] in seen:
+            scores[i] = 0
+        seen.add(lines[i])
+
+    budget = max_tokens * CHARS_PER_TOKEN
+    selected = set()
+    used = 0
+    for i in sorted(range(len(lines)), key=lambda i: (-scores[i], i)):
+        if scores[i] < PREFILTER_MIN_SCORE:
+            break
+        if used + len(lines[i]) + 1 > budget:
+            continue
+        selected.add(i)
+        used += len(lines[i]) + 1
+    selected_text = "\n".join(lines[i] for i in sorted(selected))
+
+    original_tokens = len(text) // CHARS_PER_TOKEN
+    selected_tokens = len(selected_text) // CHARS_PER_TOKEN
+    stats = {
+        'original_tokens': original_tokens,
+        'selected_tokens': selected_tokens,
+        'saved_tokens': max(original_tokens - selected_tokens, 0),
+        'lines_total': len(lines),
+        'lines_selected': len(selected)
+    }
+    return selected_text, stats
+
+
+# Strict JSON schema for the fast tier's structured output (same keys as the prompt)
+EXTRACTION_JSON_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        **{key: {'type': 'string'} for key in [
+            'project_name', 'project_type', 'project_location', 'completion_date', 'project_duration',
+            'land_mile', 'width', 'project_area', 'material_type', 'tonnage', 'project_scope',
+            'project_requirements'
+        ]},
+        'quantities': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'material': {'type': 'string'},
+                    'quantity': {'type': 'number'},
+                    'unit': {'type': 'string'}
+                },
+                'required': ['material', 'quantity', 'unit'],
+                'additionalProperties': False
+            }
+        }
+    },
+    'additionalProperties': False
+}
+EXTRACTION_JSON_SCHEMA['required'] = list(EXTRACTION_JSON_SCHEMA['properties'])
+
+# Fields scored for completeness; upload_rfp needs the area and falls back to defaults for the rest
+REQUIRED_EXTRACTION_FIELDS = ['project_name', 'project_type', 'project_location', 'project_area',
+                              'completion_date', 'project_scope']
+
+# Per-tier call counters
+tier_stats = {
+    'fast': {'calls': 0, 'failures': 0, 'latency_total': 0.0, 'latency_max': 0.0},
+    'large': {'calls': 0, 'failures': 0, 'latency_total': 0.0, 'latency_max': 0.0},
+    'documents': 0,
+    'escalations': 0,
+    'partial': 0  # Documents left with failed chunks on every tier tried; not cached
+}
+tier_stats_lock = threading.Lock()
+
+
+# Circuit breaker for the OpenAI API: opens after repeated failures, lets a single trial
+# call through once the cool-down has passed, and closes again when that call succeeds
+openai_breaker = {
+    'state': 'closed',
+    'consecutive_failures': 0,
+    'opened_at': None,
+    'trial_in_flight': False,
+    'opens': 0,
+    'short_circuits': 0,
+    'deadline_fallbacks': 0
+}
+openai_breaker_lock = threading.Lock()
+
+
+def openai_breaker_allows():
+    with openai_breaker_lock:
+        if openai_breaker['state'] == 'open':
+            if time.time() - openai_breaker['opened_at'] < OPENAI_BREAKER_COOLDOWN_SECONDS:
+                openai_breaker['short_circuits'] += 1
+                return False
+            openai_breaker['state'] = 'half_open'
+        if openai_breaker['state'] == 'half_open':
+            if openai_breaker['trial_in_flight']:
+                openai_breaker['short_circuits'] += 1
+                return False
+            openai_breaker['trial_in_flight'] = True
+        return True
+
+
+def openai_breaker_is_open():
+    with openai_breaker_lock:
+        return (openai_breaker['state'] == 'open'
+                and time.time() - openai_breaker['opened_at'] < OPENAI_BREAKER_COOLDOWN_SECONDS)
+
+
+def record_openai_result(success):
+    with openai_breaker_lock:
+        openai_breaker['trial_in_flight'] = False
+        if success:
+            openai_breaker['state'] = 'closed'
+            openai_breaker['consecutive_failures'] = 0
+            return
+        openai_breaker['consecutive_failures'] += 1
+        if (openai_breaker['state'] == 'half_open'
+                or openai_breaker['consecutive_failures'] >= OPENAI_BREAKER_FAILURES):
+            if openai_breaker['state'] != 'open':
+                openai_breaker['opens'] += 1
+            openai_breaker['state'] = 'open'
+            openai_breaker['opened_at'] = time.time()
+
+
+# Thread pool bounding concurrent GPT requests across all uploads in this process
+openai_executor = ThreadPoolExecutor(max_workers=OPENAI_MAX_CONCURRENCY, thread_name_prefix='openai')
+# Runs whole-document GPT extractions that race the regex extractor (kept separate from
+# openai_executor so a document waiting on its chunk calls never blocks them)
+extraction_executor = ThreadPoolExecutor(max_workers=OPENAI_MAX_CONCURRENCY, thread_name_prefix='extraction')
+
+
+# Build the GPT extraction prompt for a document (or one part of a longer document)
+def build_extraction_prompt(text, part=None, parts=None):
+    """Return the few-shot extraction prompt for `text`; `part`/`parts` mark a chunk of a longer RFP."""
+    chunk_note = ""
+    if parts and parts > 1:
+        chunk_note = ("This text is part %d of %d of a longer RFP. Extract only what this part states; "
+                      "leave a field empty rather than guessing when this part does not mention it.\n\n" % (part, parts))
+
+    return EXTRACTION_PROMPT_TEMPLATE % (chunk_note, text)
+
+
+# Send one extraction prompt to GPT and parse the JSON reply
+def request_extraction(prompt, tier='large'):
+    """Run one extraction call on the given tier, recording its latency.
+
+    The fast tier answers with strict JSON-schema output; the large tier keeps the
+    free-form reply and its optional ```json fence.
+    """
+    structured = tier == 'fast'
+    options = {}
+    if structured:
+        options['response_format'] = {
+            'type': 'json_schema',
+            'json_schema': {'name': 'rfp_fields', 'strict': True, 'schema': EXTRACTION_JSON_SCHEMA}
+        }
 
+    if not openai_breaker_allows():
+        raise RuntimeError('OpenAI circuit breaker is open')
+
+    started = time.perf_counter()
     try:
-        # Call OpenAI API
         response = client.chat.completions.create(
-            model="gpt-4",
+            model=OPENAI_FAST_MODEL if structured else OPENAI_MODEL,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.2,
-            max_tokens=1500
+            max_tokens=1500,
+            **options
         )
         content = response.choices[0].message.content.strip()
-        json_match = re.search(r'```json\n(.*?)\n```', content, re.DOTALL)
-        if json_match:
-            content = json_match.group(1)
+        if not structured:
+            json_match = re.search(r'```json\n(.*?)\n```', content, re.DOTALL)
+            if json_match:
+                content = json_match.group(1)
         data = json.loads(content)
-        
-        # Validate and clean data
-        for key in ['project_name', 'project_location', 'project_scope', 'project_requirements']:
-            if key in data and data[key]:
-                data[key] = data[key][:255] if key in ['project_name', 'project_location'] else data[key][:1000]
-        if 'completion_date' in data and data['completion_date']:
+    except Exception:
+        record_tier_call(tier, time.perf_counter() - started, failed=True)
+        record_openai_result(False)
+        raise
+    elapsed = time.perf_counter() - started
+    record_tier_call(tier, elapsed)
+    # Answers slower than the upload deadline arrive too late to be used, so they count against the breaker
+    record_openai_result(elapsed <= OPENAI_DEADLINE_SECONDS)
+    return data
+
+
+def record_tier_call(tier, seconds, failed=False):
+    with tier_stats_lock:
+        stats = tier_stats[tier]
+        stats['calls'] += 1
+        stats['failures'] += failed
+        stats['latency_total'] += seconds
+        stats['latency_max'] = max(stats['latency_max'], seconds)
+
+
+# Score how completely an extraction covers the fields the upload pipeline needs
+def extraction_completeness(data):
+    """Fraction of REQUIRED_EXTRACTION_FIELDS present; 0 when the area cannot be derived."""
+    if not data:
+        return 0.0
+    # Mirror upload_rfp: area may come from land-mile + width or from sq ft quantities
+    has_area = bool(data.get('project_area')) or bool(data.get('land_mile') and data.get('width')) or any(
+        isinstance(q, dict) and q.get('unit') in ['ft²', 'sq ft'] for q in data.get('quantities') or []
+    )
+    if not has_area:
+        return 0.0
+    present = sum(1 for key in REQUIRED_EXTRACTION_FIELDS if key == 'project_area' or data.get(key))
+    return present / len(REQUIRED_EXTRACTION_FIELDS)
+
+
+# Validate and clean GPT-extracted fields
+def clean_extracted_fields(data):
+    for key in ['project_name', 'project_location', 'project_scope', 'project_requirements']:
+        if key in data and data[key]:
+            data[key] = data[key][:255] if key in ['project_name', 'project_location'] else data[key][:1000]
+    if 'completion_date' in data and data['completion_date']:
+        try:
+            data['completion_date'] = parse_date(data['completion_date']).strftime('%Y-%m-%d')
+        except:
+            data['completion_date'] = ''
+    return data
+
+
+# Split RFP text into chunks of roughly `max_tokens` tokens, breaking between lines where possible
+def split_text_into_chunks(text, max_tokens):
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    chunks = []
+    current = []
+    current_len = 0
+    for line in text.splitlines(keepends=True):
+        # Hard-split lines that alone exceed the budget
+        while len(line) > max_chars:
+            if current:
+                chunks.append("".join(current))
+                current, current_len = [], 0
+            chunks.append(line[:max_chars])
+            line = line[max_chars:]
+        if current_len + len(line) > max_chars and current:
+            chunks.append("".join(current))
+            current, current_len = [], 0
+        current.append(line)
+        current_len += len(line)
+    if current:
+        chunks.append("".join(current))
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+# Merge per-chunk GPT results into one field dict
+def merge_chunk_fields(results):
+    """Merge chunk results in document order.
+
+    Scalar fields take the first non-empty value, scope and requirements join the distinct
+    values up to 1000 characters, and quantities are concatenated without duplicates.
+    """
+    merged = {}
+    quantities = []
+    seen_quantities = set()
+    for data in results:
+        for key, value in data.items():
+            if key == 'quantities':
+                for q in value or []:
+                    if not isinstance(q, dict):
+                        continue
+                    identity = (str(q.get('material', '')).lower(), str(q.get('quantity', '')), str(q.get('unit', '')).lower())
+                    if identity not in seen_quantities:
+                        seen_quantities.add(identity)
+                        quantities.append(q)
+            elif key in ['project_scope', 'project_requirements']:
+                if value and value not in merged.get(key, ''):
+                    merged[key] = (merged[key] + ' ' + value if merged.get(key) else value)[:1000]
+            elif value not in (None, '') and merged.get(key) in (None, ''):
+                merged[key] = value
+    merged['quantities'] = quantities
+    return merged
+
+
+# Extract RFP data using OpenAI GPT
+def extract_fields_with_openai(text):
+    """Use OpenAI GPT to extract structured data from RFP text.
+
+    Documents longer than one chunk are split into token-budgeted chunks that are sent
+    concurrently (map) and merged field by field (reduce). Extraction runs on the fast
+    model first and escalates to OPENAI_MODEL when the result is incomplete or some of
+    its chunks failed. Returns (fields, complete); complete is False when chunks failed
+    on every tier tried, so the caller must not cache the fields.
+    """
+    try:
+        # Keep only the lines most likely to hold schema fields
+        if OPENAI_PREFILTER:
+            selected_text, stats = select_relevant_text(text, PREFILTER_BUDGET_TOKENS)
+            if selected_text:
+                text = selected_text
+                with prompt_stats_lock:
+                    prompt_stats['documents'] += 1
+                    for key in ['original_tokens', 'selected_tokens', 'saved_tokens']:
+                        prompt_stats[key] += stats[key]
+                app.logger.info('RFP prompt pre-filter kept %d of %d lines, saving ~%d tokens',
+                                stats['lines_selected'], stats['lines_total'], stats['saved_tokens'])
+
+        if not OPENAI_FAST_MODEL:
+            data, complete = extract_with_tier(text, 'large')
+        else:
+            # Try the fast tier first and escalate when required fields are missing or chunks failed
             try:
-                data['completion_date'] = parse_date(data['completion_date']).strftime('%Y-%m-%d')
-            except:
-                data['completion_date'] = ''
-        
-        return data
+                data, complete = extract_with_tier(text, 'fast')
+            except Exception:
+                data, complete = {}, False
+            with tier_stats_lock:
+                tier_stats['documents'] += 1
+            if not complete or extraction_completeness(data) < OPENAI_ESCALATION_THRESHOLD:
+                with tier_stats_lock:
+                    tier_stats['escalations'] += 1
+                try:
+                    large, large_complete = extract_with_tier(text, 'large')
+                except Exception:
+                    if not data:
+                        raise
+                    large, large_complete = {}, False
+                # The large model's answer wins; the fast tier fills fields it left empty
+                data, complete = merge_chunk_fields([large, data]), complete or large_complete
+        if not complete:
+            with tier_stats_lock:
+                tier_stats['partial'] += 1
+        return clean_extracted_fields(data), complete
     except Exception as e:
-        return {}
+        return {}, False
+
+
+# Run extraction on one model tier: a single call, or concurrent calls over chunks.
+# Returns (fields, complete); complete is False when some chunks failed (including
+# calls the circuit breaker rejected) and the fields cover only the others.
+def extract_with_tier(text, tier):
+    if not OPENAI_CHUNKED_EXTRACTION or len(text) <= OPENAI_CHUNK_TOKENS * CHARS_PER_TOKEN:
+        return request_extraction(build_extraction_prompt(text[:3500]), tier), True
+
+    chunks = split_text_into_chunks(text, OPENAI_CHUNK_TOKENS)[:OPENAI_MAX_CHUNKS]
+    futures = [
+        openai_executor.submit(request_extraction, build_extraction_prompt(chunk, index + 1, len(chunks)), tier)
+        for index, chunk in enumerate(chunks)
+    ]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception:
+            pass  # A failed chunk only loses the fields found in that chunk
+    if not results:
+        raise RuntimeError('All extraction chunks failed')
+    if len(results) < len(futures):
+        app.logger.warning('%d of %d %s-tier extraction chunks failed', len(futures) - len(results), len(futures), tier)
+    return merge_chunk_fields(results), len(results) == len(futures)
+
+# On-disk extraction cache
+rfp_cache_stats = {
+    'file': {'hits': 0, 'misses': 0},
+    'fields': {'hits': 0, 'misses': 0},
+    'writes': 0,
+    'evictions': 0,
+    'expired': 0
+}
+rfp_cache_size = None  # Approximate bytes on disk, scanned on first write
+rfp_cache_lock = threading.Lock()
+
+
+def rfp_cache_key(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def rfp_cache_path(namespace, key):
+    return os.path.join(RFP_CACHE_DIR, namespace, key[:2], key + '.json')
+
+
+# Look up a cache entry; returns None on a miss or an expired entry
+def rfp_cache_get(namespace, key):
+    if not RFP_CACHE_ENABLED:
+        return None
+    path = rfp_cache_path(namespace, key)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        if time.time() - entry['created'] > RFP_CACHE_TTL_SECONDS:
+            os.remove(path)
+            with rfp_cache_lock:
+                rfp_cache_stats['expired'] += 1
+            raise FileNotFoundError(path)
+        os.utime(path)  # Mark as recently used for LRU eviction
+    except (OSError, ValueError, KeyError):
+        with rfp_cache_lock:
+            rfp_cache_stats[namespace]['misses'] += 1
+        return None
+    with rfp_cache_lock:
+        rfp_cache_stats[namespace]['hits'] += 1
+    return entry['value']
+
+
+# Store a cache entry, evicting least recently used entries beyond RFP_CACHE_MAX_BYTES
+def rfp_cache_set(namespace, key, value):
+    global rfp_cache_size
+    if not RFP_CACHE_ENABLED:
+        return
+    path = rfp_cache_path(namespace, key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        payload = json.dumps({'created': time.time(), 'value': value}).encode('utf-8')
+        # Write to a temp file and rename so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except OSError:
+        return
+
+    with rfp_cache_lock:
+        rfp_cache_stats['writes'] += 1
+        if rfp_cache_size is None:
+            rfp_cache_size = sum(size for _, size, _ in scan_rfp_cache())
+        else:
+            rfp_cache_size += len(payload)
+        if rfp_cache_size > RFP_CACHE_MAX_BYTES:
+            evict_rfp_cache()
+
+
+def scan_rfp_cache():
+    """Yield (mtime, size, path) for every cache entry."""
+    for root, _, files in os.walk(RFP_CACHE_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            yield stat.st_mtime, stat.st_size, path
+
+
+# Drop least recently used entries until the cache is back under 90% of its size limit
+def evict_rfp_cache():
+    global rfp_cache_size
+    entries = sorted(scan_rfp_cache())
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total <= RFP_CACHE_MAX_BYTES * 0.9:
+            break
+        try:
+            os.remove(path)
+            rfp_cache_stats['evictions'] += 1
+        except OSError:
+            pass
+        total -= size
+    rfp_cache_size = total
+
+
+# Cache key of the GPT fields of `text`: normalized text and prompt version
+def fields_cache_key(text):
+    return rfp_cache_key(EXTRACTION_PROMPT_VERSION, re.sub(r'\s+', ' ', text).strip())
+
+
+# Extract RFP fields with OpenAI and cache them under `key`
+def extract_and_cache_fields(text, key):
+    fields, complete = extract_fields_with_openai(text)
+    # Only complete GPT results are cached so neither the regex fallback nor a merge
+    # missing failed chunks sticks for the cache TTL
+    if fields and complete:
+        rfp_cache_set('fields', key, fields)
+    return fields
+
+
+# Extract RFP fields with OpenAI, reusing results for previously seen text
+def extract_fields_cached(text):
+    """Return GPT-extracted fields for `text`, keyed by normalized text and prompt version."""
+    key = fields_cache_key(text)
+    fields = rfp_cache_get('fields', key)
+    if fields is None:
+        fields = extract_and_cache_fields(text, key)
+    return fields
+
+
+# Race GPT extraction against the regex extractor under a deadline
+def extract_fields_with_deadline(text):
+    """Return (gpt_fields, regex_fields).
+
+    Cached GPT fields are returned at once, with regex_fields None. Otherwise the regex
+    extractor runs in the calling thread while GPT runs in the background. When GPT misses
+    OPENAI_DEADLINE_SECONDS (or the breaker is open) gpt_fields is {} and the caller uses
+    regex_fields; a late GPT answer still lands in the cache.
+    """
+    key = fields_cache_key(text)
+    fields = rfp_cache_get('fields', key)
+    if fields is not None:
+        return fields, None
+    if openai_breaker_is_open():
+        with openai_breaker_lock:
+            openai_breaker['short_circuits'] += 1
+        return {}, extract_rfp_data(text)
+
+    started = time.perf_counter()
+    future = extraction_executor.submit(extract_and_cache_fields, text, key)
+    regex_data = extract_rfp_data(text)
+    try:
+        return future.result(timeout=max(OPENAI_DEADLINE_SECONDS - (time.perf_counter() - started), 0)), regex_data
+    except FuturesTimeoutError:
+        with openai_breaker_lock:
+            openai_breaker['deadline_fallbacks'] += 1
+        return {}, regex_data
+
 
 # Handle RFP file upload
 @app.route('/upload_rfp', methods=['POST'])
@@ -572,26 +2770,62 @@ def upload_rfp():
     if file.filename == '':
         return jsonify({'error': 'No selected file'}), 400
 
+    # Job mode: queue the file and return immediately
+    if str(request.values.get('async', '')).lower() in ['1', 'true', 'yes']:
+        if not file.filename.lower().endswith(('.pdf', '.docx')):
+            return jsonify({'error': 'Unsupported file type'}), 400
+        job_id = submit_rfp_job(file.filename, file.read())
+        if not job_id:
+            return jsonify({'error': 'Ingestion queue is full, please retry shortly'}), 503
+        return jsonify({
+            'job_id': job_id,
+            'status': 'queued',
+            'status_url': url_for('get_rfp_job', job_id=job_id),
+            'result_url': url_for('get_rfp_job_result', job_id=job_id)
+        }), 202
+
+    return process_rfp_file(file.filename, file.read())
+
+
+# Run the RFP pipeline: text extraction, field extraction, estimation and persistence
+def process_rfp_file(original_filename, file_data, on_stage=None):
+    """Extract project details from an RFP file and generate its estimate.
+
+    `on_stage` is called with the name of each pipeline stage as it starts.
+    """
+    def stage(name):
+        if on_stage:
+            on_stage(name)
+
     try:
-        filename = file.filename.lower()
-        file_data = file.read()
+        filename = original_filename.lower()
         file_stream = BytesIO(file_data)
-        # Extract text based on file type
-        if filename.endswith('.pdf'):
-            text = extract_text_from_pdf(file_stream)
-        elif filename.endswith('.docx'):
-            text = extract_text_from_docx(file_stream)
-        else:
+        if not filename.endswith(('.pdf', '.docx')):
             return jsonify({'error': 'Unsupported file type'}), 400
 
+        # Re-uploads of the same bytes skip parsing. Only the text is cached per file; GPT fields
+        # come from the fields cache, whose key includes the prompt version.
+        file_key = rfp_cache_key(file_data)
+        text = (rfp_cache_get('file', file_key) or {}).get('text')
+
+        # Extract text based on file type
+        stage('extracting_text')
+        if text is None:
+            if filename.endswith('.pdf'):
+                text = extract_text_from_pdf(file_stream)
+            else:
+                text = extract_text_from_docx(file_stream)
+            rfp_cache_set('file', file_key, {'text': text})
+
         # Try OpenAI GPT extraction first, fall back to regex
-        extracted_data = extract_fields_with_openai(text)
+        stage('extracting_fields')
+        extracted_data, regex_data = extract_fields_with_deadline(text)
         if not extracted_data:
-            extracted_data = extract_rfp_data(text)
+            extracted_data = regex_data if regex_data is not None else extract_rfp_data(text)
 
         # Set default values for missing fields
         if not extracted_data.get('project_name'):
-            extracted_data['project_name'] = f"Project from {file.filename}"
+            extracted_data['project_name'] = f"Project from {original_filename}"
         if not extracted_data.get('project_type'):
             extracted_data['project_type'] = 'road'
         if not extracted_data.get('project_location'):
@@ -620,8 +2854,12 @@ def upload_rfp():
                     extracted_data['project_area'] = str(total_area)
 
         if not extracted_data.get('project_area'):
+            error = 'Could not determine project area. Please provide area or land-mile+width in the document.'
+            if extracted_data.get('skipped_fields'):
+                error = ('Could not determine project area: the document took too long to scan and '
+                         'some fields were skipped. Please provide a shorter document or enter the area manually.')
             return jsonify({
-                'error': 'Could not determine project area. Please provide area or land-mile+width in the document.',
+                'error': error,
                 'extracted_data': extracted_data
             }), 400
 
@@ -642,6 +2880,7 @@ def upload_rfp():
             'quantities': extracted_data.get('quantities', [])
         }
 
+        stage('estimating')
         return process_estimate(data)
 
     except Exception as e:
@@ -651,151 +2890,520 @@ def upload_rfp():
         }), 500
 
 
-# Process project estimate
-def process_estimate(data):
-    """Generate project estimate based on input data, including labor, materials, and financials."""
+# Background RFP ingestion jobs
+rfp_job_executor = ThreadPoolExecutor(max_workers=RFP_JOB_WORKERS, thread_name_prefix='rfp-job')
+rfp_jobs_in_flight = 0
+rfp_jobs_lock = threading.Lock()
 
-    # Helper function to safely convert values to float
-    def safe_float(value, default=0.0):
-        if not value or not str(value).strip() or str(value).lower() == "undefined":
-            return default
-        try:
-            cleaned = re.sub(r'[^\d.\-]', '', str(value))
-            return float(cleaned)
-        except ValueError:
-            return default
+
+# Queue an RFP file for background processing
+def submit_rfp_job(original_filename, file_data):
+    """Create a job record and hand the file to the worker pool. Returns None when the queue is full."""
+    global rfp_jobs_in_flight
+    with rfp_jobs_lock:
+        if rfp_jobs_in_flight >= RFP_JOB_QUEUE_LIMIT:
+            return None
+        rfp_jobs_in_flight += 1
 
     try:
-        # Extract and validate input data
-        project_name = data.get('project_name', 'Unnamed Project')
-        project_type = data.get('project_type', 'road')
-        location = data.get('project_location', 'Unknown Location')
-        scope = data.get('project_scope', '')
-        project_requirements = data.get('project_requirements', '')
-        material_type = data.get('material_type', 'asphalt').lower()
-        tonnage = safe_float(data.get('tonnage', 0))
-        
-        land_mile = safe_float(data.get('land_mile', 0))
-        width_ft = safe_float(data.get('width', 0))
-        area_sqft = safe_float(data.get('project_area', 0))
-        
-        # Calculate area if not provided
-        if area_sqft <= 0:
-            if land_mile > 0 and width_ft > 0:
-                area_sqft = (land_mile * 5280) * width_ft
-            else:
-                return jsonify({
-                    'error': 'Valid area required: Provide either area or land-mile+width',
-                    'details': f"land_mile: {land_mile}, width: {width_ft}, calculated_area: {area_sqft}"
-                }), 400
-        
-        # Set default material type if not recognized
-        if material_type not in ['asphalt', 'recycled asphalt', 'bituminous surface', 'concrete', 'sealcoat']:
-            material_type = 'asphalt'
-        
-        # Determine project duration and completion date
-        completion_date_str = data.get('completion_date', '')
-        duration_weeks = safe_float(data.get('project_duration', 0))
-        
-        if completion_date_str:
-            try:
-                completion_date = datetime.strptime(completion_date_str, '%Y-%m-%d')
-                today = datetime.now()
-                duration_weeks = max((completion_date - today).days / 7, 1)
-            except:
-                completion_date = datetime.now() + timedelta(weeks=8)
-                duration_weeks = 8
-        else:
-            if duration_weeks <= 0:
-                duration_weeks = 8  # Default duration
-            completion_date = datetime.now() + timedelta(weeks=duration_weeks)
-        
-        # Calculate estimates with detailed logging
-        material_estimates = calculate_materials(area_sqft, material_type, tonnage)
-        
-        labor_estimates = calculate_labor(area_sqft, duration_weeks, project_type, material_type, width_ft)
-        
-        equipment_estimates = calculate_equipment(area_sqft, duration_weeks)
-        
-        financial_summary = calculate_financials(
-            material_estimates, 
-            labor_estimates, 
-            equipment_estimates,
-            area_sqft,
-            duration_weeks,
-            material_type,
-            project_type=data.get('project_type', 'road')
-        )
-        
-        # Prepare project summary
-        project_summary = {
-            'project_name': project_name,
-            'project_type': project_type.capitalize(),
-            'location': location,
-            'completion_date': completion_date.strftime('%Y-%m-%d'),
-            'duration_weeks': duration_weeks,
-            'area_sqft': round(area_sqft),
-            'material_type': material_type.capitalize(),
-            'land_mile': land_mile,
-            'width': width_ft,
-            'tonnage': tonnage 
-        }
-        
-        success_probability = calculate_success_probability(project_type, area_sqft, duration_weeks)
-        
-        # Create new project record
-        new_project = Project(
-            name=project_name,
-            type=project_type.capitalize(),
-            location=location,
-            submitted=datetime.now().date(),
-            status='pending',
-            cost=f"${financial_summary['total_cost']}",
-            completion_date=completion_date.date(),
-            land_mile=land_mile,
-            width=width_ft,
-            area=area_sqft,
-            material=material_type.capitalize(),
-            tonnage=tonnage if tonnage > 0 else material_estimates.get('asphalt_tons', material_estimates.get('concrete_yds', 0)),
-            scope=scope,
-            requirements=project_requirements,
-            estimated_cost=f"${financial_summary['total_cost']}",
-            profit_margin=financial_summary['profit_margin_value'],
-            success_probability=success_probability,
-            asphalt_tons=material_estimates.get('asphalt_tons', 0),
-            concrete_yds=material_estimates.get('concrete_yds', 0),
-            bituminous_tons=material_estimates.get('bituminous_tons', 0),
-            sealcoat_sqft=material_estimates.get('sealcoat_sqft', 0),
-            rebar_lbs=material_estimates.get('rebar_lbs', 0),
-            aggregate_tons=material_estimates.get('aggregate_tons', 0),
-            management_hours=labor_estimates.get('management_hours', 0),
-            prep_hours=labor_estimates.get('prep_hours', 0),
-            paving_hours=labor_estimates.get('paving_hours', 0),
-            finishing_hours=labor_estimates.get('finishing_hours', 0),
-            cost_breakdown=financial_summary['cost_breakdown']
+        now = datetime.now()
+        job = RfpJob(
+            id=uuid.uuid4().hex,
+            filename=original_filename[:255],
+            status='queued',
+            created=now,
+            updated=now,
+            owner=process_identity(os.getpid())
         )
-        
-        # Save to database
-        try:
-            db.session.add(new_project)
-            db.session.commit()
-        except Exception as e:
-            db.session.rollback()
-            return jsonify({
-                'error': 'Database operation failed',
-                'details': str(e),
-            }), 500
+        # Purge finished jobs past the retention window
+        RfpJob.query.filter(
+            RfpJob.status.in_(['completed', 'failed']),
+            RfpJob.updated < now - timedelta(hours=RFP_JOB_RETENTION_HOURS)
+        ).delete(synchronize_session=False)
+        db.session.add(job)
+        db.session.commit()
+        rfp_job_executor.submit(run_rfp_job, job.id, original_filename, file_data)
+        return job.id
+    except Exception:
+        db.session.rollback()
+        with rfp_jobs_lock:
+            rfp_jobs_in_flight -= 1
+        raise
+
+
+# Update a job record from a worker thread
+def update_rfp_job(job_id, **fields):
+    job = db.session.get(RfpJob, job_id)
+    if job:
+        for key, value in fields.items():
+            setattr(job, key, value)
+        job.updated = datetime.now()
+        db.session.commit()
+
+
+# Worker: run the RFP pipeline for a queued job
+def run_rfp_job(job_id, original_filename, file_data):
+    global rfp_jobs_in_flight
+    with app.app_context():
+        try:
+            update_rfp_job(job_id, status='running', stage='extracting_text')
+            response = app.make_response(process_rfp_file(
+                original_filename,
+                file_data,
+                on_stage=lambda stage: update_rfp_job(job_id, stage=stage)
+            ))
+            result = response.get_json()
+            update_rfp_job(
+                job_id,
+                status='completed' if response.status_code < 400 else 'failed',
+                stage=None,
+                status_code=response.status_code,
+                project_id=result.get('project_id') if isinstance(result, dict) else None,
+                result=result
+            )
+        except Exception as e:
+            db.session.rollback()
+            update_rfp_job(
+                job_id,
+                status='failed',
+                stage=None,
+                status_code=500,
+                result={'error': 'RFP processing failed', 'details': str(e)}
+            )
+        finally:
+            db.session.remove()
+            with rfp_jobs_lock:
+                rfp_jobs_in_flight -= 1
+
+
+# Get RFP job status
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_rfp_job(job_id):
+    job = db.session.get(RfpJob, job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({
+        'job_id': job.id,
+        'filename': job.filename,
+        'status': job.status,
+        'stage': job.stage,
+        'project_id': job.project_id,
+        'created': job.created.strftime('%Y-%m-%d %H:%M:%S'),
+        'updated': job.updated.strftime('%Y-%m-%d %H:%M:%S'),
+        'result_url': url_for('get_rfp_job_result', job_id=job.id)
+    })
+
+
+# Get RFP job result (the estimate response once the job has finished)
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def get_rfp_job_result(job_id):
+    job = db.session.get(RfpJob, job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    if job.status in ['queued', 'running']:
+        return jsonify({'job_id': job.id, 'status': job.status, 'stage': job.stage}), 202
+    return jsonify(job.result), job.status_code or 500
+
+
+# Normalized inputs of the estimation core; hashable so results can be memoized
+EstimateInput = namedtuple('EstimateInput', [
+    'area_sqft', 'land_mile', 'width_ft', 'material_type', 'project_type',
+    'duration_weeks', 'completion_date', 'tonnage', 'quantities'
+], defaults=((),))
+ESTIMATE_CACHE_SIZE = int(os.environ.get('ESTIMATE_CACHE_SIZE', 4096))  # Memoized estimate results
+
+
+# Safely convert a form/JSON value to float
+def safe_float(value, default=0.0):
+    if not value or not str(value).strip() or str(value).lower() == "undefined":
+        return default
+    try:
+        cleaned = re.sub(r'[^\d.\-]', '', str(value))
+        return float(cleaned)
+    except ValueError:
+        return default
+
+
+# Coerce raw estimate request data into an EstimateInput
+def normalize_estimate_input(data):
+    """Apply the estimate defaults and resolve the duration/completion date against today.
+
+    Extracted `quantities` rows become line items (see normalize_quantities). Raises
+    ValueError (with the offending values) when no usable area can be derived.
+    """
+    project_type = data.get('project_type', 'road')
+    material_type = data.get('material_type', 'asphalt').lower()
+    tonnage = safe_float(data.get('tonnage', 0))
+    land_mile = safe_float(data.get('land_mile', 0))
+    width_ft = safe_float(data.get('width', 0))
+    area_sqft = safe_float(data.get('project_area', 0))
+
+    # Calculate area if not provided
+    if area_sqft <= 0:
+        if land_mile > 0 and width_ft > 0:
+            area_sqft = (land_mile * 5280) * width_ft
+        else:
+            raise ValueError(f"land_mile: {land_mile}, width: {width_ft}, calculated_area: {area_sqft}")
+
+    # Set default material type if not recognized
+    if material_type not in ESTIMATE_MATERIALS:
+        material_type = 'asphalt'
+
+    # Determine project duration and completion date
+    completion_date_str = data.get('completion_date', '')
+    duration_weeks = safe_float(data.get('project_duration', 0))
+    if completion_date_str:
+        try:
+            completion_date = datetime.strptime(completion_date_str, '%Y-%m-%d')
+            today = datetime.now()
+            duration_weeks = max((completion_date - today).days / 7, 1)
+        except:
+            completion_date = datetime.now() + timedelta(weeks=8)
+            duration_weeks = 8
+    else:
+        if duration_weeks <= 0:
+            duration_weeks = 8  # Default duration
+        completion_date = datetime.now() + timedelta(weeks=duration_weeks)
+
+    return EstimateInput(
+        area_sqft=area_sqft,
+        land_mile=land_mile,
+        width_ft=width_ft,
+        material_type=material_type,
+        project_type=project_type,
+        duration_weeks=duration_weeks,
+        completion_date=completion_date.strftime('%Y-%m-%d'),
+        tonnage=tonnage,
+        quantities=normalize_quantities(data.get('quantities'))
+    )
+
+
+# Pure estimation core: materials -> labor -> equipment -> financials for one normalized input
+@lru_cache(maxsize=ESTIMATE_CACHE_SIZE)
+def compute_estimate_cached(estimate_input, rate_card_version):
+    rates = rate_tables_for_version(rate_card_version)
+    area_sqft = estimate_input.area_sqft
+    material_type = estimate_input.material_type
+    duration_weeks = estimate_input.duration_weeks
+    project_type = estimate_input.project_type
+
+    material_estimates = calculate_materials(area_sqft, material_type, estimate_input.tonnage, rates=rates)
+    labor_estimates = calculate_labor(area_sqft, duration_weeks, project_type, material_type, estimate_input.width_ft)
+    equipment_estimates = calculate_equipment(area_sqft, duration_weeks, rates=rates)
+    material_costs = line_items = None
+    if estimate_input.quantities:
+        material_costs, line_items = line_item_material_costs(
+            estimate_input.quantities, material_estimates, material_type, area_sqft, rates)
+    financial_summary = calculate_financials(
+        material_estimates,
+        labor_estimates,
+        equipment_estimates,
+        area_sqft,
+        duration_weeks,
+        material_type,
+        project_type=project_type,
+        rates=rates,
+        material_costs=material_costs
+    )
+    if line_items is not None:
+        financial_summary['cost_breakdown']['line_items'] = line_items
+    return {
+        'rate_card_version': rate_card_version,
+        'material_estimates': material_estimates,
+        'labor_estimates': labor_estimates,
+        'equipment_estimates': equipment_estimates,
+        'financial_summary': financial_summary,
+        'success_probability': calculate_success_probability(project_type, area_sqft, duration_weeks)
+    }
+
+
+# Copy the nested dicts and lists of an estimate (the leaves are immutable numbers and strings)
+def copy_estimate(value):
+    if isinstance(value, dict):
+        return {key: copy_estimate(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_estimate(item) for item in value]
+    return value
+
+
+# Memoized estimate under the active rate card; callers get their own copy so the cached result cannot be mutated
+def compute_estimate(estimate_input):
+    return copy_estimate(compute_estimate_cached(estimate_input, rate_tables.version))
+
+
+# Comparable bids: stored projects of the same type and material, nearest on scaled features.
+# Each worker keeps its own index, pulls rows inserted since its last look (by any worker) before
+# every query, and reloads in full every COMPARABLES_REFRESH_SECONDS to pick up repriced rows.
+COMPARABLES_COUNT = int(os.environ.get('COMPARABLES_COUNT', 10))  # Similar past bids returned with each estimate
+COMPARABLES_REFRESH_SECONDS = int(os.environ.get('COMPARABLES_REFRESH_SECONDS', 3600))  # Full reload interval
+COMPARABLE_FEATURES = ('log_area', 'width', 'duration_weeks', 'log_cost_per_sqft')  # Distance dimensions
+COMPARABLE_MIN_SCALE = np.array([0.1, 1.0, 1.0, 0.05])  # Smallest divisor per feature: ~10% area, 1 ft, 1 week, ~5% cost/sq ft
+ComparablesBucket = namedtuple('ComparablesBucket', ['ids', 'features'])  # Project ids and their feature rows
+comparables_index = {'buckets': {}, 'moments': None, 'last_id': 0, 'built': None}  # built: time.monotonic() of the last full load
+comparables_lock = threading.Lock()
+
+
+# Feature rows (see COMPARABLE_FEATURES) for arrays of area, width, duration and total cost
+def comparable_features(area, width, duration_weeks, cost):
+    area = np.asarray(area, dtype=float)
+    cost_per_sqft = np.divide(cost, area, out=np.zeros_like(area), where=area > 0)
+    return np.column_stack((np.log1p(area), np.nan_to_num(np.asarray(width, dtype=float)),
+                            np.asarray(duration_weeks, dtype=float), np.log1p(cost_per_sqft)))
+
+
+# Bucket project rows by (type, material) as ComparablesBucket feature arrays
+def build_comparables_buckets(rows):
+    """Rows need id, type, material, area, width, submitted, completion_date and cost_amount.
+    Duration is the weeks from submission to completion, as process_estimate sets them.
+    """
+    grouped = {}
+    for row in rows:
+        duration = (row.completion_date - row.submitted).days / 7 if row.completion_date and row.submitted else 8
+        grouped.setdefault((row.type, row.material), []).append(
+            (row.id, row.area or 0, row.width or 0, duration, row.cost_amount or 0))
+    buckets = {}
+    for key, values in grouped.items():
+        ids, area, width, duration, cost = zip(*values)
+        buckets[key] = ComparablesBucket(np.array(ids, dtype=np.int64), comparable_features(area, width, duration, cost))
+    return buckets
+
+
+# Running (count, sum, sum of squares) of the feature rows of some buckets, for comparables_scale
+def comparables_moments(buckets, moments=None):
+    count, total, squares = moments or (0, np.zeros(len(COMPARABLE_FEATURES)), np.zeros(len(COMPARABLE_FEATURES)))
+    for bucket in buckets.values():
+        count += len(bucket.ids)
+        total = total + bucket.features.sum(axis=0)
+        squares = squares + (bucket.features ** 2).sum(axis=0)
+    return count, total, squares
+
+
+# Per-feature divisors that put every distance dimension on a comparable scale: the standard
+# deviation over all indexed projects, floored at COMPARABLE_MIN_SCALE
+def comparables_scale(moments):
+    count, total, squares = moments
+    if not count:
+        return COMPARABLE_MIN_SCALE
+    spread = np.sqrt(np.maximum(squares / count - (total / count) ** 2, 0))
+    return np.maximum(spread, COMPARABLE_MIN_SCALE)
+
+
+# Ids and distances of the `count` rows of a bucket nearest to a feature row, nearest first
+def nearest_comparables(bucket, scale, features, count, exclude_id=None):
+    distances = np.sqrt((((bucket.features - features) / scale) ** 2).sum(axis=1))
+    if exclude_id is not None:
+        distances[bucket.ids == exclude_id] = np.inf
+    count = min(count, int(np.isfinite(distances).sum()))
+    if count == 0:
+        return []
+    nearest = np.argpartition(distances, count - 1)[:count]
+    nearest = nearest[np.argsort(distances[nearest])]
+    return list(zip(bucket.ids[nearest].tolist(), distances[nearest].tolist()))
+
+
+# Bring this worker's comparables index up to date: rows inserted since the last call, or a full reload
+def refresh_comparables_index():
+    columns = (Project.id, Project.type, Project.material, Project.area, Project.width,
+               Project.submitted, Project.completion_date, Project.cost_amount)
+    built = comparables_index['built']
+    if built is None or time.monotonic() - built > COMPARABLES_REFRESH_SECONDS:
+        rows = db.session.execute(select(*columns).order_by(Project.id)).all()
+        buckets = build_comparables_buckets(rows)
+        comparables_index.update(buckets=buckets, moments=comparables_moments(buckets),
+                                 last_id=rows[-1].id if rows else 0, built=time.monotonic())
+        return
+    rows = db.session.execute(
+        select(*columns).where(Project.id > comparables_index['last_id']).order_by(Project.id)
+    ).all()
+    buckets = comparables_index['buckets']
+    added_buckets = build_comparables_buckets(rows)
+    comparables_index['moments'] = comparables_moments(added_buckets, comparables_index['moments'])
+    for key, added in added_buckets.items():
+        bucket = buckets.get(key)
+        buckets[key] = added if bucket is None else ComparablesBucket(
+            np.concatenate((bucket.ids, added.ids)), np.vstack((bucket.features, added.features)))
+    if rows:
+        comparables_index['last_id'] = rows[-1].id
+
+
+# Drop deleted projects from the comparables index
+def forget_comparables(key, ids):
+    bucket = comparables_index['buckets'].get(key)
+    if bucket is not None:
+        keep = ~np.isin(bucket.ids, list(ids))
+        comparables_index['buckets'][key] = ComparablesBucket(bucket.ids[keep], bucket.features[keep])
+
+
+# The most similar past bids to an estimate, with their outcomes
+def find_comparables(project_type, material, area, width, duration_weeks, cost, exclude_id=None):
+    """Returns {'projects': [...], 'win_rate': accepted / decided (None when none decided)}.
+    Projects deleted since the index last saw them are dropped from it and the search rerun.
+    """
+    key = (project_type, material)
+    features = comparable_features([area], [width], [duration_weeks], [cost])[0]
+    for _ in range(3):
+        with comparables_lock:
+            refresh_comparables_index()
+            bucket = comparables_index['buckets'].get(key)
+            scale = comparables_scale(comparables_index['moments'])
+            nearest = nearest_comparables(bucket, scale, features, COMPARABLES_COUNT,
+                                          exclude_id) if bucket is not None else []
+        if not nearest:
+            rows = {}
+            break
+        rows = {row.id: row for row in db.session.execute(
+            select(Project.id, Project.name, Project.location, Project.submitted, Project.status, Project.cost,
+                   Project.cost_amount, Project.area, Project.width, Project.completion_date)
+            .where(Project.id.in_([project_id for project_id, _ in nearest]))
+        )}
+        missing = [project_id for project_id, _ in nearest if project_id not in rows]
+        if not missing:
+            break
+        with comparables_lock:
+            forget_comparables(key, missing)
+
+    projects = []
+    for project_id, distance in nearest:
+        row = rows.get(project_id)
+        if row is None:
+            continue
+        projects.append({
+            'id': row.id,
+            'name': row.name,
+            'location': row.location,
+            'submitted': row.submitted.strftime('%Y-%m-%d'),
+            'status': row.status,
+            'cost': row.cost,
+            'cost_per_sqft': round(row.cost_amount / row.area, 2) if row.area else None,
+            'area_sqft': round(row.area),
+            'width': row.width,
+            'duration_weeks': round((row.completion_date - row.submitted).days / 7, 1) if row.completion_date else None,
+            'distance': round(distance, 4)
+        })
+    accepted = sum(project['status'] == 'accepted' for project in projects)
+    decided = accepted + sum(project['status'] == 'rejected' for project in projects)
+    return {'projects': projects, 'win_rate': round(accepted / decided, 4) if decided else None}
+
+
+# Process project estimate
+def process_estimate(data, dry_run=False):
+    """Generate project estimate based on input data, including labor, materials, and financials.
+
+    With `dry_run` the estimate is returned without creating a Project row.
+    """
+    try:
+        # Extract and validate input data
+        project_name = data.get('project_name', 'Unnamed Project')
+        location = data.get('project_location', 'Unknown Location')
+        scope = data.get('project_scope', '')
+        project_requirements = data.get('project_requirements', '')
+        try:
+            estimate_input = normalize_estimate_input(data)
+        except ValueError as e:
+            return jsonify({
+                'error': 'Valid area required: Provide either area or land-mile+width',
+                'details': str(e)
+            }), 400
+
+        estimate = compute_estimate(estimate_input)
+        material_estimates = estimate['material_estimates']
+        labor_estimates = estimate['labor_estimates']
+        financial_summary = estimate['financial_summary']
+        success_probability = estimate['success_probability']
+        project_type = estimate_input.project_type
+        material_type = estimate_input.material_type
+        tonnage = estimate_input.tonnage
+        area_sqft = estimate_input.area_sqft
+
+        # Prepare project summary
+        project_summary = {
+            'project_name': project_name,
+            'project_type': project_type.capitalize(),
+            'location': location,
+            'completion_date': estimate_input.completion_date,
+            'duration_weeks': estimate_input.duration_weeks,
+            'area_sqft': round(area_sqft),
+            'material_type': material_type.capitalize(),
+            'land_mile': estimate_input.land_mile,
+            'width': estimate_input.width_ft,
+            'tonnage': tonnage 
+        }
+
+        project_id = None
+        if not dry_run:
+            # Create new project record
+            new_project = Project(
+                name=project_name,
+                type=project_type.capitalize(),
+                location=location,
+                submitted=datetime.now().date(),
+                status='pending',
+                cost=f"${financial_summary['total_cost']}",
+                cost_amount=financial_summary['total_cost'],
+                completion_date=datetime.strptime(estimate_input.completion_date, '%Y-%m-%d').date(),
+                land_mile=estimate_input.land_mile,
+                width=estimate_input.width_ft,
+                area=area_sqft,
+                material=material_type.capitalize(),
+                tonnage=tonnage if tonnage > 0 else material_estimates.get('asphalt_tons', material_estimates.get('concrete_yds', 0)),
+                scope=scope,
+                requirements=project_requirements,
+                estimated_cost=f"${financial_summary['total_cost']}",
+                estimated_cost_amount=financial_summary['total_cost'],
+                profit_margin=financial_summary['profit_margin_value'],
+                success_probability=success_probability,
+                asphalt_tons=material_estimates.get('asphalt_tons', 0),
+                concrete_yds=material_estimates.get('concrete_yds', 0),
+                bituminous_tons=material_estimates.get('bituminous_tons', 0),
+                sealcoat_sqft=material_estimates.get('sealcoat_sqft', 0),
+                rebar_lbs=material_estimates.get('rebar_lbs', 0),
+                aggregate_tons=material_estimates.get('aggregate_tons', 0),
+                management_hours=labor_estimates.get('management_hours', 0),
+                prep_hours=labor_estimates.get('prep_hours', 0),
+                paving_hours=labor_estimates.get('paving_hours', 0),
+                finishing_hours=labor_estimates.get('finishing_hours', 0),
+                cost_breakdown=dict(financial_summary['cost_breakdown'], duration_weeks=estimate_input.duration_weeks),
+                rate_card_version=estimate['rate_card_version']
+            )
+
+            # Save to database
+            try:
+                db.session.add(new_project)
+                apply_project_stats_changes(project_stats_changes([new_project], 1))
+                record_project_change()
+                db.session.flush()  # Assigns the id the created event and search index refer to
+                record_project_events('created', [new_project])
+                index_project_search([new_project.id])
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                return jsonify({
+                    'error': 'Database operation failed',
+                    'details': str(e),
+                }), 500
+            project_id = new_project.id
 
         # Prepare response
         response = {
             'project_summary': project_summary,
             'material_estimates': material_estimates,
             'labor_estimates': labor_estimates,
-            'equipment_estimates': equipment_estimates,
+            'equipment_estimates': estimate['equipment_estimates'],
             'financial_summary': financial_summary,
             'success_probability': success_probability,
-            'project_id': new_project.id
+            'rate_card_version': estimate['rate_card_version'],
+            'project_id': project_id
         }
+        if dry_run:
+            response['dry_run'] = True
+        try:
+            response['comparables'] = find_comparables(
+                project_type.capitalize(), material_type.capitalize(), area_sqft, estimate_input.width_ft,
+                estimate_input.duration_weeks, financial_summary['total_cost'], exclude_id=project_id
+            )
+        except Exception as e:
+            db.session.rollback()
+            app.logger.warning("Comparable bid lookup failed: %s", e)
         
         return jsonify(response), 200
     
@@ -807,9 +3415,10 @@ def process_estimate(data):
     
 
 # Calculate Profit based on Project type and its size
-def calculate_profit_margin(project_type, area_sqft):
+def calculate_profit_margin(project_type, area_sqft, rates=None):
     """Calculate dynamic profit margin based on project type and size"""
-    margins = PROFIT_MARGINS.get(project_type.lower(), PROFIT_MARGINS['road'])
+    profit_margins = (rates or rate_tables).profit_margins
+    margins = profit_margins.get(project_type.lower(), profit_margins['road'])
     
     # Adjust based on project size (Virginia standards)
     if area_sqft < 10000:       # Small project
@@ -824,62 +3433,60 @@ def calculate_profit_margin(project_type, area_sqft):
 @app.route('/calculate_estimate', methods=['POST'])
 def calculate_estimate():
     data = request.json
-    return process_estimate(data)
+    # ?dry_run=1 (or "dry_run": true) previews the estimate without saving a project
+    dry_run = request.args.get('dry_run') in ('1', 'true') or data.get('dry_run') in (True, 1, '1', 'true')
+    return process_estimate(data, dry_run=dry_run)
+
+# Quantity take-off rules per estimate material: (area_sqft, tonnage, thickness, density) -> quantities
+def paving_take_off(tons_key):
+    def take_off(area_sqft, tonnage, thickness, density):
+        tons = tonnage if tonnage > 0 else (area_sqft * thickness * density) / 2000
+        return {tons_key: round(tons, 1), 'aggregate_tons': round(tons * 1.2, 1)}
+    return take_off
+
+
+def concrete_take_off(area_sqft, tonnage, thickness, density):
+    return {'concrete_yds': round(area_sqft * thickness / 27, 1), 'rebar_lbs': round(area_sqft * 1.2, 1)}  # 1.2 lbs rebar per sq ft
+
+
+def sealcoat_take_off(area_sqft, tonnage, thickness, density):
+    return {'sealcoat_sqft': round(area_sqft)}
+
+
+MATERIAL_TAKE_OFFS = {
+    'asphalt': paving_take_off('asphalt_tons'),
+    'recycled asphalt': paving_take_off('asphalt_tons'),
+    'bituminous surface': paving_take_off('bituminous_tons'),
+    'concrete': concrete_take_off,
+    'sealcoat': sealcoat_take_off
+}
+
+
+# Calculate material quantities (`thickness` overrides the standard for what-if sweeps)
+def calculate_materials(area_sqft, material_type, tonnage, thickness=None, rates=None):
+    rates = rates or rate_tables
+    material_type = material_type.lower()
+    take_off = MATERIAL_TAKE_OFFS.get(material_type)
+    if take_off is None:
+        return {}
+    if thickness is None:
+        thickness = material_thickness(material_type, rates)
+    return take_off(area_sqft, tonnage, thickness, rates.material_constants[material_type]['density'])
+
+# Crew productivity (sq ft per crew hour) for a project type, material and width
+def crew_productivity(project_type, material_type, width_ft):
+    is_narrow = 0 < (width_ft or 0) <= 3
+    if "road" in project_type.lower():
+        if is_narrow and "concrete" in material_type.lower():
+            return 300  # Higher rate for narrow concrete paths
+        return 200  # Standard rate for asphalt/concrete roads
+    elif "sidewalk" in project_type.lower():
+        return 150  # Rate for detailed sidewalk work
+    return 120  # General paving projects
 
-# Calculate material quantities
-def calculate_materials(area_sqft, material_type, tonnage):
-    try:
-        material_type = material_type.lower()
-        results = {}
-        
-        # Asphalt types
-        if material_type in ['asphalt', 'recycled asphalt']:
-            density = RECYCLED_DENSITY if 'recycled' in material_type else ASPHALT_DENSITY
-            thickness = THICKNESS.get(material_type, THICKNESS['asphalt'])
-            
-            if tonnage > 0:
-                asphalt_tons = tonnage
-            else:
-                volume_cf = area_sqft * thickness
-                asphalt_tons = (volume_cf * density) / 2000
-            
-            results['asphalt_tons'] = round(asphalt_tons, 1)
-            results['aggregate_tons'] = round(asphalt_tons * 1.2, 1)
-        
-        # Bituminous surface
-        elif material_type == 'bituminous surface':
-            density = MATERIAL_CONSTANTS['bituminous surface']['density']
-            thickness = MATERIAL_CONSTANTS['bituminous surface']['thickness']
-            
-            if tonnage > 0:
-                bituminous_tons = tonnage
-            else:
-                volume_cf = area_sqft * thickness
-                bituminous_tons = (volume_cf * density) / 2000
-            
-            results['bituminous_tons'] = round(bituminous_tons, 1)
-            results['aggregate_tons'] = round(bituminous_tons * 1.2, 1)
-        
-        # Concrete
-        elif material_type == 'concrete':
-            thickness = THICKNESS['concrete']
-            volume_cf = area_sqft * thickness
-            concrete_yds = volume_cf / 27
-            results['concrete_yds'] = round(concrete_yds, 1)
-            results['rebar_lbs'] = round(area_sqft * 1.2, 1)  # 1.2 lbs per sq ft
-        
-        # Sealcoat
-        elif material_type == 'sealcoat':
-            results['sealcoat_sqft'] = round(area_sqft)
-        
-        return results
-    
-    except Exception as e:
-        # Just raise the exception without logging
-        raise
 
 # Calculate labor hours
-def calculate_labor(area_sqft, duration_weeks, project_type, material_type, width_ft):
+def calculate_labor(area_sqft, duration_weeks, project_type, material_type, width_ft, sqft_per_crew_hour=None):
     """Calculate labor hours for a 7-person crew based on Virginia productivity rates."""
     try:
         # Set default width
@@ -889,15 +3496,8 @@ def calculate_labor(area_sqft, duration_weeks, project_type, material_type, widt
         is_narrow = width_ft > 0 and width_ft <= 3
         
         # Set productivity rate based on project type and material
-        if "road" in project_type.lower():
-            if is_narrow and "concrete" in material_type.lower():
-                sqft_per_crew_hour = 300  # Higher rate for narrow concrete paths
-            else:
-                sqft_per_crew_hour = 200  # Standard rate for asphalt/concrete roads
-        elif "sidewalk" in project_type.lower():
-            sqft_per_crew_hour = 150  # Rate for detailed sidewalk work
-        else:
-            sqft_per_crew_hour = 120  # General paving projects
+        if sqft_per_crew_hour is None:
+            sqft_per_crew_hour = crew_productivity(project_type, material_type, width_ft)
         
         # Define crew size and weekly capacity
         CREW_SIZE = 7  # Standard crew size for small Virginia projects
@@ -946,18 +3546,19 @@ def calculate_labor(area_sqft, duration_weeks, project_type, material_type, widt
         raise
 
 # Calculate equipment needs
-def calculate_equipment(area_sqft, duration_weeks):
+def calculate_equipment(area_sqft, duration_weeks, rates=None):
     """Calculate equipment quantities and costs based on Virginia rental rates."""
     try:
+        weekly_rates = (rates or rate_tables).equipment_weekly_rates
         pavers = max(1, math.ceil(area_sqft / 120000))
         rollers = max(1, math.ceil(area_sqft / 60000))
         excavators = max(1, math.ceil(area_sqft / 150000))
         trucks = max(2, math.ceil(area_sqft / 50000))
         
-        paver_cost = pavers * 2500 * duration_weeks
-        roller_cost = rollers * 1000 * duration_weeks
-        excavator_cost = excavators * 2000 * duration_weeks
-        truck_cost = trucks * 900 * duration_weeks
+        paver_cost = pavers * weekly_rates['paver'] * duration_weeks
+        roller_cost = rollers * weekly_rates['roller'] * duration_weeks
+        excavator_cost = excavators * weekly_rates['excavator'] * duration_weeks
+        truck_cost = trucks * weekly_rates['truck'] * duration_weeks
 
         return {
             'pavers': pavers,
@@ -975,50 +3576,32 @@ def calculate_equipment(area_sqft, duration_weeks):
 
 
 # Calculate financial summary
-def calculate_financials(materials, labor, equipment, area_sqft, duration_weeks, material_type, project_type):
-    """Calculate project costs, including materials, labor, equipment, overhead, and profit."""
+def calculate_financials(materials, labor, equipment, area_sqft, duration_weeks, material_type, project_type,
+                         profit_margin=None, unit_costs=None, labor_rate=None, rates=None, material_costs=None):
+    """Calculate project costs, including materials, labor, equipment, overhead, and profit.
+
+    Rates come from the active rate card unless `rates` is given. `profit_margin`,
+    `unit_costs` (merged over the card's unit costs) and `labor_rate` override single
+    rates for what-if sweeps. `material_costs` replaces the take-off material cost, e.g.
+    with the line-item total of a mixed-material project.
+    """
     try:
+        rates = rates or rate_tables
         material_type = material_type.lower()
-        material_costs = 0
-
-        # Calculate material costs
-        if material_type in ['asphalt', 'recycled asphalt', 'bituminous surface']:
-            # Determine asphalt unit cost
-            if material_type == 'recycled asphalt':
-                unit_cost = MATERIAL_UNIT_COSTS['recycled asphalt']
-            elif material_type == 'bituminous surface':
-                unit_cost = MATERIAL_UNIT_COSTS['bituminous surface']
-            else:
-                unit_cost = MATERIAL_UNIT_COSTS['asphalt']
-            
-            # Calculate asphalt costs
-            asphalt_tons = materials.get('asphalt_tons', 0)
-            material_costs += asphalt_tons * unit_cost * MATERIAL_MARKUP
-            
-            # Calculate aggregate costs
-            aggregate_tons = materials.get('aggregate_tons', 0)
-            material_costs += aggregate_tons * MATERIAL_UNIT_COSTS['aggregate base'] * MATERIAL_MARKUP
-        
-        elif material_type == 'concrete':
-            # Calculate concrete costs
-            concrete_yds = materials.get('concrete_yds', 0)
-            material_costs += concrete_yds * MATERIAL_UNIT_COSTS['concrete'] * MATERIAL_MARKUP
-            
-            # Calculate rebar costs
-            rebar_lbs = materials.get('rebar_lbs', 0)
-            material_costs += rebar_lbs * MATERIAL_UNIT_COSTS['rebar'] * MATERIAL_MARKUP
-        
-        elif material_type == 'sealcoat':
-            # Calculate sealcoat costs
-            sealcoat_sqft = materials.get('sealcoat_sqft', area_sqft)
-            material_costs += sealcoat_sqft * MATERIAL_UNIT_COSTS['sealcoat'] * MATERIAL_MARKUP
+        unit_costs = rates.material_unit_costs if unit_costs is None else {**rates.material_unit_costs, **unit_costs}
+        if material_costs is None:
+            # Sum the material's cost lines (sealcoat covers the whole area by default)
+            material_costs = 0
+            for quantity_key, cost_key in MATERIAL_COST_LINES.get(material_type, ()):
+                quantity = materials.get(quantity_key, area_sqft if cost_key == 'sealcoat' else 0)
+                material_costs += quantity * unit_costs[cost_key] * rates.material_markup
 
         # Calculate labor costs
         labor_hours = labor.get('total_hours', 0)
         if labor_hours <= 0:
             # Fallback calculation if labor hours not provided
             labor_hours = area_sqft / 100 * 10  # 10 hours per 100 sq ft
-        labor_costs = labor_hours * LABOR_RATE
+        labor_costs = labor_hours * (rates.labor_rate if labor_rate is None else labor_rate)
         
         # Calculate equipment costs with markup
         equipment_costs = (
@@ -1026,13 +3609,14 @@ def calculate_financials(materials, labor, equipment, area_sqft, duration_weeks,
             equipment.get('roller_cost', 0) + 
             equipment.get('excavator_cost', 0) + 
             equipment.get('truck_cost', 0)
-        ) * EQUIPMENT_RATE_MULTIPLIER
+        ) * rates.equipment_rate_multiplier
         
-        profit_margin = calculate_profit_margin(project_type, area_sqft)
+        if profit_margin is None:
+            profit_margin = calculate_profit_margin(project_type, area_sqft, rates)
         
         # Calculate subtotal, overhead, and profit
         subtotal = material_costs + labor_costs + equipment_costs
-        overhead = subtotal * OVERHEAD_RATE
+        overhead = subtotal * rates.overhead_rate
         profit = subtotal * profit_margin
         total_cost = subtotal + overhead + profit
         
@@ -1059,6 +3643,81 @@ def calculate_financials(materials, labor, equipment, area_sqft, duration_weeks,
         raise
 
 
+# Normalize extracted quantity rows to hashable (material, canonical unit, quantity) tuples
+def normalize_quantities(rows):
+    quantities = []
+    for row in rows or []:
+        if not isinstance(row, dict):
+            continue
+        quantity = safe_float(row.get('quantity', 0))
+        material = ' '.join(str(row.get('material') or '').lower().split())
+        material = LINE_ITEM_MATERIAL_ALIASES.get(material, material)
+        unit = ' '.join(str(row.get('unit') or '').lower().replace('.', '').split())
+        unit, scale = LINE_ITEM_UNITS.get(unit, (unit, 1))
+        if quantity > 0 and material:
+            quantities.append((material, unit, quantity * scale))
+    return tuple(quantities)
+
+
+# Price line items in one pass and return per-line cost columns
+def price_line_items(materials, units, quantities, rates=None):
+    """Each (material, unit) pair is looked up once in the rate card's line-item registry and
+    the columns are computed as arrays. Rows with no registry entry have priced False and cost 0.
+    """
+    rates = rates or rate_tables
+    codes, keys = encode_labels(list(zip(materials, units)))
+    entries = [rates.line_items.get(key, (np.nan, 0.0)) for key in keys]
+    factor = np.array([entry[0] for entry in entries], dtype=float)[codes]
+    unit_cost = np.array([entry[1] for entry in entries], dtype=float)[codes]
+    priced = ~np.isnan(factor)
+    priced_quantity = np.where(priced, np.asarray(quantities, dtype=float) * factor, 0.0)
+    return {
+        'priced': priced,
+        'priced_quantity': priced_quantity,
+        'unit_cost': unit_cost,
+        'cost': priced_quantity * unit_cost * rates.material_markup
+    }
+
+
+# Line items of a project as (material, unit, quantity, source): the extracted rows, then take-off rows
+def line_item_rows(quantities, materials, material_type, area_sqft, rates):
+    rows = [(material, unit, quantity, 'extracted') for material, unit, quantity in quantities]
+    covered = {material for material, unit, _ in quantities if (material, unit) in rates.line_items}
+    for _, cost_key in MATERIAL_COST_LINES.get(material_type, ()):
+        if cost_key not in covered:
+            priced_unit, quantity_key = LINE_ITEM_MATERIALS[cost_key]
+            quantity = materials.get(quantity_key, area_sqft if cost_key == 'sealcoat' else 0)
+            rows.append((cost_key, priced_unit, quantity, 'take-off'))
+    return rows
+
+
+# Material cost of a project from its extracted quantities, returned with the priced line items
+def line_item_material_costs(quantities, materials, material_type, area_sqft, rates=None):
+    """Extracted rows are priced as given. Each cost line of the project's own material that no
+    priced row covers (e.g. aggregate base under an asphalt tonnage) is added from the take-off
+    quantities, so a partial quantities list does not drop material the estimate needs.
+    """
+    rates = rates or rate_tables
+    rows = line_item_rows(quantities, materials, material_type, area_sqft, rates)
+    material_names, units, row_quantities, sources = zip(*rows)
+    columns = {key: values.tolist() for key, values in price_line_items(material_names, units, row_quantities, rates).items()}
+    line_items = []
+    for index, (material, unit, quantity, source) in enumerate(rows):
+        priced = columns['priced'][index]
+        line_items.append({
+            'material': material,
+            'unit': unit,
+            'quantity': quantity,
+            'source': source,
+            'priced': priced,
+            'priced_unit': LINE_ITEM_MATERIALS[material][0] if priced else None,
+            'priced_quantity': round(columns['priced_quantity'][index], 2) if priced else None,
+            'unit_cost': columns['unit_cost'][index] if priced else None,
+            'cost': round(columns['cost'][index], 2) if priced else None
+        })
+    return sum(columns['cost']), line_items
+
+
 # Calculate bid success probability
 def calculate_success_probability(project_type, area_sqft, duration_weeks):
     """Estimate probability of bid success based on project factors."""
@@ -1084,10 +3743,980 @@ def calculate_success_probability(project_type, area_sqft, duration_weeks):
     return f"{probability}%"
 
 
+ESTIMATE_BATCH_MAX_ROWS = int(os.environ.get('ESTIMATE_BATCH_MAX_ROWS', 200000))  # Scenarios per batch request
+
+
+# Exact product a * b as hi + lo (Dekker's algorithm)
+def two_product(a, b):
+    split = 134217729.0  # 2 ** 27 + 1
+    product = a * b
+    a_big = a * split
+    a_hi = a_big - (a_big - a)
+    a_lo = a - a_hi
+    b_big = b * split
+    b_hi = b_big - (b_big - b)
+    b_lo = b - b_hi
+    return product, ((a_hi * b_hi - product) + a_hi * b_lo + a_lo * b_hi) + a_lo * b_lo
+
+
+# Round an array the way Python's round(x, digits) does
+def round_like_python(values, digits):
+    """np.round scales before rounding, which can land on the wrong side of a tie. For values
+    near a tie the exact scaled value is compared with the midpoint instead, and exact ties go
+    to even, which is what round() does on the decimal value."""
+    scale = 10.0 ** digits
+    scaled = values * scale
+    rounded = np.rint(scaled) / scale
+    near_tie = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) <= 1e-9 * np.maximum(np.abs(scaled), 1.0))
+    if near_tie.size:
+        hi, lo = two_product(values[near_tie], scale)
+        below = np.floor(hi)
+        # hi - (below + 0.5) is exact (the operands are within a factor of 2), so the sign is exact
+        offset = (hi - (below + 0.5)) + lo
+        up = (offset > 0) | ((offset == 0) & (below % 2 == 1))
+        rounded[near_tie] = (below + up) / scale
+    return rounded
+
+
+# Map each label to the index of its distinct value, returning the codes and the distinct values
+def encode_labels(values):
+    distinct = list(dict.fromkeys(values))
+    index = {value: position for position, value in enumerate(distinct)}
+    return np.fromiter(map(index.__getitem__, values), dtype=np.intp, count=len(values)), distinct
+
+
+# Vectorized equivalent of calculate_materials/labor/equipment/financials for many scenarios
+def calculate_estimates_batch(area_sqft, material_type, project_type, duration_weeks, tonnage=None, width_ft=None,
+                              rates=None, material_costs=None):
+    """Estimate many scenarios at once and return a dict of equal-length column arrays.
+
+    Inputs are sequences of the values process_estimate passes to the scalar functions
+    (material types already validated). Every column matches the scalar result for the
+    same row under the same rate tables; materials that do not apply to a row's material
+    type are 0. `material_costs` replaces the material cost of rows where it is not NaN
+    (line-item totals, like the scalar override).
+    """
+    rates = rates or rate_tables
+    area = np.asarray(area_sqft, dtype=float)
+    duration = np.asarray(duration_weeks, dtype=float)
+    rows = len(area)
+    tonnage = np.zeros(rows) if tonnage is None else np.asarray(tonnage, dtype=float)
+    width = np.zeros(rows) if width_ft is None else np.asarray(width_ft, dtype=float)
+
+    # Per-material rate tables, indexed by position in ESTIMATE_MATERIALS
+    material_codes, material_names = encode_labels(material_type)
+    material_index = np.array([ESTIMATE_MATERIALS.index(m.lower()) for m in material_names], dtype=np.intp)[material_codes]
+    is_asphalt = material_index <= 1
+    is_bituminous = material_index == 2
+    is_concrete = material_index == 3
+    is_sealcoat = material_index == 4
+    density = rates.batch['density']
+    thickness = rates.batch['thickness']
+    primary_unit_cost = rates.batch['primary_unit_cost']
+    secondary_unit_cost = rates.batch['secondary_unit_cost']
+
+    # Per-project-type lookups
+    type_codes, type_names = encode_labels(project_type)
+    type_names = [t.lower() for t in type_names]
+    is_road = np.array(['road' in t for t in type_names])[type_codes]
+    is_sidewalk = np.array(['sidewalk' in t for t in type_names])[type_codes]
+    margins = [rates.profit_margins.get(t, rates.profit_margins['road']) for t in type_names]
+    margin_min = np.array([m['min'] for m in margins])[type_codes]
+    margin_max = np.array([m['max'] for m in margins])[type_codes]
+    probability_type_adjustment = np.array([5 if t == 'road' else -5 if t == 'renovation' else 0
+                                            for t in type_names])[type_codes]
+
+    # Materials
+    tons = np.where(tonnage > 0, tonnage, (area * thickness[material_index] * density[material_index]) / 2000)
+    tons_rounded = round_like_python(tons, 1)
+    asphalt_tons = np.where(is_asphalt, tons_rounded, 0.0)
+    bituminous_tons = np.where(is_bituminous, tons_rounded, 0.0)
+    aggregate_tons = np.where(is_asphalt | is_bituminous, round_like_python(tons * 1.2, 1), 0.0)
+    concrete_yds = np.where(is_concrete, round_like_python(area * rates.thickness['concrete'] / 27, 1), 0.0)
+    rebar_lbs = np.where(is_concrete, round_like_python(area * 1.2, 1), 0.0)
+    sealcoat_sqft = np.where(is_sealcoat, np.rint(area), 0.0)
+
+    # Labor
+    is_narrow = (width > 0) & (width <= 3)
+    sqft_per_crew_hour = np.where(is_road, np.where(is_narrow & is_concrete, 300, 200), np.where(is_sidewalk, 150, 120))
+    crew_hours = area / sqft_per_crew_hour
+    crew_hours = np.where(duration > 0, np.minimum(crew_hours, 280 * duration), crew_hours)
+    crew_hours = np.maximum(crew_hours, 56)
+    management_hours = np.rint(crew_hours * 0.10)
+    prep_hours = np.rint(crew_hours * np.where(is_narrow, 0.20, 0.30))
+    paving_hours = np.rint(crew_hours * np.where(is_narrow, 0.65, 0.50))
+    finishing_hours = np.rint(crew_hours * np.where(is_narrow, 0.05, 0.10))
+    total_hours = np.rint(crew_hours)
+
+    # Equipment
+    pavers = np.maximum(1, np.ceil(area / 120000))
+    rollers = np.maximum(1, np.ceil(area / 60000))
+    excavators = np.maximum(1, np.ceil(area / 150000))
+    trucks = np.maximum(2, np.ceil(area / 50000))
+    paver_cost = np.rint(pavers * rates.equipment_weekly_rates['paver'] * duration)
+    roller_cost = np.rint(rollers * rates.equipment_weekly_rates['roller'] * duration)
+    excavator_cost = np.rint(excavators * rates.equipment_weekly_rates['excavator'] * duration)
+    truck_cost = np.rint(trucks * rates.equipment_weekly_rates['truck'] * duration)
+
+    # Financials (bituminous rows price their tonnage as asphalt_tons, which is 0, like the scalar code)
+    primary_quantity = np.select([is_asphalt | is_bituminous, is_concrete], [asphalt_tons, concrete_yds], sealcoat_sqft)
+    secondary_quantity = np.select([is_asphalt | is_bituminous, is_concrete], [aggregate_tons, rebar_lbs], 0.0)
+    take_off_costs = (primary_quantity * primary_unit_cost[material_index] * rates.material_markup
+                      + secondary_quantity * secondary_unit_cost[material_index] * rates.material_markup)
+    if material_costs is None:
+        material_costs = take_off_costs
+    else:
+        material_costs = np.asarray(material_costs, dtype=float)
+        material_costs = np.where(np.isnan(material_costs), take_off_costs, material_costs)
+    labor_hours = np.where(total_hours > 0, total_hours, area / 100 * 10)
+    labor_costs = labor_hours * rates.labor_rate
+    equipment_costs = (paver_cost + roller_cost + excavator_cost + truck_cost) * rates.equipment_rate_multiplier
+    profit_margin = np.where(area < 10000, margin_max,
+                             np.where(area < 100000, (margin_min + margin_max) / 2, margin_min))
+    subtotal = material_costs + labor_costs + equipment_costs
+    overhead = subtotal * rates.overhead_rate
+    profit = subtotal * profit_margin
+    total_cost = subtotal + overhead + profit
+    cost_per_sqft = np.where(area > 0, round_like_python(total_cost / np.where(area > 0, area, 1), 2), 0.0)
+
+    # Bid success probability
+    probability = (75 + probability_type_adjustment
+                   + np.where(area > 150000, -8, np.where(area < 15000, 5, 0))
+                   + np.where(duration > 24, -7, np.where(duration < 6, 5, 0)))
+    probability = np.clip(probability, 60, 95)
+
+    as_int = lambda column: column.astype(np.int64)
+    margin_values, margin_codes = np.unique(profit_margin, return_inverse=True)
+    return {
+        'asphalt_tons': asphalt_tons,
+        'bituminous_tons': bituminous_tons,
+        'aggregate_tons': aggregate_tons,
+        'concrete_yds': concrete_yds,
+        'rebar_lbs': rebar_lbs,
+        'sealcoat_sqft': as_int(sealcoat_sqft),
+        'management_hours': as_int(management_hours),
+        'prep_hours': as_int(prep_hours),
+        'paving_hours': as_int(paving_hours),
+        'finishing_hours': as_int(finishing_hours),
+        'total_hours': as_int(total_hours),
+        'pavers': as_int(pavers),
+        'rollers': as_int(rollers),
+        'excavators': as_int(excavators),
+        'trucks': as_int(trucks),
+        'paver_cost': as_int(paver_cost),
+        'roller_cost': as_int(roller_cost),
+        'excavator_cost': as_int(excavator_cost),
+        'truck_cost': as_int(truck_cost),
+        'materials': as_int(np.rint(material_costs)),
+        'labor': as_int(np.rint(labor_costs)),
+        'equipment': as_int(np.rint(equipment_costs)),
+        'overhead': as_int(np.rint(overhead)),
+        'profit': as_int(np.rint(profit)),
+        'total_cost': as_int(np.rint(total_cost)),
+        'profit_margin_value': profit_margin,
+        'profit_margin': np.array([f"{m * 100:.1f}%" for m in margin_values], dtype=object)[margin_codes],
+        'cost_per_sqft': cost_per_sqft,
+        'success_probability': np.array([f"{p}%" for p in range(101)], dtype=object)[probability]
+    }
+
+
+# Price many scenarios in one request without saving projects
+@app.route('/calculate_estimates_batch', methods=['POST'])
+def calculate_estimates_batch_route():
+    """Columns use the /calculate_estimate field names; each is a list or one value for every row."""
+    data = request.get_json(silent=True) or {}
+    columns = {key: data.get(key) for key in
+               ('project_area', 'land_mile', 'width', 'tonnage', 'project_duration', 'material_type', 'project_type')}
+    lengths = {len(value) for value in columns.values() if isinstance(value, list)}
+    if len(lengths) != 1:
+        return jsonify({'error': 'Provide list columns of one common length'}), 400
+    rows = lengths.pop()
+    if rows > ESTIMATE_BATCH_MAX_ROWS:
+        return jsonify({'error': f'At most {ESTIMATE_BATCH_MAX_ROWS} scenarios per request'}), 413
+
+    def column(key, default):
+        value = columns[key]
+        if value is None:
+            value = default
+        return value if isinstance(value, list) else [value] * rows
+
+    try:
+        numeric = {key: np.asarray(column(key, 0), dtype=float)
+                   for key in ('project_area', 'land_mile', 'width', 'tonnage', 'project_duration')}
+        material_type = [str(m).lower() for m in column('material_type', 'asphalt')]
+        project_type = [str(t) for t in column('project_type', 'road')]
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Numeric columns must contain only numbers'}), 400
+    if not all(values.ndim == 1 and np.isfinite(values).all() for values in numeric.values()):
+        return jsonify({'error': 'Numeric columns must contain only finite numbers'}), 400
+
+    # Same defaults and area derivation as process_estimate
+    area = numeric['project_area']
+    land_mile, width = numeric['land_mile'], numeric['width']
+    area = np.where(area > 0, area, np.where((land_mile > 0) & (width > 0), (land_mile * 5280) * width, 0.0))
+    invalid = np.flatnonzero(area <= 0)
+    if len(invalid):
+        return jsonify({
+            'error': 'Valid area required: Provide either area or land-mile+width',
+            'rows': invalid[:20].tolist()
+        }), 400
+    material_type = [m if m in ESTIMATE_MATERIALS else 'asphalt' for m in material_type]
+    duration = numeric['project_duration']
+    duration = np.where(duration > 0, duration, 8.0)
+
+    results = calculate_estimates_batch(area, material_type, project_type, duration,
+                                        tonnage=numeric['tonnage'], width_ft=width)
+    return jsonify({
+        'count': rows,
+        'columns': {key: values.tolist() for key, values in results.items()}
+    }), 200
+
+
+# Monte Carlo cost-risk simulation settings
+SIMULATION_DEFAULT_TRIALS = int(os.environ.get('SIMULATION_DEFAULT_TRIALS', 100000))
+SIMULATION_MAX_TRIALS = int(os.environ.get('SIMULATION_MAX_TRIALS', 1000000))
+SIMULATION_CHUNK_TRIALS = int(os.environ.get('SIMULATION_CHUNK_TRIALS', 65536))  # Trials evaluated per vectorized pass
+SIMULATION_HISTOGRAM_BINS = int(os.environ.get('SIMULATION_HISTOGRAM_BINS', 40))
+SIMULATION_WORKERS = int(os.environ.get('SIMULATION_WORKERS', POOL_WORKERS_DEFAULT))  # Processes for multi-project runs
+SIMULATION_PARALLEL_MIN_PROJECTS = 4  # Fewer projects are simulated in the request process
+SIMULATION_PERCENTILES = (5, 10, 50, 80, 90, 95)
+
+# Default multiplier distributions (1.0 = the point-estimate value). 'unit_costs' applies to
+# every material unit cost unless a unit-cost key of the rate card is given its own distribution.
+SIMULATION_DEFAULT_DISTRIBUTIONS = {
+    'unit_costs': {'dist': 'triangular', 'low': 0.90, 'mode': 1.0, 'high': 1.25},
+    'labor_rate': {'dist': 'triangular', 'low': 0.95, 'mode': 1.0, 'high': 1.15},
+    'productivity': {'dist': 'triangular', 'low': 0.75, 'mode': 1.0, 'high': 1.10},
+    'duration': {'dist': 'triangular', 'low': 0.90, 'mode': 1.0, 'high': 1.40}
+}
+
+# Process pool for multi-project simulations (created on first use)
+simulation_process_pool = None
+simulation_process_pool_lock = threading.Lock()
+
+
+def get_simulation_process_pool():
+    global simulation_process_pool
+    with simulation_process_pool_lock:
+        if simulation_process_pool is None:
+            # Spawn rather than fork (see get_pdf_process_pool); workers import this module
+            # without its database startup
+            simulation_process_pool = ProcessPoolExecutor(
+                max_workers=SIMULATION_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return simulation_process_pool
+
+
+# Validate a multiplier distribution spec, raising ValueError for anything unusable
+def validate_distribution(name, spec):
+    if not isinstance(spec, dict):
+        raise ValueError(f"Distribution '{name}' must be an object")
+    kind = spec.get('dist')
+    required = {'triangular': ('low', 'mode', 'high'), 'normal': ('mean', 'std'),
+                'uniform': ('low', 'high'), 'fixed': ('value',)}.get(kind)
+    if required is None:
+        raise ValueError(f"Distribution '{name}' must be triangular, normal, uniform or fixed")
+    try:
+        params = {key: float(spec[key]) for key in required}
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Distribution '{name}' needs numeric {', '.join(required)}")
+    if not all(math.isfinite(value) and value >= 0 for value in params.values()):
+        raise ValueError(f"Distribution '{name}' parameters must be finite and non-negative")
+    if kind == 'triangular' and not params['low'] <= params['mode'] <= params['high'] or \
+            kind == 'uniform' and params['low'] > params['high']:
+        raise ValueError(f"Distribution '{name}' bounds are out of order")
+    return dict(params, dist=kind)
+
+
+# Draw `size` non-negative multipliers from a validated distribution
+def sample_multipliers(rng, spec, size):
+    kind = spec['dist']
+    if kind == 'fixed':
+        return np.full(size, spec['value'])
+    if kind == 'uniform':
+        return rng.uniform(spec['low'], spec['high'], size)
+    if kind == 'normal':
+        return np.maximum(rng.normal(spec['mean'], spec['std'], size), 0.0)
+    if spec['low'] == spec['high']:
+        return np.full(size, spec['low'])
+    return rng.triangular(spec['low'], spec['mode'], spec['high'], size)
+
+
+# Point-estimate inputs of a saved project, in the form calculate_* and the simulation use
+def project_estimate_inputs(project):
+    material_type = (project.material or 'asphalt').lower()
+    if material_type not in ESTIMATE_MATERIALS:
+        material_type = 'asphalt'
+    # The duration is resolved against the clock at pricing time, so it is stored with the estimate
+    duration_weeks = (project.cost_breakdown or {}).get('duration_weeks')
+    if duration_weeks is None:
+        duration_weeks = 8
+        if project.completion_date and project.submitted:
+            duration_weeks = max((project.completion_date - project.submitted).days / 7, 1)
+    area_sqft = project.area or 0
+    tonnage = project.tonnage or 0
+    # process_estimate stores the computed tonnage when none was given; only a real input overrides
+    derived = calculate_materials(area_sqft, material_type, 0, rates=rate_tables_for_version(project.rate_card_version))
+    if tonnage == derived.get('asphalt_tons', derived.get('concrete_yds', 0)):
+        tonnage = 0
+    # Projects estimated from extracted quantities are priced from their extracted line items
+    quantities = tuple((item['material'], item['unit'], item['quantity'])
+                       for item in (project.cost_breakdown or {}).get('line_items') or []
+                       if item['source'] == 'extracted')
+    return {
+        'area_sqft': area_sqft,
+        'material_type': material_type,
+        'project_type': project.type or 'road',
+        'duration_weeks': duration_weeks,
+        'tonnage': tonnage,
+        'width_ft': project.width or 0,
+        'quantities': quantities
+    }
+
+
+# Run the vectorized trials for one project and summarize the total-cost distribution
+def simulate_project_costs(inputs, distributions, trials, seed=None, rates=None):
+    """Each trial re-prices the project's fixed quantities with sampled multipliers on unit
+    costs, the labor rate, crew productivity and duration, following calculate_financials.
+    Trials are evaluated in chunks of SIMULATION_CHUNK_TRIALS to bound temporary memory.
+    """
+    area_sqft = inputs['area_sqft']
+    material_type = inputs['material_type']
+    duration_weeks = inputs['duration_weeks']
+    rates = rates or rate_tables
+    materials = calculate_materials(area_sqft, material_type, inputs['tonnage'], rates=rates)
+    equipment = calculate_equipment(area_sqft, duration_weeks, rates=rates)
+    labor = calculate_labor(area_sqft, duration_weeks, inputs['project_type'], material_type, inputs['width_ft'])
+    material_costs = None
+    if inputs['quantities']:
+        material_costs, _ = line_item_material_costs(inputs['quantities'], materials, material_type, area_sqft, rates)
+    point_estimate = calculate_financials(materials, labor, equipment, area_sqft, duration_weeks,
+                                          material_type, inputs['project_type'], rates=rates, material_costs=material_costs)
+
+    # Fixed quantities and the unit-cost keys they are priced with (as in calculate_financials)
+    if inputs['quantities']:
+        names, units, quantities, _ = zip(*line_item_rows(inputs['quantities'], materials, material_type, area_sqft, rates))
+        columns = price_line_items(names, units, quantities, rates)
+        priced = [(quantity, name) for name, quantity, is_priced
+                  in zip(names, columns['priced_quantity'].tolist(), columns['priced'].tolist()) if is_priced]
+    elif material_type in ('asphalt', 'recycled asphalt', 'bituminous surface'):
+        priced = [(materials.get('asphalt_tons', 0), material_type), (materials.get('aggregate_tons', 0), 'aggregate base')]
+    elif material_type == 'concrete':
+        priced = [(materials.get('concrete_yds', 0), 'concrete'), (materials.get('rebar_lbs', 0), 'rebar')]
+    else:
+        priced = [(materials.get('sealcoat_sqft', area_sqft), 'sealcoat')]
+    sqft_per_crew_hour = crew_productivity(inputs['project_type'], material_type, inputs['width_ft'])
+    equipment_units = [(equipment[unit + 's'], rate) for unit, rate in rates.equipment_weekly_rates.items()]
+    profit_margin = calculate_profit_margin(inputs['project_type'], area_sqft, rates)
+
+    rng = np.random.default_rng(seed)
+    totals = np.empty(trials)
+    for start in range(0, trials, SIMULATION_CHUNK_TRIALS):
+        size = min(SIMULATION_CHUNK_TRIALS, trials - start)
+        material_costs = np.zeros(size)
+        for quantity, cost_key in priced:
+            spec = distributions.get(cost_key, distributions['unit_costs'])
+            unit_cost = rates.material_unit_costs[cost_key] * sample_multipliers(rng, spec, size)
+            material_costs += quantity * unit_cost * rates.material_markup
+        duration = duration_weeks * sample_multipliers(rng, distributions['duration'], size)
+        with np.errstate(divide='ignore'):
+            crew_hours = area_sqft / (sqft_per_crew_hour * sample_multipliers(rng, distributions['productivity'], size))
+        crew_hours = np.where(duration > 0, np.minimum(crew_hours, 280 * duration), crew_hours)
+        crew_hours = np.maximum(crew_hours, 56)
+        labor_costs = np.rint(crew_hours) * (rates.labor_rate * sample_multipliers(rng, distributions['labor_rate'], size))
+        equipment_costs = (sum(np.rint(units * rate * duration) for units, rate in equipment_units)
+                           * rates.equipment_rate_multiplier)
+        subtotal = material_costs + labor_costs + equipment_costs
+        totals[start:start + size] = subtotal + subtotal * rates.overhead_rate + subtotal * profit_margin
+
+    counts, edges = np.histogram(totals, bins=SIMULATION_HISTOGRAM_BINS)
+    percentiles = np.percentile(totals, SIMULATION_PERCENTILES)
+    return {
+        'trials': trials,
+        'seed': seed,
+        'rate_card_version': rates.version,
+        'point_estimate': point_estimate['total_cost'],
+        'mean': round(float(totals.mean())),
+        'std': round(float(totals.std())),
+        'percentiles': {f"p{p}": round(float(value)) for p, value in zip(SIMULATION_PERCENTILES, percentiles)},
+        'histogram': {'edges': [round(float(edge)) for edge in edges], 'counts': counts.tolist()},
+        'distributions': distributions
+    }
+
+
+# Simulate several projects, spreading them over the process pool when there are many
+def simulate_projects(inputs_list, distributions, trials, seed=None):
+    rates = rate_tables  # One rate card for the whole run, passed explicitly to pool workers
+    seeds = [None] * len(inputs_list) if seed is None else [seed + index for index in range(len(inputs_list))]
+    if SIMULATION_WORKERS < 2 or len(inputs_list) < SIMULATION_PARALLEL_MIN_PROJECTS:
+        return [simulate_project_costs(inputs, distributions, trials, project_seed, rates)
+                for inputs, project_seed in zip(inputs_list, seeds)]
+    pool = get_simulation_process_pool()
+    futures = [pool.submit(simulate_project_costs, inputs, distributions, trials, project_seed, rates)
+               for inputs, project_seed in zip(inputs_list, seeds)]
+    return [future.result() for future in futures]
+
+
+# Parse the trials, seed and distributions of a simulation request
+def parse_simulation_request(data):
+    trials = int(data.get('trials') or SIMULATION_DEFAULT_TRIALS)
+    if not 1 <= trials <= SIMULATION_MAX_TRIALS:
+        raise ValueError(f"trials must be between 1 and {SIMULATION_MAX_TRIALS}")
+    seed = data.get('seed')
+    seed = int(seed) if seed is not None else None
+    overrides = data.get('distributions') or {}
+    if not isinstance(overrides, dict):
+        raise ValueError("distributions must be an object")
+    allowed = set(SIMULATION_DEFAULT_DISTRIBUTIONS) | set(rate_tables.material_unit_costs)
+    unknown = set(overrides) - allowed
+    if unknown:
+        raise ValueError(f"Unknown distributions: {', '.join(sorted(unknown))}")
+    distributions = {name: validate_distribution(name, spec)
+                     for name, spec in dict(SIMULATION_DEFAULT_DISTRIBUTIONS, **overrides).items()}
+    return trials, seed, distributions
+
+
+# Store simulation results next to each project's cost breakdown
+def store_simulation_results(projects, results):
+    simulated_at = datetime.now().isoformat(timespec='seconds')
+    for project, result in zip(projects, results):
+        # Reassign rather than mutate so SQLAlchemy sees the JSON column change
+        project.cost_breakdown = dict(project.cost_breakdown or {}, risk=dict(result, simulated_at=simulated_at))
+        project.version += 1
+        project.updated_at = datetime.now()
+    record_project_change()
+    db.session.commit()
+
+
+# Run a cost-risk simulation for one project
+@app.route('/api/admin/projects/<int:project_id>/simulate', methods=['POST'])
+def simulate_project(project_id):
+    if not session.get('admin_logged_in'):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    project = db.session.get(Project, project_id, options=[db.undefer(Project.cost_breakdown)])
+    if not project:
+        return jsonify({'error': 'Project not found'}), 404
+    try:
+        trials, seed, distributions = parse_simulation_request(request.get_json(silent=True) or {})
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    results = simulate_projects([project_estimate_inputs(project)], distributions, trials, seed)
+    store_simulation_results([project], results)
+    return jsonify(project.cost_breakdown['risk'])
+
+
+# Run a cost-risk simulation for several projects
+@app.route('/api/admin/projects/simulate', methods=['POST'])
+def simulate_projects_route():
+    if not session.get('admin_logged_in'):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    data = request.get_json(silent=True) or {}
+    try:
+        trials, seed, distributions = parse_simulation_request(data)
+        project_ids = [int(project_id) for project_id in data.get('project_ids') or []]
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    if not project_ids:
+        return jsonify({'error': 'project_ids required'}), 400
+
+    projects = Project.query.options(db.undefer(Project.cost_breakdown)).filter(Project.id.in_(project_ids)).all()
+    results = simulate_projects([project_estimate_inputs(p) for p in projects], distributions, trials, seed)
+    store_simulation_results(projects, results)
+    return jsonify({
+        'projects': {p.id: p.cost_breakdown['risk']['percentiles'] for p in projects},
+        'missing': sorted(set(project_ids) - {p.id for p in projects})
+    })
+
+
+# What-if sensitivity sweep settings
+SENSITIVITY_PARAMETERS = ('thickness', 'productivity', 'duration_weeks', 'unit_cost', 'labor_rate', 'profit_margin')
+SENSITIVITY_MAX_POINTS = int(os.environ.get('SENSITIVITY_MAX_POINTS', 5000))  # Evaluations per sweep request
+
+
+# Current value of every sweepable parameter for a project
+def sensitivity_base_values(inputs, rates):
+    material_type = inputs['material_type']
+    return {
+        'thickness': material_thickness(material_type, rates),
+        'productivity': crew_productivity(inputs['project_type'], material_type, inputs['width_ft']),
+        'duration_weeks': inputs['duration_weeks'],
+        'unit_cost': rates.material_unit_costs[material_type],
+        'labor_rate': rates.labor_rate,
+        'profit_margin': calculate_profit_margin(inputs['project_type'], inputs['area_sqft'], rates)
+    }
+
+
+# Rate tables with the project material's thickness and unit cost replaced, for line-item pricing
+def rates_with_overrides(rates, material_type, thickness, unit_cost):
+    tables = rates._replace(material_unit_costs={**rates.material_unit_costs, material_type: unit_cost})
+    if material_type == 'bituminous surface':
+        constants = dict(tables.material_constants)
+        constants[material_type] = dict(constants[material_type], thickness=thickness)
+        tables = tables._replace(material_constants=constants)
+    else:
+        tables = tables._replace(thickness={**tables.thickness, material_type: thickness})
+    return tables._replace(line_items=build_line_item_registry(tables))
+
+
+# Evaluate what-if points, recomputing only the pipeline stages whose inputs changed
+def run_sensitivity_sweep(inputs, variations, grid=False):
+    """Vary each parameter alone (for tornado data) and, with `grid`, every combination.
+
+    Stage results are memoized by the parameters they depend on: materials by thickness,
+    line items (projects with extracted quantities) by thickness and unit cost, labor by
+    productivity and duration, equipment by duration. Financials are recomputed per point
+    from the cached stages.
+    """
+    area_sqft = inputs['area_sqft']
+    material_type = inputs['material_type']
+    project_type = inputs['project_type']
+    rates = rate_tables
+    base = sensitivity_base_values(inputs, rates)
+    memo = {'materials': {}, 'line_items': {}, 'labor': {}, 'equipment': {}, 'financials': {}}
+    stats = {stage: {'computed': 0, 'reused': 0} for stage in memo}
+
+    def stage(name, key, compute):
+        cache = memo[name]
+        if key in cache:
+            stats[name]['reused'] += 1
+        else:
+            stats[name]['computed'] += 1
+            cache[key] = compute()
+        return cache[key]
+
+    def total_cost(point):
+        materials = stage('materials', point['thickness'], lambda: calculate_materials(
+            area_sqft, material_type, inputs['tonnage'], thickness=point['thickness'], rates=rates))
+        labor = stage('labor', (point['productivity'], point['duration_weeks']), lambda: calculate_labor(
+            area_sqft, point['duration_weeks'], project_type, material_type, inputs['width_ft'],
+            sqft_per_crew_hour=point['productivity']))
+        equipment = stage('equipment', point['duration_weeks'], lambda: calculate_equipment(
+            area_sqft, point['duration_weeks'], rates=rates))
+        material_costs = None
+        if inputs['quantities']:
+            material_costs = stage('line_items', (point['thickness'], point['unit_cost']), lambda: line_item_material_costs(
+                inputs['quantities'], materials, material_type, area_sqft,
+                rates_with_overrides(rates, material_type, point['thickness'], point['unit_cost']))[0])
+        financials = stage('financials', tuple(point[name] for name in SENSITIVITY_PARAMETERS), lambda: calculate_financials(
+            materials, labor, equipment, area_sqft, point['duration_weeks'], material_type, project_type,
+            profit_margin=point['profit_margin'], unit_costs={material_type: point['unit_cost']},
+            labor_rate=point['labor_rate'], rates=rates, material_costs=material_costs))
+        return financials['total_cost']
+
+    base_total = total_cost(base)
+
+    # One parameter at a time, sorted by swing for a tornado chart
+    tornado = []
+    for name, values in variations.items():
+        points = [{'value': value, 'total_cost': total_cost(dict(base, **{name: value}))} for value in values]
+        low = min(points, key=lambda point: point['total_cost'])
+        high = max(points, key=lambda point: point['total_cost'])
+        tornado.append({
+            'parameter': name,
+            'base_value': base[name],
+            'low': low,
+            'high': high,
+            'swing': high['total_cost'] - low['total_cost'],
+            'points': points
+        })
+    tornado.sort(key=lambda row: row['swing'], reverse=True)
+
+    response = {
+        'base': {'parameters': base, 'total_cost': base_total},
+        'tornado': tornado
+    }
+    if grid:
+        names = list(variations)
+        response['grid'] = [
+            dict(zip(names, combination),
+                 total_cost=total_cost(dict(base, **dict(zip(names, combination)))))
+            for combination in itertools.product(*variations.values())
+        ]
+    response['stages'] = stats
+    return response
+
+
+# Validate sweep variations: {parameter: [values]} with finite positive numbers
+def parse_sensitivity_variations(data):
+    variations = data.get('variations')
+    if not isinstance(variations, dict) or not variations:
+        raise ValueError("variations must map parameters to lists of values")
+    unknown = set(variations) - set(SENSITIVITY_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+    parsed = {}
+    for name, values in variations.items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"'{name}' must be a non-empty list")
+        parsed[name] = [float(value) for value in values]
+        # A zero profit margin is a valid what-if; zero productivity or thickness is not
+        if not all(math.isfinite(value) and (value > 0 or value == 0 and name == 'profit_margin')
+                   for value in parsed[name]):
+            raise ValueError(f"'{name}' values must be finite and positive")
+    points = sum(len(values) for values in parsed.values())
+    if data.get('grid'):
+        points += math.prod(len(values) for values in parsed.values())
+    if points > SENSITIVITY_MAX_POINTS:
+        raise ValueError(f"Sweep has {points} points; the limit is {SENSITIVITY_MAX_POINTS}")
+    return parsed
+
+
+# What-if sensitivity sweep over a stored project (nothing is saved)
+@app.route('/api/admin/projects/<int:project_id>/sensitivity', methods=['POST'])
+def project_sensitivity(project_id):
+    if not session.get('admin_logged_in'):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    # Only cost_breakdown (stored duration and line items) feeds the sweep
+    project = db.session.get(Project, project_id, options=[db.undefer(Project.cost_breakdown)])
+    if not project:
+        return jsonify({'error': 'Project not found'}), 404
+    data = request.get_json(silent=True) or {}
+    try:
+        variations = parse_sensitivity_variations(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify(run_sensitivity_sweep(project_estimate_inputs(project), variations, grid=bool(data.get('grid'))))
+
+
+# Validate rate card data against the built-in layout, raising ValueError on problems
+def validate_rate_card_data(data):
+    template = default_rate_card_data()
+    if not isinstance(data, dict) or set(data) != set(template):
+        raise ValueError(f"Rate card needs exactly: {', '.join(sorted(template))}")
+
+    def check_number(path, value):
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+            raise ValueError(f"{path} must be a non-negative number")
+
+    for key, default in template.items():
+        value = data[key]
+        if not isinstance(default, dict):
+            check_number(key, value)
+            continue
+        if not isinstance(value, dict):
+            raise ValueError(f"{key} must be an object")
+        # Profit margins may add project types; every other table keeps its fixed keys
+        missing = set(default) - set(value) if key == 'profit_margins' else set(default) ^ set(value)
+        if missing:
+            raise ValueError(f"{key} keys differ from the built-in card: {', '.join(sorted(missing))}")
+        for name, entry in value.items():
+            if isinstance(next(iter(default.values())), dict):
+                fields = next(iter(default.values())).keys()
+                if not isinstance(entry, dict) or set(entry) != set(fields):
+                    raise ValueError(f"{key}.{name} needs {', '.join(sorted(fields))}")
+                for field in fields:
+                    check_number(f"{key}.{name}.{field}", entry[field])
+            else:
+                check_number(f"{key}.{name}", entry)
+    return data
+
+
+# Overlay partial rate card changes on a full card, merging nested tables
+def merge_rate_card_data(base, changes):
+    merged = copy.deepcopy(base)
+    for key, value in changes.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_rate_card_data(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+# Rate card as JSON
+def rate_card_json(card):
+    return {
+        'version': card.version,
+        'active': card.active,
+        'note': card.note,
+        'created': card.created.strftime('%Y-%m-%d %H:%M:%S'),
+        'data': card.data
+    }
+
+
+# Make one rate card the active card and swap it in for this worker
+def activate_rate_card(version):
+    global rate_tables
+    tables = rate_tables_for_version(version)
+    db.session.execute(update(RateCard).values(active=RateCard.version == version))
+    db.session.commit()
+    rate_tables = tables  # Other workers pick it up within RATE_CARD_REFRESH_SECONDS
+    return tables
+
+
+# Price saved project rows under `rates` with calculate_estimates_batch
+def price_project_rows(rows, rates):
+    """Return (columns, line_items): the batch result columns as lists, and the re-priced
+    line items by row index for projects estimated from extracted quantities.
+    """
+    inputs = [project_estimate_inputs(row) for row in rows]
+    batch_inputs = (
+        [i['area_sqft'] for i in inputs], [i['material_type'] for i in inputs],
+        [i['project_type'] for i in inputs], [i['duration_weeks'] for i in inputs]
+    )
+    batch_options = {'tonnage': [i['tonnage'] for i in inputs], 'width_ft': [i['width_ft'] for i in inputs], 'rates': rates}
+    columns = {key: values.tolist() for key, values in calculate_estimates_batch(*batch_inputs, **batch_options).items()}
+
+    # Projects estimated from extracted quantities are re-priced from their extracted line items
+    line_items = {}
+    material_costs = [np.nan] * len(rows)
+    for index, project_inputs in enumerate(inputs):
+        if project_inputs['quantities']:
+            materials = {key: columns[key][index] for key in MATERIAL_QUANTITY_KEYS}
+            material_costs[index], line_items[index] = line_item_material_costs(
+                project_inputs['quantities'], materials, project_inputs['material_type'], project_inputs['area_sqft'], rates)
+    if line_items:
+        results = calculate_estimates_batch(*batch_inputs, material_costs=material_costs, **batch_options)
+        columns = {key: values.tolist() for key, values in results.items()}
+    return columns, line_items
+
+
+# Conditional reprice UPDATE: a row is written only if it is still pending at the version read
+REPRICE_UPDATE = (
+    update(Project.__table__)
+    .where(Project.__table__.c.id == bindparam('row_id'), Project.__table__.c.status == 'pending',
+           Project.__table__.c.version == bindparam('read_version'))
+)
+
+
+# Re-price every pending project under a rate card, in chunked bulk UPDATEs
+def reprice_pending_projects(version, on_chunk=None):
+    """Pending projects are read and locked in id order, REPRICE_CHUNK_SIZE at a time, priced
+    with calculate_estimates_batch and written back with one executemany UPDATE per chunk. The
+    UPDATE only matches rows still pending at the version read; if any row changed in between
+    (accepted, rejected or edited), the chunk is rolled back and read again, so the counts and
+    project_stats deltas cover exactly the rows written. A chunk still short after
+    REPRICE_CHUNK_RETRIES re-reads is left as it was and reported in `skipped` as its
+    [first id, last id]. `on_chunk(repriced, chunks)` is called after each commit.
+    """
+    rates = rate_tables_for_version(version)
+    repriced = 0
+    chunks = 0
+    last_id = 0
+    retries = 0
+    skipped = []
+    while True:
+        rows = db.session.execute(
+            select(Project.id, Project.area, Project.material, Project.type, Project.width, Project.tonnage,
+                   Project.completion_date, Project.submitted, Project.rate_card_version, Project.cost_breakdown,
+                   Project.cost_amount, Project.version)
+            .where(Project.status == 'pending', Project.id > last_id)
+            .order_by(Project.id)
+            .limit(REPRICE_CHUNK_SIZE)
+            .with_for_update()
+        ).all()
+        if not rows:
+            break
+        columns, line_items = price_project_rows(rows, rates)
+
+        updates = []
+        stats_changes = {}
+        updated_at = datetime.now()
+        for index, row in enumerate(rows):
+            total_cost = f"${columns['total_cost'][index]}"
+            key = ('pending', row.type, row.material)
+            count, cost, area = stats_changes.get(key, (0, 0.0, 0.0))
+            stats_changes[key] = (count, cost + columns['total_cost'][index] - (row.cost_amount or 0), area)
+            # Keep other breakdown entries, but a risk simulation priced under the old card is stale
+            cost_breakdown = {key: value for key, value in (row.cost_breakdown or {}).items() if key != 'risk'}
+            cost_breakdown.update({key: columns[key][index] for key in ('materials', 'labor', 'equipment', 'overhead', 'profit')})
+            if index in line_items:
+                cost_breakdown['line_items'] = line_items[index]
+            updates.append({
+                'row_id': row.id,
+                'read_version': row.version,
+                'cost': total_cost,
+                'cost_amount': columns['total_cost'][index],
+                'estimated_cost': total_cost,
+                'estimated_cost_amount': columns['total_cost'][index],
+                'profit_margin': columns['profit_margin_value'][index],
+                'success_probability': columns['success_probability'][index],
+                'cost_breakdown': cost_breakdown,
+                'rate_card_version': version,
+                'version': row.version + 1,
+                'updated_at': updated_at,
+                **{key: columns[key][index] for key in MATERIAL_QUANTITY_KEYS + (
+                    'management_hours', 'prep_hours', 'paving_hours', 'finishing_hours')}
+            })
+        if db.session.execute(REPRICE_UPDATE, updates).rowcount != len(updates):
+            db.session.rollback()
+            if retries < REPRICE_CHUNK_RETRIES:
+                retries += 1
+                continue
+            # Rows keep changing (or the driver misreports executemany rowcounts): leave them for a later run
+            app.logger.warning('Skipped re-pricing projects %d-%d after %d retries', rows[0].id, rows[-1].id, retries)
+            skipped.append([rows[0].id, rows[-1].id])
+        else:
+            apply_project_stats_changes(stats_changes)
+            record_project_change()
+            db.session.commit()
+            repriced += len(rows)
+            chunks += 1
+            if on_chunk:
+                on_chunk(repriced, chunks)
+        retries = 0
+        last_id = rows[-1].id
+    return {'version': version, 'repriced': repriced, 'chunks': chunks, 'skipped': skipped}
+
+
+# Background re-pricing jobs: one pass at a time per process
+reprice_job_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='reprice-job')
+
+
+# Queue a re-pricing pass under a rate card
+def submit_reprice_job(version):
+    now = datetime.now()
+    job = RepriceJob(
+        id=uuid.uuid4().hex,
+        rate_card_version=version,
+        status='queued',
+        repriced=0,
+        chunks=0,
+        created=now,
+        updated=now,
+        owner=process_identity(os.getpid())
+    )
+    # Purge finished jobs past the retention window
+    RepriceJob.query.filter(
+        RepriceJob.status.in_(['completed', 'failed']),
+        RepriceJob.updated < now - timedelta(hours=RFP_JOB_RETENTION_HOURS)
+    ).delete(synchronize_session=False)
+    db.session.add(job)
+    db.session.commit()
+    reprice_job_executor.submit(run_reprice_job, job.id, version)
+    return job
+
+
+# Update a re-pricing job record from the worker thread
+def update_reprice_job(job_id, **fields):
+    job = db.session.get(RepriceJob, job_id)
+    if job:
+        for key, value in fields.items():
+            setattr(job, key, value)
+        job.updated = datetime.now()
+        db.session.commit()
+
+
+# Worker: re-price the pending projects for a queued job, recording progress per chunk
+def run_reprice_job(job_id, version):
+    with app.app_context():
+        try:
+            update_reprice_job(job_id, status='running')
+            started = time.monotonic()
+            summary = reprice_pending_projects(
+                version, on_chunk=lambda repriced, chunks: update_reprice_job(job_id, repriced=repriced, chunks=chunks))
+            summary['seconds'] = round(time.monotonic() - started, 3)
+            update_reprice_job(job_id, status='completed', repriced=summary['repriced'], chunks=summary['chunks'],
+                               result=summary)
+        except Exception as e:
+            db.session.rollback()
+            update_reprice_job(job_id, status='failed', result={'error': 'Re-pricing failed', 'details': str(e)})
+        finally:
+            db.session.remove()
+
+
+# Re-pricing job as JSON
+def reprice_job_json(job):
+    return {
+        'job_id': job.id,
+        'version': job.rate_card_version,
+        'status': job.status,
+        'repriced': job.repriced,
+        'chunks': job.chunks,
+        'result': job.result,
+        'created': job.created.strftime('%Y-%m-%d %H:%M:%S'),
+        'updated': job.updated.strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+# List rate cards
+@app.route('/api/admin/rate_cards', methods=['GET'])
+def get_rate_cards():
+    if not session.get('admin_logged_in'):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    cards = RateCard.query.order_by(RateCard.version.desc()).all()
+    return jsonify({'active_version': rate_tables.version, 'rate_cards': [rate_card_json(card) for card in cards]})
+
+
+# Create a rate card version (fields not given are copied from the active card)
+@app.route('/api/admin/rate_cards', methods=['POST'])
+def create_rate_card():
+    if not session.get('admin_logged_in'):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    payload = request.get_json(silent=True) or {}
+    changes = payload.get('data') or {}
+    if not isinstance(changes, dict):
+        return jsonify({'error': 'data must be an object'}), 400
+    current = rate_tables._asdict()
+    data = merge_rate_card_data({key: current[key] for key in default_rate_card_data()}, changes)
+    try:
+        validate_rate_card_data(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    card = RateCard(data=data, active=False, note=str(payload.get('note') or '')[:255], created=datetime.now())
+    db.session.add(card)
+    db.session.commit()
+    if payload.get('activate'):
+        activate_rate_card(card.version)
+    return jsonify(rate_card_json(card)), 201
+
+
+# Activate a rate card version for new estimates
+@app.route('/api/admin/rate_cards/<int:version>/activate', methods=['POST'])
+def activate_rate_card_route(version):
+    if not session.get('admin_logged_in'):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    try:
+        activate_rate_card(version)
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    return jsonify({'active_version': version})
+
+
+# Start re-pricing all pending projects under a rate card version (runs in the background)
+@app.route('/api/admin/rate_cards/<int:version>/reprice', methods=['POST'])
+def reprice_projects(version):
+    if not session.get('admin_logged_in'):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    try:
+        rate_tables_for_version(version)
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    active = RepriceJob.query.filter(RepriceJob.status.in_(['queued', 'running'])).first()
+    if active:
+        return jsonify({'error': 'A re-pricing job is already running', 'job_id': active.id,
+                        'status_url': url_for('get_reprice_job', job_id=active.id)}), 409
+    job = submit_reprice_job(version)
+    return jsonify({'job_id': job.id, 'status': job.status,
+                    'status_url': url_for('get_reprice_job', job_id=job.id)}), 202
+
+
+# Get re-pricing job status and, once finished, its summary
+@app.route('/api/admin/reprice_jobs/<job_id>', methods=['GET'])
+def get_reprice_job(job_id):
+    if not session.get('admin_logged_in'):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    job = db.session.get(RepriceJob, job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(reprice_job_json(job))
+
+
 # Download project report as PDF
 @app.route('/download_report/<int:project_id>', methods=['GET'])
 def download_report(project_id):
-    project = db.session.get(Project, project_id)
+    project = db.session.get(Project, project_id, options=PROJECT_DETAIL_OPTIONS)
     if not project:
         return jsonify({'error': 'Project not found'}), 404
     
@@ -1102,7 +4731,7 @@ def download_report(project_id):
 # Download project report as CSV
 @app.route('/download_report_csv/<int:project_id>', methods=['GET'])
 def download_report_csv(project_id):
-    project = db.session.get(Project, project_id)
+    project = db.session.get(Project, project_id, options=PROJECT_DETAIL_OPTIONS)
     if not project:
         return jsonify({'error': 'Project not found'}), 404
     
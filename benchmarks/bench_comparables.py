@@ -0,0 +1,77 @@
+"""Benchmark the comparable-bid index: build time, nearest-neighbour query time and insert cost.
+
+Builds the index from synthetic project rows in memory (no database is touched), then times
+queries for random estimates against it. Run from the repository root:
+
+    python benchmarks/bench_comparables.py --rows 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from collections import namedtuple
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+Row = namedtuple('Row', ['id', 'type', 'material', 'area', 'width', 'submitted', 'completion_date', 'cost_amount'])
+TYPES = ['Road', 'Sidewalk', 'Bridge', 'Parking', 'Renovation']
+MATERIALS = ['Asphalt', 'Concrete', 'Sealcoat']
+
+
+# Project rows shaped like stored estimates
+def make_rows(rows, seed):
+    rng = random.Random(seed)
+    result = []
+    for index in range(rows):
+        submitted = date(2024, 1, 1) + timedelta(days=rng.randint(0, 600))
+        area = rng.randint(1000, 300000)
+        result.append(Row(index + 1, rng.choice(TYPES), rng.choice(MATERIALS), area, rng.choice([0, 0, 12, 24]),
+                          submitted, submitted + timedelta(weeks=rng.randint(2, 30)), area * rng.uniform(3, 12)))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows, args.seed)
+    started = time.perf_counter()
+    buckets = app.build_comparables_buckets(rows)
+    scale = app.comparables_scale(app.comparables_moments(buckets))
+    print(f"rows={args.rows} buckets={len(buckets)} built in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    rng = random.Random(args.seed + 1)
+    samples = []
+    for _ in range(args.queries):
+        key = (rng.choice(TYPES), rng.choice(MATERIALS))
+        area = rng.randint(1000, 300000)
+        started = time.perf_counter()
+        features = app.comparable_features([area], [0], [rng.randint(2, 30)], [area * rng.uniform(3, 12)])[0]
+        app.nearest_comparables(buckets[key], scale, features, app.COMPARABLES_COUNT)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    print(f"query   median {statistics.median(samples):.3f} ms  p99 {samples[int(len(samples) * 0.99)]:.3f} ms  "
+          f"max {samples[-1]:.3f} ms")
+
+    # Appending one new project to its bucket, as refresh_comparables_index does after an insert
+    key = ('Road', 'Asphalt')
+    added = app.build_comparables_buckets([rows[0]._replace(id=args.rows + 1, type=key[0], material=key[1])])[key]
+    started = time.perf_counter()
+    for _ in range(100):
+        bucket = buckets[key]
+        app.ComparablesBucket(np.concatenate((bucket.ids, added.ids)), np.vstack((bucket.features, added.features)))
+    print(f"insert  {(time.perf_counter() - started) * 10:.3f} ms per project")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark streaming DOCX text extraction against the python-docx object model.
+
+Run from the repository root with the same environment as the app (DATABASE_URL etc.):
+
+    python benchmarks/bench_docx_extraction.py --rows 20000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+from docx import Document
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+
+# Previous implementation: load the whole document, then walk paragraphs and table cells
+def legacy_extract_text_from_docx(file):
+    doc = Document(BytesIO(file.read()))
+    text = ""
+    for para in doc.paragraphs:
+        if para.text.strip():
+            text += para.text + "\n"
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                cell_text = cell.text.strip()
+                if cell_text:
+                    text += cell_text + "\n"
+    if not text.strip():
+        raise ValueError("No text found in DOCX.")
+    return text
+
+
+# Build a specification-style DOCX: a few paragraphs and a long bid-item table with merged cells
+def make_synthetic_docx(rows, section_every=50):
+    doc = Document()
+    doc.add_paragraph("Project Name: Route 9 Mill and Overlay")
+    doc.add_paragraph("Location: Springfield, IL")
+    doc.add_paragraph("Bid Due Date: 2026-11-30")
+    table = doc.add_table(rows=rows, cols=5)
+    for index, row in enumerate(table.rows):
+        if index % section_every == 0:
+            # Section heading spanning the full width
+            merged = row.cells[0].merge(row.cells[4])
+            merged.text = f"Section {index // section_every + 1}: Paving"
+            continue
+        cells = row.cells
+        cells[0].text = f"{index}"
+        cells[1].text = f"Item {index}: 2 in. HMA surface course, 12 ft width"
+        cells[2].text = "TON"
+        cells[3].text = f"{1000 + index:,}"
+        cells[4].text = f"${85 + index % 7}.00"
+    doc.add_paragraph("Scope of work: mill existing surface and place new asphalt overlay.")
+    out = BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def measure(extract, docx_data, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        text = extract(BytesIO(docx_data))
+        best = min(best, time.perf_counter() - started)
+    # Python-heap peak only: tracemalloc does not see lxml's C allocations, so python-docx is understated
+    tracemalloc.start()
+    extract(BytesIO(docx_data))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    docx_data = make_synthetic_docx(args.rows)
+    print(f"Synthetic DOCX: {args.rows} table rows, {len(docx_data) / 1024:.0f} KiB")
+
+    results = {}
+    for name, extract in (('python-docx', legacy_extract_text_from_docx),
+                          ('streaming', app.extract_text_from_docx)):
+        seconds, peak, text = measure(extract, docx_data, args.repeat)
+        results[name] = (seconds, text)
+        print(f"{name:<12} {seconds * 1000:9.1f} ms  peak={peak / 2 ** 20:7.1f} MiB  "
+              f"lines={text.count(chr(10))}  chars={len(text)}")
+    print(f"speedup={results['python-docx'][0] / results['streaming'][0]:.2f}x")
+
+    # Same content, except merged cells are no longer repeated and paragraphs keep document order
+    legacy_lines = set(results['python-docx'][1].splitlines())
+    streaming_lines = set(results['streaming'][1].splitlines())
+    print(f"lines only in python-docx output: {len(legacy_lines - streaming_lines)}, "
+          f"only in streaming output: {len(streaming_lines - legacy_lines)}")
+
+
+if __name__ == '__main__':
+    main()
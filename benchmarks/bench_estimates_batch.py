@@ -0,0 +1,89 @@
+"""Benchmark vectorized batch estimation against the per-project scalar functions.
+
+Checks that every column matches the scalar result exactly, then reports the speedup.
+Run from the repository root with the same environment as the app (DATABASE_URL etc.):
+
+    python benchmarks/bench_estimates_batch.py --rows 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+PROJECT_TYPES = ['road', 'Road', 'sidewalk', 'Sidewalk repair', 'bridge', 'building', 'renovation', 'parking lot']
+
+
+# Random scenarios, including values that sit exactly on rounding ties
+def make_scenarios(rows, seed):
+    rng = random.Random(seed)
+    scenarios = []
+    for _ in range(rows):
+        area = rng.choice([rng.randint(100, 400000), round(rng.uniform(100, 400000), 2), rng.randint(1, 40) * 2500])
+        tonnage = rng.choice([0, 0, rng.randint(1, 4000) / 4, round(rng.uniform(1, 5000), 3)])
+        scenarios.append((
+            float(area),
+            rng.choice(app.ESTIMATE_MATERIALS),
+            rng.choice(PROJECT_TYPES),
+            rng.choice([8, rng.randint(1, 40), round(rng.uniform(0.5, 40), 2)]),
+            tonnage,
+            rng.choice([0, rng.randint(1, 3), round(rng.uniform(1, 40), 1)]),
+        ))
+    return scenarios
+
+
+# The per-row path process_estimate takes, flattened to the batch column names
+def scalar_estimate(area, material_type, project_type, duration, tonnage, width):
+    materials = app.calculate_materials(area, material_type, tonnage)
+    labor = app.calculate_labor(area, duration, project_type, material_type, width)
+    equipment = app.calculate_equipment(area, duration)
+    financials = app.calculate_financials(materials, labor, equipment, area, duration, material_type, project_type)
+    row = {key: materials.get(key, 0) for key in
+           ('asphalt_tons', 'bituminous_tons', 'aggregate_tons', 'concrete_yds', 'rebar_lbs', 'sealcoat_sqft')}
+    row.update(labor)
+    row.update(equipment)
+    row.update(financials['cost_breakdown'])
+    row.update({key: financials[key] for key in ('total_cost', 'profit_margin_value', 'profit_margin', 'cost_per_sqft')})
+    row['success_probability'] = app.calculate_success_probability(project_type, area, duration)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    scenarios = make_scenarios(args.rows, args.seed)
+    columns = list(zip(*scenarios))
+
+    started = time.perf_counter()
+    expected = [scalar_estimate(*scenario) for scenario in scenarios]
+    scalar_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    results = app.calculate_estimates_batch(columns[0], columns[1], columns[2], columns[3],
+                                            tonnage=columns[4], width_ft=columns[5])
+    batch_seconds = time.perf_counter() - started
+
+    mismatches = 0
+    for key, values in results.items():
+        for index, value in enumerate(values.tolist()):
+            if value != expected[index][key]:
+                mismatches += 1
+                if mismatches <= 10:
+                    print(f"mismatch row={index} {key}: batch={value!r} scalar={expected[index][key]!r}")
+
+    print(f"rows={args.rows}")
+    print(f"scalar   {scalar_seconds * 1000:9.1f} ms  {scalar_seconds / args.rows * 1e6:7.2f} us/estimate")
+    print(f"batch    {batch_seconds * 1000:9.1f} ms  {batch_seconds / args.rows * 1e6:7.2f} us/estimate")
+    print(f"speedup={scalar_seconds / batch_seconds:.1f}x  mismatches={mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""Benchmark regex RFP field extraction over a synthetic corpus of RFP texts.
+
+Compares extract_rfp_data (single token scan + anchored matches) with the previous
+strategy of one re.search pass per pattern, and checks both give the same fields.
+Run from the repository root with the same environment as the app (DATABASE_URL etc.):
+
+    python benchmarks/bench_extract_rfp_data.py --docs 200
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+HEADER = """RFP #{n} - {road} Resurfacing Program
+PROJECT LOCATION: {county} County, VA
+Completion Date: June {day}, 2026
+Project Duration (weeks): {weeks}
+The work covers {miles} lane miles at {width} ft width.
+ESTIMATED QUANTITIES: {tons} tons of asphalt; {yds} yd³ of concrete; {lbs} lbs of rebar
+"""
+BOILERPLATE = [
+    "The contractor shall furnish a performance bond and a payment bond each in the amount of one hundred percent of the contract price.",
+    "Insurance certificates naming the owner as additional insured must be delivered before mobilization and maintained throughout the contract.",
+    "All work shall conform to the current road and bridge specifications, supplemental specifications and special provisions.",
+    "Traffic control devices shall be maintained in accordance with the work area protection manual at all times during operations.",
+    "Bidders are advised that prevailing wage determinations apply and certified payrolls are required with each pay application.",
+]
+FOOTER = """SCOPE OF WORK: Mill existing surface, patch base failures, place 2 in. SM-9.5A surface course and restore pavement markings.
+SPECIAL REQUIREMENTS: Night work only between 8 PM and 6 AM; maintain access to all businesses.
+"""
+
+
+def make_corpus(docs, seed=7):
+    rng = random.Random(seed)
+    corpus = []
+    for n in range(docs):
+        body = [HEADER.format(
+            n=n, road=rng.choice(['Route 29', 'Main Street', 'Airport Road']),
+            county=rng.choice(['Albemarle', 'Fairfax', 'Henrico']), day=rng.randint(1, 28),
+            weeks=rng.randint(4, 30), miles=round(rng.uniform(0.5, 12), 1), width=rng.choice([10, 11, 12, 24]),
+            tons=f"{rng.randint(200, 9000):,}", yds=rng.randint(20, 900), lbs=f"{rng.randint(500, 50000):,}",
+        )]
+        # Documents range from a couple of pages to long bid packages
+        for _ in range(rng.choice([20, 100, 400, 1200])):
+            body.append(rng.choice(BOILERPLATE))
+        body.append(FOOTER)
+        corpus.append("\n".join(body))
+    return corpus
+
+
+# Previous strategy: a full re.search / re.finditer pass per pattern
+def legacy_field_passes(text):
+    normalized_text = re.sub(r'\s+', ' ', text).lower()
+    data = {}
+    for key, _, pattern in app.RFP_FIELD_PATTERNS:
+        if key == 'quantities':
+            data.setdefault(key, [m.groups() for m in re.finditer(pattern, normalized_text, re.IGNORECASE)])
+        elif key not in data:
+            match = re.search(pattern, normalized_text, re.IGNORECASE)
+            if match:
+                data[key] = match.group(1)
+    for key, _, pattern in app.RFP_SECTION_PATTERNS:
+        match = re.search(pattern, normalized_text, re.IGNORECASE)
+        if match:
+            data[key] = match.end()
+    return data
+
+
+def scanner_field_passes(text):
+    normalized_text = app.WHITESPACE_RE.sub(' ', text).lower()
+    offsets = app.scan_rfp_tokens(normalized_text)
+    data = {}
+    for key, tokens, pattern in app.RFP_COMPILED_FIELDS:
+        if key == 'quantities':
+            matches, next_pos = [], 0
+            for offset in app.rfp_candidates(offsets, tokens):
+                match = pattern.match(normalized_text, offset) if offset >= next_pos else None
+                if match:
+                    matches.append(match.groups())
+                    next_pos = match.end()
+            data.setdefault(key, matches)
+        elif key not in data:
+            match, _ = app.first_rfp_match(normalized_text, offsets, tokens, pattern)
+            if match:
+                data[key] = match.group(1)
+    for key, tokens, pattern in app.RFP_COMPILED_SECTIONS:
+        match, _ = app.first_rfp_match(normalized_text, offsets, tokens, pattern)
+        if match:
+            data[key] = match.end()
+    return data
+
+
+def timed(fn, corpus, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--docs', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.docs)
+    total_kb = sum(len(text) for text in corpus) / 1024
+    print(f"Corpus: {len(corpus)} documents, {total_kb:.0f} KiB")
+
+    mismatches = sum(legacy_field_passes(text) != scanner_field_passes(text) for text in corpus)
+    print(f"Field matches differing between strategies: {mismatches}")
+
+    legacy = timed(legacy_field_passes, corpus, args.repeat)
+    scanner = timed(scanner_field_passes, corpus, args.repeat)
+    full = timed(app.extract_rfp_data, corpus, args.repeat)
+    print(f"per-pattern passes   {legacy * 1000:8.1f} ms  ({legacy * 1e6 / total_kb:6.1f} us/KiB)")
+    print(f"token scanner        {scanner * 1000:8.1f} ms  ({scanner * 1e6 / total_kb:6.1f} us/KiB)  {legacy / scanner:4.2f}x")
+    print(f"extract_rfp_data     {full * 1000:8.1f} ms  ({full * 1e6 / total_kb:6.1f} us/KiB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark page-parallel PDF text extraction on a synthetic multi-hundred-page PDF.
+
+Run from the repository root with the same environment as the app (DATABASE_URL etc.):
+
+    python benchmarks/bench_pdf_extraction.py --pages 400
+"""
+import argparse
+import os
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+
+# Build a minimal text-only PDF with the given number of pages
+def make_synthetic_pdf(pages, lines_per_page=45):
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Page tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_refs = []
+    for page_no in range(pages):
+        lines = [b"BT /F1 9 Tf 40 800 Td 11 TL"]
+        for line_no in range(lines_per_page):
+            lines.append(
+                b"(Item %d.%d: Mill and overlay 2 in. HMA surface, 1,250 tons asphalt, 12 ft width, Route %d) '"
+                % (page_no + 1, line_no + 1, line_no)
+            )
+        lines.append(b"ET")
+        stream = b"\n".join(lines)
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        page_refs.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % ref for ref in page_refs)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    out = BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref_pos = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_pos))
+    return out.getvalue()
+
+
+def run(pdf_data, workers, repeat):
+    # Recreate the pool so each run uses exactly `workers` processes
+    if app.pdf_process_pool is not None:
+        app.pdf_process_pool.shutdown()
+        app.pdf_process_pool = None
+    app.PDF_WORKERS = workers
+    app.extract_text_from_pdf(BytesIO(pdf_data))  # Warm up the pool
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        text = app.extract_text_from_pdf(BytesIO(pdf_data))
+        best = min(best, time.perf_counter() - started)
+    return best, len(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=400)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    pdf_data = make_synthetic_pdf(args.pages)
+    print(f"Synthetic PDF: {args.pages} pages, {len(pdf_data) / 1024:.0f} KiB")
+
+    worker_counts = sorted({1, *[2 ** i for i in range(1, 8) if 2 ** i <= args.max_workers], args.max_workers})
+    baseline = None
+    for workers in worker_counts:
+        seconds, chars = run(pdf_data, workers, args.repeat)
+        baseline = baseline or seconds
+        print(f"workers={workers:<3} {seconds * 1000:8.1f} ms  speedup={baseline / seconds:4.2f}x  chars={chars}")
+
+    # Early stop: only the first 3500 characters are needed by the GPT prompt
+    started = time.perf_counter()
+    app.extract_text_from_pdf(BytesIO(pdf_data), max_chars=3500)
+    print(f"max_chars=3500  {(time.perf_counter() - started) * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
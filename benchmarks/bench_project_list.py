@@ -0,0 +1,86 @@
+"""Benchmark loading the admin project list: full rows, deferred detail columns, slim list.
+
+Seeds a throwaway in-memory SQLite database (the app's own database is not touched) with
+projects carrying realistic scope/requirements text and cost breakdowns, then reports time
+and peak Python memory for each way of loading every row. Run from the repository root:
+
+    python benchmarks/bench_project_list.py --rows 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+WORDS = 'asphalt milling overlay curb gutter drainage traffic control striping base course compaction'.split()
+
+
+# Projects shaped like process_estimate output
+def make_projects(rows, seed):
+    rng = random.Random(seed)
+    projects = []
+    for index in range(rows):
+        cost = rng.randint(20000, 2000000)
+        projects.append(app.Project(
+            name=f'Project {index}', type=rng.choice(['Road', 'Sidewalk', 'Bridge']), location='Richmond, VA',
+            submitted=date(2024, 1, 1) + timedelta(days=rng.randint(0, 600)),
+            status=rng.choice(['pending', 'accepted', 'rejected']), cost=f'${cost}', cost_amount=cost,
+            area=rng.randint(1000, 300000), material=rng.choice(['Asphalt', 'Concrete']),
+            scope=' '.join(rng.choice(WORDS) for _ in range(150))[:1000],
+            requirements=' '.join(rng.choice(WORDS) for _ in range(120))[:1000],
+            cost_breakdown={'materials': cost // 2, 'labor': cost // 5, 'equipment': cost // 10,
+                            'overhead': cost // 10, 'profit': cost // 10,
+                            'risk': {'percentiles': {'p10': cost * 0.9, 'p50': cost, 'p90': cost * 1.2}}}
+        ))
+    return projects
+
+
+# Seconds and peak traced memory (bytes) of loading every row with `load`
+def measure(engine, load):
+    with Session(engine) as session:
+        tracemalloc.start()
+        started = time.perf_counter()
+        rows = load(session)
+        seconds = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return len(rows), seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    engine = create_engine('sqlite://')
+    app.db.metadata.create_all(engine, tables=[app.Project.__table__])
+    with Session(engine) as session:
+        session.add_all(make_projects(args.rows, args.seed))
+        session.commit()
+
+    slim = app.build_project_list_query({'status': 'all'}, paginate=False).statement
+    loaders = [
+        ('full rows', lambda session: session.scalars(select(app.Project).options(*app.PROJECT_DETAIL_OPTIONS)).all()),
+        ('deferred', lambda session: session.scalars(select(app.Project)).all()),
+        ('slim list', lambda session: session.execute(slim).all()),
+    ]
+    print(f"rows={args.rows}")
+    baseline = None
+    for name, load in loaders:
+        count, seconds, peak = measure(engine, load)
+        baseline = baseline or peak
+        print(f"{name:10} {seconds * 1000:9.1f} ms  peak {peak / 1e6:7.1f} MB  ({peak / baseline:.0%} of full)  rows={count}")
+
+
+if __name__ == '__main__':
+    main()
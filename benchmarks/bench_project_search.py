@@ -0,0 +1,110 @@
+"""Benchmark /api/admin/projects/search queries against the SQLite FTS5 index.
+
+Seeds a throwaway in-memory SQLite database (the app's own database is not touched) with
+projects carrying realistic names, locations, scope and requirements text, builds the FTS5
+index, then reports the median and worst time of ranked search queries with and without the
+highlighting of the returned page. Run from the repository root:
+
+    python benchmarks/bench_project_search.py --rows 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+WORDS = ('asphalt milling overlay curb gutter drainage traffic control striping base course compaction '
+         'thermoplastic sealcoat crack sealing patching excavation grading concrete sidewalk ramp culvert '
+         'guardrail shoulder resurfacing subgrade geotextile inlet manhole signage night work').split()
+# Zipf-distributed vocabulary: filler words with the trade words spread from common to rare ranks
+VOCABULARY = [f'term{rank}' for rank in range(5000)]
+for position, word in enumerate(WORDS):
+    VOCABULARY[5 + position * 40] = word
+VOCABULARY_WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+COUNTIES = ['Henrico', 'Chesterfield', 'Hanover', 'Goochland', 'Powhatan', 'Fairfax', 'Loudoun', 'Prince William']
+QUERIES = ['asphalt', 'milling', 'thermoplastic striping', '"traffic control"', 'henrico', 'guardrail culvert',
+           'night work', 'geo', 'manhole']
+
+
+# Projects shaped like process_estimate output
+def make_projects(rows, seed):
+    rng = random.Random(seed)
+    projects = []
+    for index in range(rows):
+        cost = rng.randint(20000, 2000000)
+        projects.append(app.Project(
+            name=f"{rng.choice(['Route', 'Main St', 'County Rd', 'I-'])} {index} {rng.choice(WORDS)}",
+            type=rng.choice(['Road', 'Sidewalk', 'Bridge']), location=f"{rng.choice(COUNTIES)} County, VA",
+            submitted=date(2024, 1, 1) + timedelta(days=rng.randint(0, 600)),
+            status=rng.choice(['pending', 'accepted', 'rejected']), cost=f'${cost}', cost_amount=cost,
+            area=rng.randint(1000, 300000), material=rng.choice(['Asphalt', 'Concrete']),
+            scope=' '.join(rng.choices(VOCABULARY, VOCABULARY_WEIGHTS, k=150))[:1000],
+            requirements=' '.join(rng.choices(VOCABULARY, VOCABULARY_WEIGHTS, k=60))[:500]
+        ))
+    return projects
+
+
+# Median and worst milliseconds of `run` over `repeat` calls
+def timed(run, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--limit', type=int, default=app.PROJECT_SEARCH_PAGE_SIZE)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    engine = create_engine('sqlite://')
+    app.db.metadata.create_all(engine, tables=[app.Project.__table__])
+    with Session(engine) as session:
+        session.add_all(make_projects(args.rows, args.seed))
+        session.commit()
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        connection.execute(text(app.project_search_fts5_ddl()))
+        connection.execute(text(f"INSERT INTO {app.PROJECT_SEARCH_INDEX}({app.PROJECT_SEARCH_INDEX}) VALUES ('rebuild')"))
+    print(f"rows={args.rows} index built in {time.perf_counter() - started:.1f}s")
+
+    with Session(engine) as session:
+        for query in QUERIES:
+            terms = app.parse_search_query(query)
+            stmt, params = app.build_project_search_query(terms, 'fts5', limit=args.limit + 1)
+            columns = [getattr(app.Project, field) for field in ('id',) + app.PROJECT_SEARCH_COLUMNS]
+
+            def search():
+                return session.execute(stmt, params).all()
+
+            def search_and_highlight():
+                ids = [match.id for match in search()]
+                pattern = app.search_terms_pattern(terms)
+                for row in session.execute(select(*columns).where(app.Project.id.in_(ids))):
+                    for column in app.PROJECT_SEARCH_COLUMNS:
+                        app.highlight_search_terms(getattr(row, column), pattern, app.PROJECT_SEARCH_SNIPPET_CHARS)
+
+            matches = session.scalar(text(f"SELECT count(*) FROM {app.PROJECT_SEARCH_INDEX} "
+                                          f"WHERE {app.PROJECT_SEARCH_INDEX} MATCH :query"), {'query': params['query']})
+            median, worst = timed(search, args.repeat)
+            full_median, full_worst = timed(search_and_highlight, args.repeat)
+            print(f"{query:28} matches {matches:7}  search {median:7.2f} ms (max {worst:7.2f})  "
+                  f"+ highlight {full_median:7.2f} ms (max {full_worst:7.2f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Check that the admin dashboard queries use their indexes, and time them.
+
+Seeds a throwaway SQLite database (the app's own database is not touched) with the project
+table and its indexes, runs ANALYZE so the planner sees production-like statistics, then runs
+the `flask explain-queries` checks against it. Exits non-zero if any query plan stops using
+its index or sorts rows the index should deliver in order. Run from the repository root:
+
+    python benchmarks/bench_query_plans.py --rows 50000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+TYPES = ['Road', 'Sidewalk', 'Bridge', 'Parking', 'Renovation']
+MATERIALS = ['Asphalt', 'Concrete', 'Sealcoat']
+
+
+# Project rows with the status mix, date spread and type/material spread of a live dashboard
+def make_rows(rows, seed):
+    rng = random.Random(seed)
+    result = []
+    for index in range(rows):
+        submitted = date(2023, 1, 1) + timedelta(days=rng.randint(0, 1000))
+        cost = rng.randint(20000, 2000000)
+        result.append({
+            'id': index + 1, 'name': f'Project {index}', 'type': rng.choice(TYPES), 'location': 'Richmond, VA',
+            'submitted': submitted, 'status': rng.choices(['pending', 'accepted', 'rejected'], [2, 5, 3])[0],
+            'cost': f'${cost}', 'cost_amount': cost, 'area': rng.randint(1000, 300000),
+            'material': rng.choice(MATERIALS), 'completion_date': submitted + timedelta(weeks=rng.randint(2, 40)),
+            'scope': 'Mill and overlay', 'requirements': '', 'version': 1, 'updated_at': datetime.now()
+        })
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    engine = create_engine('sqlite://')
+    app.db.metadata.create_all(engine, tables=[app.Project.__table__])
+    with Session(engine) as session:
+        session.execute(insert(app.Project.__table__), make_rows(args.rows, args.seed))
+        session.execute(text('ANALYZE'))
+        session.commit()
+
+        with app.app.app_context():
+            results = app.check_dashboard_query_plans(session)
+            plans = app.dashboard_query_plans()
+        print(f"rows={args.rows}")
+        for passed, line in results:
+            print(line)
+        for name, stmt, _, _ in plans:
+            started = time.perf_counter()
+            session.execute(stmt).all()
+            print(f"{name:24} {(time.perf_counter() - started) * 1000:8.2f} ms")
+
+    sys.exit(0 if all(passed for passed, _ in results) else 1)
+
+
+if __name__ == '__main__':
+    main()
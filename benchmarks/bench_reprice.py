@@ -0,0 +1,108 @@
+"""Check that re-pricing saved projects under their own rate card reproduces their estimates.
+
+Builds project rows the way process_estimate saves them (completion dates, durations, given
+tonnage and mixed extracted quantities), re-prices them with price_project_rows as
+reprice_pending_projects does, and exits non-zero if any total differs from the saved
+cost_amount. The risk simulation's point estimate and the sensitivity sweep's base total
+are checked the same way on the first --point-rows rows. Also reports the re-pricing
+throughput. Run from the repository root with the same environment as the app
+(DATABASE_URL etc.):
+
+    python benchmarks/bench_reprice.py --rows 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+Row = namedtuple('Row', ['area', 'material', 'type', 'width', 'tonnage', 'completion_date', 'submitted',
+                         'rate_card_version', 'cost_breakdown'])
+PROJECT_TYPES = ['road', 'sidewalk', 'bridge', 'building', 'parking lot']
+QUANTITIES = [('asphalt', 'tons'), ('concrete', 'cy'), ('aggregate', 'tons'), ('rebar', 'lbs'), ('sealcoat', 'sq yd')]
+
+
+# Estimate requests as the form and the RFP upload send them
+def make_requests(rows, seed):
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(rows):
+        data = {
+            'project_area': str(rng.randint(1000, 300000)),
+            'material_type': rng.choice(app.ESTIMATE_MATERIALS),
+            'project_type': rng.choice(PROJECT_TYPES),
+            'width': str(rng.choice([0, 12, 24])),
+            'tonnage': str(rng.choice([0, 0, rng.randint(50, 5000)])),
+        }
+        if rng.random() < 0.6:
+            data['completion_date'] = (datetime.now() + timedelta(days=rng.randint(10, 400))).strftime('%Y-%m-%d')
+        else:
+            data['project_duration'] = str(rng.choice([0, rng.randint(1, 40), round(rng.uniform(1, 40), 1)]))
+        if rng.random() < 0.3:
+            data['quantities'] = [{'material': material, 'unit': unit, 'quantity': rng.randint(10, 20000)}
+                                  for material, unit in rng.sample(QUANTITIES, rng.randint(1, 3))]
+        requests.append(data)
+    return requests
+
+
+# The row process_estimate saves for one request, and its saved cost_amount
+def saved_project(data):
+    estimate_input = app.normalize_estimate_input(data)
+    estimate = app.compute_estimate(estimate_input)
+    materials = estimate['material_estimates']
+    financial_summary = estimate['financial_summary']
+    tonnage = estimate_input.tonnage
+    row = Row(
+        area=estimate_input.area_sqft,
+        material=estimate_input.material_type.capitalize(),
+        type=estimate_input.project_type.capitalize(),
+        width=estimate_input.width_ft,
+        tonnage=tonnage if tonnage > 0 else materials.get('asphalt_tons', materials.get('concrete_yds', 0)),
+        completion_date=datetime.strptime(estimate_input.completion_date, '%Y-%m-%d').date(),
+        submitted=date.today(),
+        rate_card_version=estimate['rate_card_version'],
+        cost_breakdown=dict(financial_summary['cost_breakdown'], duration_weeks=estimate_input.duration_weeks)
+    )
+    return row, financial_summary['total_cost']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=11)
+    parser.add_argument('--point-rows', type=int, default=2000, help='Rows checked through simulation and sensitivity')
+    args = parser.parse_args()
+
+    with app.app.app_context():
+        saved = [saved_project(data) for data in make_requests(args.rows, args.seed)]
+        rows = [row for row, _ in saved]
+        rates = app.rate_tables_for_version(rows[0].rate_card_version)
+        started = time.perf_counter()
+        columns, line_items = app.price_project_rows(rows, rates)
+        seconds = time.perf_counter() - started
+
+        mismatches = [('reprice', index, cost, columns['total_cost'][index]) for index, (_, cost) in enumerate(saved)
+                      if columns['total_cost'][index] != cost]
+        _, _, distributions = app.parse_simulation_request({'trials': 1})
+        for index, (row, cost) in enumerate(saved[:args.point_rows]):
+            inputs = app.project_estimate_inputs(row)
+            simulated = app.simulate_project_costs(inputs, distributions, 1, seed=0, rates=rates)['point_estimate']
+            swept = app.run_sensitivity_sweep(inputs, {})['base']['total_cost']
+            mismatches += [(check, index, cost, value) for check, value in [('simulation', simulated), ('sensitivity', swept)]
+                           if value != cost]
+
+    for check, index, cost, value in mismatches[:5]:
+        print(f"MISMATCH {check} row {index}: saved {cost}, got {value}  {rows[index]}")
+    print(f"rows={len(rows)} with line items={len(line_items)} mismatches={len(mismatches)}")
+    print(f"re-priced in {seconds * 1000:.0f} ms ({len(rows) / seconds:,.0f} rows/s)")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Check that regex RFP extraction stays bounded on adversarial inputs.
+
+Each input targets a pattern that used to backtrack heavily on single-line text. The
+script exits non-zero if any document takes longer than the configured regex budget plus
+a fixed allowance, or if the pricing fields at the end of a slow document are lost once
+the budget is spent. Run from the repository root with the same environment as the app
+(DATABASE_URL etc.):
+
+    python benchmarks/bench_rfp_regex_guard.py --scale 4
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+ALLOWANCE_SECONDS = 0.25  # Scanning, normalization and the final in-flight attempt
+
+
+def adversarial_inputs(scale):
+    return {
+        # Location: every "in" scans to the next comma looking for "county"/"city"/...
+        'location without commas': 'in ' * 4000 * scale,
+        # Completion date: every "deadline" consumes the rest of one long letter run
+        'deadline letter run': 'deadline' * 3000 * scale,
+        'completed-by letter run': 'workcompletedby' * 2000 * scale,
+        'fully-completed letter run': 'fullycompletedby' * 2000 * scale,
+        # Area / quantities: long digit runs with no unit after them
+        'digit run': '1' * 20000 * scale,
+        'digit run before unit': '1' * 20000 * scale + ' feet tall',
+        'comma separated digits': '1,' * 10000 * scale + ' sq',
+        # Everything at once on one collapsed line
+        'mixed': ('in deadline 1111111111 rfp #aaaaaaaa ' * 1000 * scale),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=int, default=1, help='Multiply the size of every input')
+    args = parser.parse_args()
+
+    limit = app.RFP_REGEX_BUDGET_SECONDS + ALLOWANCE_SECONDS
+    failures = 0
+    for name, text in adversarial_inputs(args.scale).items():
+        started = time.perf_counter()
+        app.extract_rfp_data(text)
+        elapsed = time.perf_counter() - started
+        ok = elapsed <= limit
+        failures += not ok
+        print(f"{'ok ' if ok else 'SLOW'} {name:<28} {len(text):>9} chars  {elapsed * 1000:8.1f} ms")
+
+    print(f"limit {limit * 1000:.0f} ms per document (budget {app.RFP_REGEX_BUDGET_SECONDS}s)")
+
+    # The slow patterns use up the budget, but area and quantities must still be found
+    text = adversarial_inputs(args.scale)['mixed'] + ' project area: 52,000 sq ft. 1,200 tons of asphalt'
+    data = app.extract_rfp_data(text)
+    ok = data.get('project_area') == '52000' and data.get('tonnage') == '1200.0'
+    failures += not ok
+    print(f"{'ok ' if ok else 'LOST'} pricing fields after budget  skipped: {', '.join(data.get('skipped_fields', [])) or '-'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
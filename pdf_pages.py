@@ -0,0 +1,12 @@
+"""PDF page extraction task for the app's PDF process pool.
+
+Kept apart from app.py so pool workers, which start as fresh interpreters, import only PyPDF2
+and this module rather than the whole application.
+"""
+import PyPDF2
+
+
+# Worker task: extract the text of pages [start, end) from a PDF on disk
+def extract_pdf_page_range(path, start, end):
+    pdf_reader = PyPDF2.PdfReader(path)
+    return [pdf_reader.pages[i].extract_text() or "" for i in range(start, end)]